@@ -1,76 +1,48 @@
 from datetime import datetime
-from utils import fetch_data
-from database import SessionLocal
+from .fetcher import PageFetcher, inquiry_range
+from .bulk_upsert import bulk_upsert
 import logging
 from models import Award
+from rollups import track_awards
 
 
-def fetch_awards(service_key, start_date, end_date):
-    """낙찰정보 수집 (물품/공사/용역) - 전체 페이징 처리"""
-    
-    base_url = "https://apis.data.go.kr/1230000/as/ScsbidInfoService"
-    
-    apis = [
-        ("getOpengResultListInfoThng", "물품"),
-        ("getOpengResultListInfoCnstwk", "공사"),
-        ("getOpengResultListInfoServc", "용역")
-    ]
-    
-    all_items = []
-    inqry_bgn = start_date + "0000"
-    inqry_end = end_date + "2359"
-    
-    for endpoint, notice_type in apis:
-        url = f"{base_url}/{endpoint}"
-        page = 1
-        type_items = []  # ✅ 유형별 임시 리스트
-        
-        while True:
-            params = {
-                "pageNo": page,
-                "numOfRows": 100,
-                "inqryDiv": 1,
-                "inqryBgnDt": inqry_bgn,
-                "inqryEndDt": inqry_end,
-                "serviceKey": service_key,
-                "type": "json"
-            }
-            
-            data = fetch_data(url, params)
-            
-            if not data or "response" not in data:
-                logging.warning(f"❌ {notice_type} 낙찰 페이지 {page} 응답 없음")
-                break
-            
-            body = data["response"].get("body", {})
-            items = body.get("items", [])
-            total_count = body.get("totalCount", 0)
-            
-            if not items:
-                logging.info(f"✅ {notice_type} 낙찰 수집 완료 (총 {len(type_items)}건)")
-                break
-            
-            # notice_type 태깅
-            for item in items:
-                item["_notice_type"] = notice_type
-            
-            type_items.extend(items)  # ✅ 유형별 리스트에 추가
-            
-            logging.info(f"📄 {notice_type} 낙찰 페이지 {page}: {len(items)}건 (총 {total_count}건 중 {len(type_items)}건)")
-            
-            # ✅ 유형별 완료 체크
-            if len(type_items) >= total_count:
-                logging.info(f"✅ {notice_type} 낙찰 전체 수집 완료 ({len(type_items)}건)")
-                break
-            
-            page += 1
-        
-        all_items.extend(type_items)  # ✅ 유형 완료 후 전체에 추가
+AWARD_BASE_URL = "https://apis.data.go.kr/1230000/as/ScsbidInfoService"
+
+AWARD_APIS = [
+    (f"{AWARD_BASE_URL}/getOpengResultListInfoThng", "물품"),
+    (f"{AWARD_BASE_URL}/getOpengResultListInfoCnstwk", "공사"),
+    (f"{AWARD_BASE_URL}/getOpengResultListInfoServc", "용역")
+]
+
+
+def _params(service_key, start_date, end_date):
+    """조회 기간 공통 요청 파라미터 (YYYYMMDD 또는 YYYYMMDDHHMM)"""
+    inqry_bgn, inqry_end = inquiry_range(start_date, end_date)
+    return {
+        "numOfRows": 100,
+        "inqryDiv": 1,
+        "inqryBgnDt": inqry_bgn,
+        "inqryEndDt": inqry_end,
+        "serviceKey": service_key,
+        "type": "json"
+    }
+
+
+def fetch_awards(service_key, start_date, end_date, fetcher=None):
+    """낙찰정보 수집 (물품/공사/용역 동시 페이징 처리)"""
+    fetcher = fetcher or PageFetcher()
+    all_items = fetcher.fetch_all(AWARD_APIS, _params(service_key, start_date, end_date), tag_key="_notice_type", label="낙찰")
     
     logging.info(f"🎉 낙찰정보 전체 수집 완료: {len(all_items)}건")
     return all_items
 
 
+def iter_awards(service_key, start_date, end_date, fetcher=None, start_pages=None):
+    """낙찰정보 페이지 단위 스트리밍 수집 (도착한 페이지부터 바로 반환)"""
+    fetcher = fetcher or PageFetcher()
+    yield from fetcher.iter_items(AWARD_APIS, _params(service_key, start_date, end_date), tag_key="_notice_type", label="낙찰", start_pages=start_pages)
+
+
 def parse_datetime(date_str):
     """날짜 문자열을 datetime으로 변환"""
     if not date_str:
@@ -101,70 +73,45 @@ def parse_openg_corp_info(openg_corp_info):
     return None, None, None, None, None
 
 
-def upsert_awards(items):
-    """낙찰정보 DB 저장"""
-    db = SessionLocal()
-    success_count = 0
+def normalize_award(item):
+    """API 응답 item → awards 컬럼 dict 변환 (공고번호 없으면 None)"""
+    bid_ntce_no = item.get("bidNtceNo")
+    if not bid_ntce_no:
+        return None
     
-    try:
-        for item in items:
-            try:
-                bid_ntce_no = item.get("bidNtceNo")
-                bid_ntce_ord = item.get("bidNtceOrd", "000")
-                notice_type = item.get("_notice_type")
-                
-                if not bid_ntce_no:
-                    continue
-                
-                obj = db.query(Award).filter(
-                    Award.bid_ntce_no == bid_ntce_no,
-                    Award.bid_ntce_ord == bid_ntce_ord,
-                    Award.notice_type == notice_type
-                ).first()
-                
-                if obj is None:
-                    obj = Award(
-                        bid_ntce_no=bid_ntce_no,
-                        bid_ntce_ord=bid_ntce_ord,
-                        notice_type=notice_type
-                    )
-                    db.add(obj)
-                
-                obj.bid_clsfc_no = item.get("bidClsfcNo")
-                obj.rbid_no = item.get("rbidNo")
-                obj.bid_ntce_nm = item.get("bidNtceNm")
-                obj.openg_dt = parse_datetime(item.get("opengDt"))
-                obj.prtcpt_cnum = int(item.get("prtcptCnum", 0))
-                obj.openg_corp_info = item.get("opengCorpInfo")
-                obj.progrs_div_cd_nm = item.get("progrsDivCdNm")
-                
-                company, business_no, ceo, amount, rate = parse_openg_corp_info(item.get("opengCorpInfo"))
-                obj.award_company_name = company
-                obj.award_business_no = business_no
-                obj.award_ceo_name = ceo
-                obj.award_amount = amount
-                obj.award_rate = rate
-                
-                obj.ntce_instt_cd = item.get("ntceInsttCd")
-                obj.ntce_instt_nm = item.get("ntceInsttNm")
-                obj.dminstt_cd = item.get("dminsttCd")
-                obj.dminstt_nm = item.get("dminsttNm")
-                obj.inpt_dt = parse_datetime(item.get("inptDt"))
-                obj.rsrvtn_prce_file_existnce_yn = item.get("rsrvtnPrceFileExistnceYn")
-                obj.openg_rslt_ntc_cntnts = item.get("opengRsltNtcCntnts")
-                
-                db.commit()
-                success_count += 1
-                
-            except Exception as e:
-                logging.error(f"❌ 낙찰정보 {bid_ntce_no} 저장 실패: {e}")
-                db.rollback()
-                continue
-        
-        logging.info(f"💾 낙찰정보 저장 완료: {success_count}건")
-        
-    except Exception as e:
-        logging.error(f"❌ 낙찰정보 upsert 실패: {e}")
-        db.rollback()
-    finally:
-        db.close()
\ No newline at end of file
+    company, business_no, ceo, amount, rate = parse_openg_corp_info(item.get("opengCorpInfo"))
+    
+    return {
+        "bid_ntce_no": bid_ntce_no,
+        "bid_ntce_ord": item.get("bidNtceOrd", "000"),
+        "notice_type": item.get("_notice_type"),
+        "bid_clsfc_no": item.get("bidClsfcNo"),
+        "rbid_no": item.get("rbidNo"),
+        "bid_ntce_nm": item.get("bidNtceNm"),
+        "openg_dt": parse_datetime(item.get("opengDt")),
+        "prtcpt_cnum": int(item.get("prtcptCnum", 0)),
+        "openg_corp_info": item.get("opengCorpInfo"),
+        "progrs_div_cd_nm": item.get("progrsDivCdNm"),
+        "award_company_name": company,
+        "award_business_no": business_no,
+        "award_ceo_name": ceo,
+        "award_amount": amount,
+        "award_rate": rate,
+        "ntce_instt_cd": item.get("ntceInsttCd"),
+        "ntce_instt_nm": item.get("ntceInsttNm"),
+        "dminstt_cd": item.get("dminsttCd"),
+        "dminstt_nm": item.get("dminsttNm"),
+        "inpt_dt": parse_datetime(item.get("inptDt")),
+        "rsrvtn_prce_file_existnce_yn": item.get("rsrvtnPrceFileExistnceYn"),
+        "openg_rslt_ntc_cntnts": item.get("opengRsltNtcCntnts"),
+    }
+
+
+def upsert_awards(items, chunk_size=500):
+    """
+    낙찰정보 DB 저장 ((bid_ntce_no, bid_ntce_ord, notice_type) 기준 일괄 UPSERT)
+
+    Returns:
+        dict: inserted / updated / unchanged / failed 건수
+    """
+    return bulk_upsert(Award, items, normalize_award, "낙찰정보", chunk_size, on_change=track_awards)
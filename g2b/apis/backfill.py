@@ -0,0 +1,129 @@
+"""
+대용량 과거 데이터 백필
+- 긴 조회 기간(수개월~수년)을 일/시간 단위 하위 기간으로 분할
+- 하위 기간을 작업 풀에서 병렬 수집 (UPSERT라 중복/순서와 무관하게 결과 동일)
+- 하위 기간마다 체크포인트가 남으므로 중단 후 다시 실행하면 완료된 기간은 건너뜀
+- 롤업/유사도 색인/이웃 목록은 하위 기간마다가 아니라 전체 종료 후 한 번 반영
+  (하위 기간마다 반영하면 유사도 색인 세그먼트가 기간 수만큼 생겨 검색이 느려짐)
+
+실행: cd g2b && python -m apis.backfill 20240101 20241231 --unit day --workers 4
+"""
+
+import logging
+import argparse
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import settings
+from .fetcher import PageFetcher
+from .checkpoint import CheckpointTracker
+from .main import DATASETS, collect, flush_derived
+
+logger = logging.getLogger(__name__)
+
+# 발주계획은 월 단위(orderBgnYm/orderEndYm) 조회라 하위 기간을 월로 고정
+MONTHLY_SOURCES = {"order_plans"}
+
+
+def split_windows(start_date, end_date, unit="day"):
+    """
+    YYYYMMDD ~ YYYYMMDD 기간 → [(bgn, end), ...] (YYYYMMDDHHMM, 양 끝 포함)
+
+    unit: "hour" | "day" | "month"
+    """
+    start = datetime.strptime(start_date, "%Y%m%d")
+    last = datetime.strptime(end_date, "%Y%m%d") + timedelta(days=1)
+    windows = []
+
+    while start < last:
+        if unit == "hour":
+            nxt = start + timedelta(hours=1)
+        elif unit == "day":
+            nxt = start + timedelta(days=1)
+        elif unit == "month":
+            nxt = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        else:
+            raise ValueError(f"지원하지 않는 분할 단위: {unit}")
+
+        nxt = min(nxt, last)
+        windows.append((start.strftime("%Y%m%d%H%M"), (nxt - timedelta(minutes=1)).strftime("%Y%m%d%H%M")))
+        start = nxt
+
+    return windows
+
+
+def run_backfill(start_date, end_date, unit="day", workers=4, sources=None, skip_completed=True):
+    """
+    기간 분할 병렬 백필
+
+    Args:
+        start_date, end_date: YYYYMMDD
+        unit: 하위 기간 단위 ("hour" | "day")
+        workers: 동시에 수집할 하위 기간 수
+        sources: 대상 목록 (예: ["biddings", "awards"], 기본 전체)
+        skip_completed: 이전 실행에서 완료된 하위 기간은 건너뜀
+
+    Returns:
+        list[dict]: 하위 기간별 결과 (source, window, result, complete)
+    """
+    service_key = settings.SERVICE_KEY
+
+    # 동시 요청 수와 엔드포인트별 속도 제한이 작업 수만큼 늘어나지 않도록 수집 엔진은 공유
+    fetcher = PageFetcher()
+
+    tasks = []
+    for dataset in DATASETS:
+        source, label, targets, iter_pages, upsert, _ = dataset
+        if sources and source not in sources:
+            continue
+
+        windows = split_windows(start_date, end_date, "month" if source in MONTHLY_SOURCES else unit)
+        for window in windows:
+            if skip_completed and CheckpointTracker.window_completed(targets, *window):
+                continue
+            tasks.append((dataset, window))
+
+    total = len(tasks)
+    logger.info(f"🗂️ 백필 시작: {start_date} ~ {end_date}, 하위 기간 {total}개 (단위 {unit}, 작업자 {workers})")
+
+    def work(dataset, window):
+        source, label, targets, iter_pages, upsert, _ = dataset
+        result, complete = collect(label, targets, iter_pages, upsert, service_key, *window, fetcher=fetcher, flush=False)
+        return {"source": source, "window": window, "result": result, "complete": complete}
+
+    summary = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(work, dataset, window): (dataset[0], window) for dataset, window in tasks}
+
+            for done, future in enumerate(as_completed(futures), 1):
+                source, window = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logger.error(f"❌ [{done}/{total}] {source} {window[0]} ~ {window[1]} 실패: {e}")
+                    outcome = {"source": source, "window": window, "result": None, "complete": False}
+
+                summary.append(outcome)
+                status = "완료" if outcome["complete"] else "미완료"
+                logger.info(f"📦 [{done}/{total}] {source} {window[0]} ~ {window[1]} {status}: {outcome['result']}")
+    finally:
+        # 모든 하위 기간에서 기록된 키/공고를 한 번에 반영 (유사도 색인 세그먼트 1개)
+        flush_derived()
+
+    incomplete = sum(1 for outcome in summary if not outcome["complete"])
+    logger.info(f"🎉 백필 종료: {total - incomplete}/{total}개 하위 기간 완료")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="G2B 과거 데이터 기간 분할 백필")
+    parser.add_argument("start_date", help="시작일 (YYYYMMDD)")
+    parser.add_argument("end_date", help="종료일 (YYYYMMDD)")
+    parser.add_argument("--unit", choices=["hour", "day"], default="day", help="하위 기간 단위")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 수집할 하위 기간 수")
+    parser.add_argument("--sources", nargs="+", choices=[d[0] for d in DATASETS], help="수집 대상")
+    parser.add_argument("--no-skip", action="store_true", help="완료된 하위 기간도 다시 수집")
+    args = parser.parse_args()
+
+    run_backfill(args.start_date, args.end_date, args.unit, args.workers, args.sources, not args.no_skip)
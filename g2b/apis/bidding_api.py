@@ -1,73 +1,49 @@
 from datetime import datetime
-from utils import fetch_data
-from database import SessionLocal
+from .fetcher import PageFetcher, inquiry_range
+from .bulk_upsert import bulk_upsert
 import logging
 from models import Bidding
+from rollups import track_biddings
+from search_index import update_bidding_index
+from similarity_index import track_similarity
+from dedup import cluster_biddings
 
 
-def fetch_biddings(service_key, start_date, end_date):
-    """입찰공고 수집 (전체 페이징 처리)"""
-    
-    apis = [
-        ("http://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoCnstwk", "공사"),
-        ("http://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoServc", "용역"),
-        ("http://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoThng", "물품"),
-    ]
-    
-    all_items = []
-    inqry_bgn = start_date + "0000"
-    inqry_end = end_date + "2359"
-    
-    for url, notice_type in apis:
-        page = 1
-        type_items = []  # 유형별 임시 리스트
-        
-        while True:
-            params = {
-                "pageNo": page,
-                "numOfRows": 100,
-                "inqryDiv": 1,
-                "inqryBgnDt": inqry_bgn,
-                "inqryEndDt": inqry_end,
-                "serviceKey": service_key,
-                "type": "json"
-            }
-            
-            data = fetch_data(url, params)
-            
-            if not data or "response" not in data:
-                logging.warning(f"❌ {notice_type} 페이지 {page} 응답 없음")
-                break
-            
-            body = data["response"].get("body", {})
-            items = body.get("items", [])
-            total_count = body.get("totalCount", 0)
-            
-            if not items:
-                logging.info(f"✅ {notice_type} 수집 완료 (총 {len(type_items)}건)")
-                break
-            
-            # notice_type 태깅
-            for item in items:
-                item["_notice_type"] = notice_type
-            
-            type_items.extend(items)
-            
-            logging.info(f"📄 {notice_type} 페이지 {page}: {len(items)}건 (총 {total_count}건 중 {len(type_items)}건)")
-            
-            # 유형별 완료 체크
-            if len(type_items) >= total_count:
-                logging.info(f"✅ {notice_type} 전체 수집 완료 ({len(type_items)}건)")
-                break
-            
-            page += 1
-        
-        all_items.extend(type_items)
+BIDDING_APIS = [
+    ("http://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoCnstwk", "공사"),
+    ("http://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoServc", "용역"),
+    ("http://apis.data.go.kr/1230000/ad/BidPublicInfoService/getBidPblancListInfoThng", "물품"),
+]
+
+
+def _params(service_key, start_date, end_date):
+    """조회 기간 공통 요청 파라미터 (YYYYMMDD 또는 YYYYMMDDHHMM)"""
+    inqry_bgn, inqry_end = inquiry_range(start_date, end_date)
+    return {
+        "numOfRows": 100,
+        "inqryDiv": 1,
+        "inqryBgnDt": inqry_bgn,
+        "inqryEndDt": inqry_end,
+        "serviceKey": service_key,
+        "type": "json"
+    }
+
+
+def fetch_biddings(service_key, start_date, end_date, fetcher=None):
+    """입찰공고 수집 (공사/용역/물품 동시 페이징 처리)"""
+    fetcher = fetcher or PageFetcher()
+    all_items = fetcher.fetch_all(BIDDING_APIS, _params(service_key, start_date, end_date), tag_key="_notice_type", label="입찰공고")
     
     logging.info(f"🎉 입찰공고 전체 수집 완료: {len(all_items)}건")
     return all_items
 
 
+def iter_biddings(service_key, start_date, end_date, fetcher=None, start_pages=None):
+    """입찰공고 페이지 단위 스트리밍 수집 (도착한 페이지부터 바로 반환)"""
+    fetcher = fetcher or PageFetcher()
+    yield from fetcher.iter_items(BIDDING_APIS, _params(service_key, start_date, end_date), tag_key="_notice_type", label="입찰공고", start_pages=start_pages)
+
+
 def parse_datetime(date_str):
     """날짜 문자열을 datetime으로 변환"""
     if not date_str:
@@ -81,61 +57,57 @@ def parse_datetime(date_str):
             return None
 
 
-def upsert_biddings(items):
-    """입찰공고 DB 저장"""
-    db = SessionLocal()
-    success_count = 0
+def normalize_bidding(item):
+    """API 응답 item → biddings 컬럼 dict 변환 (공고번호 없으면 None)"""
+    if not item.get("bidNtceNo"):
+        return None
+    
+    notice_type = item.get("_notice_type")
     
+    # ✅ 공사/용역/물품 구분해서 예산액 파싱
+    if notice_type == "물품":
+        budget_value = item.get("asignBdgtAmt")
+    else:
+        budget_value = item.get("bdgtAmt")
+    
+    return {
+        "notice_number": item.get("bidNtceNo"),
+        "notice_type": notice_type,
+        "title": item.get("bidNtceNm"),
+        "ordering_agency": item.get("ntceInsttNm"),
+        "demanding_agency": item.get("dminsttNm"),
+        "contract_method": item.get("cntrctCnclsMthdNm"),
+        "bidding_method": item.get("bidMethdNm"),
+        "budget_amount": int(float(budget_value)) if budget_value else None,
+        "estimated_price": int(float(item.get("presmptPrce"))) if item.get("presmptPrce") else None,
+        "notice_date": parse_datetime(item.get("bidNtceDt")),
+        "bid_close_date": parse_datetime(item.get("bidClseDt")),
+        "order_instt_cd": item.get("ntceInsttCd"),
+        "order_instt_nm": item.get("ntceInsttNm"),
+        "description": item.get("bidNtceDtlUrl"),
+        "bidding_url": item.get("bidNtceUrl"),
+    }
+
+
+def upsert_biddings(items, chunk_size=500):
+    """
+    입찰공고 DB 저장 (notice_number 기준 일괄 UPSERT)
+
+    Returns:
+        dict: inserted / updated / unchanged / failed 건수
+    """
+    # 실제로 신규/변경된 공고만 검색 색인/클러스터/유사도 색인에 반영 (변경 없는 행은 다시 처리하지 않음)
+    changed = []
+
+    def on_change(rows):
+        changed.extend(row["notice_number"] for row in rows)
+        track_biddings(rows)
+
+    # 저장 도중 실패해도 이미 커밋된 공고는 색인/클러스터에 반영
     try:
-        for item in items:
-            try:
-                notice_no = item.get("bidNtceNo")
-                if not notice_no:
-                    continue
-                
-                obj = db.query(Bidding).filter(Bidding.notice_number == notice_no).first()
-                
-                if obj is None:
-                    obj = Bidding(notice_number=notice_no)
-                    db.add(obj)
-                
-                notice_type = item.get("_notice_type")
-                
-                obj.notice_type = notice_type
-                obj.title = item.get("bidNtceNm")
-                obj.ordering_agency = item.get("ntceInsttNm")
-                obj.demanding_agency = item.get("dminsttNm")
-                obj.contract_method = item.get("cntrctCnclsMthdNm")
-                obj.bidding_method = item.get("bidMethdNm")
-                
-                # ✅ 공사/용역/물품 구분해서 예산액 파싱
-                if notice_type == "물품":
-                    budget_value = item.get("asignBdgtAmt")
-                else:
-                    budget_value = item.get("bdgtAmt")
-                
-                obj.budget_amount = int(float(budget_value)) if budget_value else None
-                obj.estimated_price = int(float(item.get("presmptPrce"))) if item.get("presmptPrce") else None
-                
-                obj.notice_date = parse_datetime(item.get("bidNtceDt"))
-                obj.bid_close_date = parse_datetime(item.get("bidClseDt"))
-                obj.order_instt_cd = item.get("ntceInsttCd")
-                obj.order_instt_nm = item.get("ntceInsttNm")
-                obj.description = item.get("bidNtceDtlUrl")
-                obj.bidding_url = item.get("bidNtceUrl")
-                
-                db.commit()
-                success_count += 1
-                
-            except Exception as e:
-                logging.error(f"❌ 입찰공고 {notice_no} 저장 실패: {e}")
-                db.rollback()
-                continue
-        
-        logging.info(f"💾 입찰공고 저장 완료: {success_count}건")
-        
-    except Exception as e:
-        logging.error(f"❌ 입찰공고 upsert 실패: {e}")
-        db.rollback()
+        return bulk_upsert(Bidding, items, normalize_bidding, "입찰공고", chunk_size, on_change=on_change)
     finally:
-        db.close()
+        if changed:
+            update_bidding_index(changed)
+            cluster_biddings(changed)
+            track_similarity(changed)
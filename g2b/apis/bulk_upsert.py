@@ -0,0 +1,211 @@
+"""
+공통 일괄 UPSERT 모듈
+- 모델의 UniqueConstraint(또는 unique 인덱스)를 충돌 키로 사용
+- 청크 단위 INSERT ... ON CONFLICT DO UPDATE + 청크당 1회 커밋
+- content_hash 비교로 바뀐 행만 UPDATE → 변경 없는 행은 쓰지 않고 updated_at 유지
+- 청크 실패 시 해당 청크만 건별 재시도하여 문제 행만 실패 처리
+"""
+
+import json
+import hashlib
+import logging
+from sqlalchemy import UniqueConstraint, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from database import SessionLocal
+
+
+def unique_key_columns(model):
+    """모델의 충돌 키 컬럼명 목록 (UniqueConstraint → unique 인덱스 → unique 컬럼 순)"""
+    table = model.__table__
+
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            return [col.name for col in constraint.columns]
+
+    for index in table.indexes:
+        if index.unique:
+            return [col.name for col in index.columns]
+
+    for col in table.columns:
+        if col.unique:
+            return [col.name]
+
+    raise ValueError(f"{table.name} 테이블에 유니크 키가 없습니다.")
+
+
+def content_hash(row):
+    """정규화된 행의 내용 해시 (SHA-256, 키 순서와 무관)"""
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _filter_unchanged(db, model, rows, key_cols):
+    """
+    DB의 content_hash와 한 번에 비교해 바뀐 행(신규 포함)만 반환
+    """
+    table = model.__table__
+    key_expr = tuple_(*[table.c[key] for key in key_cols])
+    keys = [tuple(row[key] for key in key_cols) for row in rows]
+
+    stored = {
+        tuple(found[:-1]): found[-1]
+        for found in db.execute(
+            select(*[table.c[key] for key in key_cols], table.c.content_hash)
+            .where(key_expr.in_(keys))
+        )
+    }
+    return [
+        row for key, row in zip(keys, rows)
+        if stored.get(key) != row["content_hash"]
+    ]
+
+
+def _upsert_rows(db, model, rows, key_cols):
+    """
+    한 번의 INSERT ... ON CONFLICT 로 여러 행 저장
+
+    Returns:
+        (inserted, updated, 실제로 쓴 행 목록) - RETURNING에 빠진 행은 변경 없음
+    """
+    table = model.__table__
+    stmt = insert(table).values(rows)
+    value_cols = [key for key in rows[0] if key not in key_cols]
+
+    set_ = {key: stmt.excluded[key] for key in value_cols}
+    if "updated_at" in table.c:
+        set_["updated_at"] = func.now()
+
+    # 동시에 다른 수집이 같은 행을 갱신한 경우에도 내용이 같으면 쓰지 않음
+    if "content_hash" in table.c:
+        changed = table.c.content_hash.is_distinct_from(stmt.excluded.content_hash)
+    else:
+        changed = tuple_(*[table.c[key] for key in value_cols]).is_distinct_from(
+            tuple_(*[stmt.excluded[key] for key in value_cols])
+        )
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_cols,
+        set_=set_,
+        where=changed,
+    ).returning(*[table.c[key] for key in key_cols], literal_column("xmax = 0"))
+
+    returned = db.execute(stmt).all()
+    written_keys = {tuple(found[:-1]) for found in returned}
+    written = [row for row in rows if tuple(row[key] for key in key_cols) in written_keys]
+    inserted = sum(1 for found in returned if found[-1])
+    return inserted, len(returned) - inserted, written
+
+
+def _notify_change(on_change, rows, label):
+    """커밋된 행으로 on_change 호출 - 콜백 실패는 기록만 (이미 커밋된 행을 다시 저장/집계하지 않음)"""
+    if not on_change:
+        return
+    try:
+        on_change(rows)
+    except Exception as e:
+        logging.error(f"❌ {label} 변경 후처리 실패 ({len(rows)}건): {e}")
+
+
+def bulk_upsert(model, items, normalize, label, chunk_size=500, on_change=None):
+    """
+    API item 목록을 모델 테이블에 일괄 저장
+
+    Args:
+        model: SQLAlchemy 모델
+        items: API 응답 item 목록
+        normalize: item → 컬럼 dict 변환 함수 (키가 없으면 None 반환)
+        label: 로그용 이름 (예: "입찰공고")
+        chunk_size: 한 번에 저장할 행 수
+        on_change: 커밋된 신규/변경 행(정규화 dict) 목록을 받는 콜백 (롤업 키 기록 등) - 내용이 같아 쓰지 않은 행은 제외
+
+    Returns:
+        dict: inserted / updated / unchanged / failed 건수
+
+    Raises:
+        세션/연결 오류 등 건별 재시도로 처리할 수 없는 실패 - 호출 측이 해당 페이지를 저장 완료로 기록하지 않도록 전파
+    """
+    key_cols = unique_key_columns(model)
+    hashed = "content_hash" in model.__table__.c
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0, "failed": 0}
+
+    # 1) 정규화 (같은 키는 마지막 값만 유지 - ON CONFLICT는 한 문장에서 같은 행을 두 번 갱신할 수 없음)
+    rows = {}
+    for item in items:
+        try:
+            row = normalize(item)
+        except Exception as e:
+            logging.error(f"❌ {label} 변환 실패: {e}")
+            counts["failed"] += 1
+            continue
+        if row is None:
+            continue
+        if hashed:
+            row["content_hash"] = content_hash(row)
+        rows[tuple(row[key] for key in key_cols)] = row
+
+    rows = list(rows.values())
+
+    # 2) 청크 단위 일괄 저장
+    db = SessionLocal()
+    try:
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+
+            # 해시가 같은 행은 쓰기 대상에서 제외
+            if hashed:
+                try:
+                    changed = _filter_unchanged(db, model, chunk, key_cols)
+                    db.rollback()
+                except Exception as e:
+                    logging.warning(f"⚠️ {label} 해시 비교 실패, 전체 저장: {getattr(e, 'orig', e)}")
+                    db.rollback()
+                    changed = chunk
+                counts["unchanged"] += len(chunk) - len(changed)
+                chunk = changed
+                if not chunk:
+                    continue
+
+            try:
+                inserted, updated, written = _upsert_rows(db, model, chunk, key_cols)
+                db.commit()
+            except Exception as e:
+                logging.warning(f"⚠️ {label} 청크 저장 실패, 건별 재시도 ({len(chunk)}건): {getattr(e, 'orig', e)}")
+                db.rollback()
+            else:
+                counts["inserted"] += inserted
+                counts["updated"] += updated
+                counts["unchanged"] += len(chunk) - inserted - updated
+                if written:
+                    _notify_change(on_change, written, label)
+                continue
+
+            for row in chunk:
+                try:
+                    inserted, updated, written = _upsert_rows(db, model, [row], key_cols)
+                    db.commit()
+                except Exception as e:
+                    key = tuple(row[k] for k in key_cols)
+                    logging.error(f"❌ {label} {key} 저장 실패: {getattr(e, 'orig', e)}")
+                    db.rollback()
+                    counts["failed"] += 1
+                    continue
+                counts["inserted"] += inserted
+                counts["updated"] += updated
+                counts["unchanged"] += 1 - inserted - updated
+                if written:
+                    _notify_change(on_change, written, label)
+
+        logging.info(
+            f"💾 {label} 저장 완료: 신규 {counts['inserted']}건, 갱신 {counts['updated']}건, "
+            f"변경없음 {counts['unchanged']}건, 실패 {counts['failed']}건"
+        )
+
+    except Exception as e:
+        logging.error(f"❌ {label} upsert 실패: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    return counts
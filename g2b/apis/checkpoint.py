@@ -0,0 +1,149 @@
+"""
+수집 체크포인트
+- (엔드포인트, 공고구분, 조회 기간)별로 연속 저장 완료된 마지막 페이지를 기록
+- 수집이 중간에 끊기면 같은 기간의 다음 실행은 그 다음 페이지부터 재개
+"""
+
+import logging
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from database import SessionLocal
+from models import CollectCheckpoint
+
+
+class CheckpointTracker:
+    """
+    한 조회 기간의 페이지 저장 진행 상황 추적
+
+    페이지는 도착 순서가 뒤섞이므로 1페이지부터 빈틈없이 저장된
+    구간(연속 prefix)의 끝만 last_page로 기록한다.
+    """
+
+    def __init__(self, window_bgn, window_end):
+        self.window_bgn = window_bgn
+        self.window_end = window_end
+        self._done = {}       # url → 저장된 페이지 집합 (prefix 이후)
+        self._last_page = {}  # url → 연속 저장 완료 페이지
+        self._completed = set()
+
+    @staticmethod
+    def unfinished_window(targets):
+        """
+        엔드포인트들의 가장 최근 미완료 조회 기간 (window_bgn, window_end) - 없으면 None
+
+        증분 수집은 매번 기간이 달라지므로, 끊긴 기간을 먼저 이어서 수집할 때 사용한다.
+        """
+        urls = [url for url, _ in targets]
+        db = SessionLocal()
+        try:
+            row = db.query(CollectCheckpoint).filter(
+                CollectCheckpoint.endpoint.in_(urls),
+                CollectCheckpoint.completed.is_(False),
+            ).order_by(CollectCheckpoint.updated_at.desc()).first()
+        finally:
+            db.close()
+
+        return (row.window_bgn, row.window_end) if row else None
+
+    @staticmethod
+    def window_completed(targets, window_bgn, window_end):
+        """조회 기간의 모든 엔드포인트가 이전 실행에서 이미 완료됐는지 여부"""
+        urls = [url for url, _ in targets]
+        db = SessionLocal()
+        try:
+            completed = db.query(CollectCheckpoint).filter(
+                CollectCheckpoint.endpoint.in_(urls),
+                CollectCheckpoint.window_bgn == window_bgn,
+                CollectCheckpoint.window_end == window_end,
+                CollectCheckpoint.completed.is_(True),
+            ).count()
+        finally:
+            db.close()
+
+        return completed == len(urls)
+
+    def is_complete(self, targets):
+        """이번 실행에서 모든 엔드포인트의 전체 페이지가 저장됐는지 여부"""
+        return all(url in self._completed for url, _ in targets)
+
+    def resume_pages(self, targets):
+        """
+        미완료 체크포인트가 있는 엔드포인트의 재개 페이지 {url: page}
+
+        완료된 체크포인트는 무시하고 1페이지부터 다시 수집한다
+        (같은 기간이라도 그 사이 새 공고가 추가됐을 수 있음).
+        """
+        urls = [url for url, _ in targets]
+        db = SessionLocal()
+        try:
+            rows = db.query(CollectCheckpoint).filter(
+                CollectCheckpoint.endpoint.in_(urls),
+                CollectCheckpoint.window_bgn == self.window_bgn,
+                CollectCheckpoint.window_end == self.window_end,
+                CollectCheckpoint.completed.is_(False),
+                CollectCheckpoint.last_page > 0,
+            ).all()
+        finally:
+            db.close()
+
+        start_pages = {}
+        for row in rows:
+            self._last_page[row.endpoint] = row.last_page
+            start_pages[row.endpoint] = row.last_page + 1
+            logging.info(f"⏯️ {row.notice_type or row.endpoint} {self.window_bgn}~{self.window_end}: {row.last_page + 1}페이지부터 재개")
+        return start_pages
+
+    def page_done(self, page):
+        """페이지 저장 완료 기록 - 연속 구간이 늘어났을 때만 DB 갱신"""
+        done = self._done.setdefault(page.url, set())
+        done.add(page.page)
+
+        last_page = self._last_page.get(page.url, 0)
+        advanced = last_page
+        while advanced + 1 in done:
+            advanced += 1
+            done.discard(advanced)
+
+        if advanced == last_page:
+            return
+
+        self._last_page[page.url] = advanced
+        self._save(page.url, page.tag, advanced, page.last_page)
+
+    def _save(self, url, tag, last_page, total_pages):
+        completed = last_page >= total_pages
+        if completed:
+            self._completed.add(url)
+        values = {
+            "endpoint": url,
+            "notice_type": tag or "",
+            "window_bgn": self.window_bgn,
+            "window_end": self.window_end,
+            "last_page": last_page,
+            "total_pages": total_pages,
+            "completed": completed,
+        }
+        stmt = insert(CollectCheckpoint).values(values)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uix_checkpoint_window",
+            set_={
+                "last_page": stmt.excluded.last_page,
+                "total_pages": stmt.excluded.total_pages,
+                "completed": stmt.excluded.completed,
+                "updated_at": func.now(),
+            },
+        )
+
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.commit()
+        except Exception as e:
+            logging.error(f"❌ 체크포인트 저장 실패 ({url} {last_page}페이지): {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+        if completed:
+            logging.info(f"🏁 {tag or url} {self.window_bgn}~{self.window_end}: 전체 {total_pages}페이지 저장 완료")
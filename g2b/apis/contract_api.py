@@ -1,66 +1,41 @@
-from utils import fetch_data
-from database import SessionLocal
+from .fetcher import PageFetcher, inquiry_range
+from .bulk_upsert import bulk_upsert
 from models import Contract
 from datetime import datetime
-import logging
 
 
-def fetch_contracts(service_key, start_date, end_date):
-    """계약정보 수집 (물품/용역/공사) - 전체 페이징 처리"""
-    
-    base_url = "https://apis.data.go.kr/1230000/ao/CntrctInfoService"
-    
-    apis = [
-        ("getCntrctInfoListThng", "물품"),
-        ("getCntrctInfoListServc", "용역"),
-        ("getCntrctInfoListCnstwk", "공사")
-    ]
-    
-    all_items = []
-    inqry_bgn = start_date + "0000"
-    inqry_end = end_date + "2359"
-    
-    for endpoint, contract_type in apis:
-        url = f"{base_url}/{endpoint}"
-        page = 1
-        
-        while True:
-            params = {
-                "pageNo": page,
-                "numOfRows": 1000,
-                "inqryDiv": 1,
-                "inqryBgnDt": inqry_bgn,
-                "inqryEndDt": inqry_end,
-                "serviceKey": service_key,
-                "type": "json"
-            }
-            
-            data = fetch_data(url, params)
-            
-            if not data or "response" not in data:
-                break
-            
-            body = data["response"].get("body", {})
-            items = body.get("items", [])
-            total_count = body.get("totalCount", 0)
-            
-            if not items:
-                break
-            
-            # 계약 타입 태깅
-            for item in items:
-                item["_contract_type"] = contract_type
-            
-            all_items.extend(items)
-            
-            logging.info(f"📄 {contract_type} 계약 페이지 {page} 수집: {len(items)}건 (총 {total_count}건 중 {len(all_items)}건)")
-            
-            if len(all_items) >= total_count:
-                break
-            
-            page += 1
-    
-    return all_items
+CONTRACT_BASE_URL = "https://apis.data.go.kr/1230000/ao/CntrctInfoService"
+
+CONTRACT_APIS = [
+    (f"{CONTRACT_BASE_URL}/getCntrctInfoListThng", "물품"),
+    (f"{CONTRACT_BASE_URL}/getCntrctInfoListServc", "용역"),
+    (f"{CONTRACT_BASE_URL}/getCntrctInfoListCnstwk", "공사")
+]
+
+
+def _params(service_key, start_date, end_date):
+    """조회 기간 공통 요청 파라미터 (YYYYMMDD 또는 YYYYMMDDHHMM)"""
+    inqry_bgn, inqry_end = inquiry_range(start_date, end_date)
+    return {
+        "numOfRows": 1000,
+        "inqryDiv": 1,
+        "inqryBgnDt": inqry_bgn,
+        "inqryEndDt": inqry_end,
+        "serviceKey": service_key,
+        "type": "json"
+    }
+
+
+def fetch_contracts(service_key, start_date, end_date, fetcher=None):
+    """계약정보 수집 (물품/용역/공사 동시 페이징 처리)"""
+    fetcher = fetcher or PageFetcher()
+    return fetcher.fetch_all(CONTRACT_APIS, _params(service_key, start_date, end_date), tag_key="_contract_type", label="계약")
+
+
+def iter_contracts(service_key, start_date, end_date, fetcher=None, start_pages=None):
+    """계약정보 페이지 단위 스트리밍 수집 (도착한 페이지부터 바로 반환)"""
+    fetcher = fetcher or PageFetcher()
+    yield from fetcher.iter_items(CONTRACT_APIS, _params(service_key, start_date, end_date), tag_key="_contract_type", label="계약", start_pages=start_pages)
 
 
 def parse_date(date_str):
@@ -84,86 +59,63 @@ def parse_int(value):
         return None
 
 
-def upsert_contracts(items):
-    """계약정보 DB 저장"""
-    db = SessionLocal()
-    saved_count = 0
+def normalize_contract(item):
+    """API 응답 item → contracts 컬럼 dict 변환 (통합계약번호 없으면 None)"""
+    unty_no = item.get("untyCntrctNo")
+    if not unty_no:
+        return None
     
-    try:
-        for item in items:
-            # 통합계약번호 (Primary Key)
-            unty_no = item.get("untyCntrctNo")
-            contract_type = item.get("_contract_type", "")
-            
-            if not unty_no:
-                continue
-            
-            try:
-                # 기존 레코드 확인
-                obj = db.query(Contract).filter(
-                    Contract.unty_cntrct_no == unty_no,
-                    Contract.contract_type == contract_type
-                ).first()
-                
-                if obj is None:
-                    obj = Contract(
-                        unty_cntrct_no=unty_no,
-                        contract_type=contract_type
-                    )
-                    db.add(obj)
-                
-                # 기본 정보
-                obj.bsns_div_nm = item.get("bsnsDivNm")
-                obj.dcsn_cntrct_no = item.get("dcsnCntrctNo")
-                obj.cntrct_ref_no = item.get("cntrctRefNo")
-                
-                # 계약 상세
-                obj.cntrct_nm = item.get("cntrctNm")
-                obj.cmmn_cntrct_yn = item.get("cmmnCntrctYn")
-                obj.lngtrm_ctnu_div_nm = item.get("lngtrmCtnuDivNm")
-                obj.cntrct_cncls_date = parse_date(item.get("cntrctCnclsDate"))
-                obj.cntrct_prd = item.get("cntrctPrd")
-                obj.base_law_nm = item.get("baseLawNm")
-                
-                # 금액 정보
-                obj.tot_cntrct_amt = parse_int(item.get("totCntrctAmt"))
-                obj.thtm_cntrct_amt = parse_int(item.get("thtmCntrctAmt"))
-                obj.grntymny_rate = item.get("grntymnyRate")
-                obj.pay_div_nm = item.get("payDivNm")
-                
-                # 참조 정보
-                obj.req_no = item.get("reqNo")
-                obj.ntce_no = item.get("ntceNo")
-                
-                # 계약기관 정보
-                obj.cntrct_instt_cd = item.get("cntrctInsttCd")
-                obj.cntrct_instt_nm = item.get("cntrctInsttNm")
-                obj.cntrct_instt_jrsdctn_div_nm = item.get("cntrctInsttJrsdctnDivNm")
-                obj.cntrct_instt_chrg_dept_nm = item.get("cntrctInsttChrgDeptNm")
-                obj.cntrct_instt_ofcl_nm = item.get("cntrctInsttOfclNm")
-                obj.cntrct_instt_ofcl_tel_no = item.get("cntrctInsttOfclTelNo")
-                obj.cntrct_instt_ofcl_fax_no = item.get("cntrctInsttOfclFaxNo")
-                
-                # 리스트 정보 (문자열로 저장)
-                obj.dminstt_list = item.get("dminsttList")
-                obj.corp_list = item.get("corpList")
-                
-                # URL
-                obj.cntrct_info_url = item.get("cntrctInfoUrl")
-                obj.cntrct_dtl_info_url = item.get("cntrctDtlInfoUrl")
-                
-                db.commit()
-                saved_count += 1
-                
-            except Exception as e:
-                logging.error(f"❌ 계약정보 저장 실패 ({unty_no}): {e}")
-                db.rollback()
-                continue
+    return {
+        "unty_cntrct_no": unty_no,
+        "contract_type": item.get("_contract_type", ""),
+        
+        # 기본 정보
+        "bsns_div_nm": item.get("bsnsDivNm"),
+        "dcsn_cntrct_no": item.get("dcsnCntrctNo"),
+        "cntrct_ref_no": item.get("cntrctRefNo"),
+        
+        # 계약 상세
+        "cntrct_nm": item.get("cntrctNm"),
+        "cmmn_cntrct_yn": item.get("cmmnCntrctYn"),
+        "lngtrm_ctnu_div_nm": item.get("lngtrmCtnuDivNm"),
+        "cntrct_cncls_date": parse_date(item.get("cntrctCnclsDate")),
+        "cntrct_prd": item.get("cntrctPrd"),
+        "base_law_nm": item.get("baseLawNm"),
+        
+        # 금액 정보
+        "tot_cntrct_amt": parse_int(item.get("totCntrctAmt")),
+        "thtm_cntrct_amt": parse_int(item.get("thtmCntrctAmt")),
+        "grntymny_rate": item.get("grntymnyRate"),
+        "pay_div_nm": item.get("payDivNm"),
         
-        logging.info(f"💾 계약정보 저장 완료: {saved_count}건")
+        # 참조 정보
+        "req_no": item.get("reqNo"),
+        "ntce_no": item.get("ntceNo"),
         
-    except Exception as e:
-        logging.error(f"❌ 계약정보 upsert 전체 실패: {e}")
-        db.rollback()
-    finally:
-        db.close()
\ No newline at end of file
+        # 계약기관 정보
+        "cntrct_instt_cd": item.get("cntrctInsttCd"),
+        "cntrct_instt_nm": item.get("cntrctInsttNm"),
+        "cntrct_instt_jrsdctn_div_nm": item.get("cntrctInsttJrsdctnDivNm"),
+        "cntrct_instt_chrg_dept_nm": item.get("cntrctInsttChrgDeptNm"),
+        "cntrct_instt_ofcl_nm": item.get("cntrctInsttOfclNm"),
+        "cntrct_instt_ofcl_tel_no": item.get("cntrctInsttOfclTelNo"),
+        "cntrct_instt_ofcl_fax_no": item.get("cntrctInsttOfclFaxNo"),
+        
+        # 리스트 정보 (문자열로 저장)
+        "dminstt_list": item.get("dminsttList"),
+        "corp_list": item.get("corpList"),
+        
+        # URL
+        "cntrct_info_url": item.get("cntrctInfoUrl"),
+        "cntrct_dtl_info_url": item.get("cntrctDtlInfoUrl"),
+    }
+
+
+def upsert_contracts(items, chunk_size=500):
+    """
+    계약정보 DB 저장 ((unty_cntrct_no, contract_type) 기준 일괄 UPSERT)
+
+    Returns:
+        dict: inserted / updated / unchanged / failed 건수
+    """
+    return bulk_upsert(Contract, items, normalize_contract, "계약정보", chunk_size)
@@ -0,0 +1,199 @@
+"""
+나라장터 API 동시 페이지 수집 엔진
+- 1페이지 응답의 totalCount로 전체 페이지 수를 계산한 뒤 나머지 페이지를 병렬 요청
+- 공사/용역/물품 엔드포인트를 하나의 작업 풀에서 동시에 수집
+- 전체 동시 요청 수 제한(concurrency) + 엔드포인트별 초당 요청 수 제한(rate_limit)
+"""
+
+import math
+import time
+import logging
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config import settings
+from utils import fetch_data, backoff
+
+
+# 수집된 한 페이지 (url/tag: 엔드포인트, last_page: totalCount 기준 마지막 페이지)
+Page = namedtuple("Page", "url tag page items total_count last_page")
+
+
+def inquiry_range(start_date, end_date):
+    """
+    조회 기간 → (inqryBgnDt, inqryEndDt)
+
+    YYYYMMDD는 하루 전체(0000 ~ 2359)로, YYYYMMDDHHMM은 그대로 사용
+    """
+    bgn = start_date if len(start_date) >= 12 else start_date + "0000"
+    end = end_date if len(end_date) >= 12 else end_date + "2359"
+    return bgn, end
+
+
+class RateLimiter:
+    """엔드포인트별 요청 간격 제한 (초당 rate회)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self):
+        """다음 요청 슬롯까지 대기"""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_at, now)
+            self._next_at = slot + self.interval
+
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class PageFetcher:
+    """
+    여러 엔드포인트의 페이지를 동시에 수집하는 엔진
+
+    targets: [(url, tag), ...] - tag는 공고 유형(공사/용역/물품) 등 결과 구분값
+    params: pageNo를 제외한 공통 요청 파라미터
+    """
+
+    def __init__(self, concurrency=None, rate_limit=None, fetch=None):
+        self.concurrency = max(1, concurrency or settings.FETCH_CONCURRENCY)
+        self.rate_limit = settings.FETCH_RATE_LIMIT if rate_limit is None else rate_limit
+        self.fetch = fetch or fetch_data
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+        # 동시 요청 수 상한 - 여러 조회 기간을 동시에 수집해도(백필) 인스턴스 전체에 적용
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+
+    def _limiter(self, url):
+        with self._limiters_lock:
+            if url not in self._limiters:
+                self._limiters[url] = RateLimiter(self.rate_limit)
+            return self._limiters[url]
+
+    def _fetch_page(self, url, params, page, attempt=0):
+        """단일 페이지 요청 → response.body 반환 (실패 시 None, attempt > 0이면 백오프 후 재요청)"""
+        if attempt:
+            time.sleep(backoff(attempt - 1))
+
+        with self._slots:
+            self._limiter(url).acquire()
+            data = self.fetch(url, {**params, "pageNo": page})
+        if not data or "response" not in data:
+            return None
+        return data["response"].get("body", {})
+
+    def iter_pages(self, targets, params, label="", start_pages=None):
+        """
+        페이지가 도착하는 순서대로 Page 생성
+
+        엔드포인트별 시작 페이지(기본 1, start_pages로 재개 가능)를 먼저 요청해
+        totalCount를 확인하고, 나머지 페이지를 작업 큐에 넣는다.
+        처리되지 않은 응답이 쌓이지 않도록 진행 중인 요청은 concurrency의 2배로 제한한다.
+
+        시작 페이지가 실패하면 백오프 후 HTTP_MAX_RETRIES회까지 다시 요청하고,
+        그래도 실패한 엔드포인트가 있으면 다른 엔드포인트를 모두 수집한 뒤 RuntimeError를 발생시킨다
+        (나머지 페이지를 알 수 없으므로 그 기간을 완료로 취급하면 안 됨).
+        """
+        num_of_rows = int(params["numOfRows"])
+        start_pages = start_pages or {}
+        max_pending = self.concurrency * 2
+        pool = ThreadPoolExecutor(max_workers=self.concurrency)
+        # (url, tag, page, 시작 페이지 재시도 횟수)
+        queue = deque((url, tag, start_pages.get(url, 1), 0) for url, tag in targets)
+        first_pages = {url: page for url, tag, page, _ in queue}
+        failed_endpoints = []
+        pending = {}
+
+        def fill():
+            while queue and len(pending) < max_pending:
+                url, tag, page, attempt = queue.popleft()
+                future = pool.submit(self._fetch_page, url, params, page, attempt)
+                pending[future] = (url, tag, page, attempt)
+
+        def first_page_failed(url, tag, page, attempt):
+            # 시작 페이지가 없으면 나머지 페이지를 큐에 넣을 수 없으므로 다시 요청
+            if attempt < settings.HTTP_MAX_RETRIES:
+                logging.warning(f"⚠️ {tag} {label} 시작 페이지 {page} 재요청 ({attempt + 1}/{settings.HTTP_MAX_RETRIES})")
+                queue.appendleft((url, tag, page, attempt + 1))
+            else:
+                failed_endpoints.append(tag or url)
+
+        try:
+            fill()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    url, tag, page, attempt = pending.pop(future)
+
+                    try:
+                        body = future.result()
+                    except Exception as e:
+                        logging.error(f"❌ {tag} {label} 페이지 {page} 요청 실패: {e}")
+                        body = None
+                    else:
+                        if body is None:
+                            logging.warning(f"❌ {tag} {label} 페이지 {page} 응답 없음")
+
+                    if body is None:
+                        if page == first_pages[url]:
+                            first_page_failed(url, tag, page, attempt)
+                        continue
+
+                    items = body.get("items") or []
+                    total_count = int(body.get("totalCount") or 0)
+                    last_page = math.ceil(total_count / num_of_rows)
+
+                    if page == first_pages[url]:
+                        queue.extend((url, tag, next_page, 0) for next_page in range(page + 1, last_page + 1))
+                        logging.info(f"🔎 {tag} {label}: 총 {total_count}건 / {max(last_page, 1)}페이지 ({page}페이지부터)")
+
+                    # 빈 페이지(totalCount 0)도 전달해 체크포인트가 완료를 알 수 있게 함
+                    yield Page(url, tag, page, items, total_count, last_page)
+
+                fill()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        if failed_endpoints:
+            raise RuntimeError(f"{label} 시작 페이지 수집 실패 - 미완료 엔드포인트: {', '.join(failed_endpoints)}")
+
+    def iter_items(self, targets, params, tag_key=None, label="", start_pages=None):
+        """
+        페이지 단위 스트림 (도착 순서, Page.items에 item 리스트)
+
+        tag_key가 있으면 각 item에 유형 태그를 붙인다.
+        전체 결과를 메모리에 모으지 않으므로 긴 기간 수집에 사용한다.
+        """
+        for page in self.iter_pages(targets, params, label, start_pages):
+            if tag_key:
+                for item in page.items:
+                    item[tag_key] = page.tag
+            logging.info(f"📄 {page.tag or ''} {label} 페이지 {page.page}: {len(page.items)}건 (총 {page.total_count}건)")
+            yield page
+
+    def fetch_all(self, targets, params, tag_key=None, label=""):
+        """
+        전체 페이지 수집 후 리스트로 반환
+
+        결과는 도착 순서와 관계없이 targets 순서 → 페이지 순서로 정렬되며,
+        tag_key가 있으면 각 item에 유형 태그를 붙인다.
+        """
+        order = {url: i for i, (url, _) in enumerate(targets)}
+        pages = {}
+
+        for page in self.iter_items(targets, params, tag_key, label):
+            pages[(order[page.url], page.page)] = page.items
+
+        all_items = []
+        for key in sorted(pages):
+            all_items.extend(pages[key])
+        return all_items
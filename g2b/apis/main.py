@@ -1,63 +1,143 @@
 import logging
 from datetime import datetime, timedelta
 from config import settings
-import gc
 
 # 상대 경로 import
-from .bidding_api import fetch_biddings, upsert_biddings
-from .award_api import fetch_awards, upsert_awards
-from .orderplan_api import fetch_plans, upsert_plans
-# from .contract_api import fetch_contracts, upsert_contracts  # 계약정보 (현재 미사용)
+from .bidding_api import BIDDING_APIS, iter_biddings, upsert_biddings
+from .award_api import AWARD_APIS, iter_awards, upsert_awards
+from .orderplan_api import ORDER_PLAN_APIS, iter_plans, upsert_plans
+# from .contract_api import CONTRACT_APIS, iter_contracts, upsert_contracts  # 계약정보 (현재 미사용)
+from .checkpoint import CheckpointTracker
+from .watermark import incremental_window, advance_watermark
+from models import Bidding, Award, OrderPlan
+from rollups import flush_rollups
+from similarity_index import flush_similarity_index
+from neighbors import refresh_neighbors
 
 logger = logging.getLogger(__name__)
 
-def run_all(days=1):
+
+def collect_stream(pages, upsert, checkpoint=None):
+    """
+    페이지가 도착할 때마다 바로 정규화 + 저장
+
+    전체 결과를 리스트로 모으지 않으므로 조회 기간이 길어도
+    메모리 사용량은 페이지 몇 개 분량으로 일정하게 유지된다.
+    checkpoint가 있으면 페이지의 모든 행이 저장된 경우에만 진행 상황을 기록한다
+    (실패 행이 있는 페이지는 다음 실행에서 다시 수집, upsert 예외는 그대로 전파).
+
+    Returns:
+        dict: fetched + upsert 결과 건수 합계
+    """
+    totals = {"fetched": 0}
+    for page in pages:
+        totals["fetched"] += len(page.items)
+        result = upsert(page.items)
+        for key, value in result.items():
+            totals[key] = totals.get(key, 0) + value
+        if result.get("failed"):
+            logger.warning(f"⚠️ {page.tag or ''} 페이지 {page.page}: 저장 실패 {result['failed']}건 - 체크포인트 유지")
+            continue
+        if checkpoint:
+            checkpoint.page_done(page)
+    return totals
+
+
+def flush_derived():
+    """기록해 둔 저장 행의 날짜/기관/업체 통계만 재집계 + 새 공고를 유사도 색인에 추가하고 이웃 목록 계산"""
+    flush_rollups()
+    refresh_neighbors(flush_similarity_index())
+
+
+def collect(label, targets, iter_pages, upsert, service_key, start_day, end_day, fetcher=None, flush=True):
+    """
+    체크포인트 기반 재개 가능한 수집 (같은 기간의 미완료 페이지부터 이어서 수집)
+
+    Args:
+        flush: 기간 수집이 끝나면 파생 데이터(롤업/유사도 색인/이웃 목록) 반영
+               - 여러 기간을 동시에 수집하는 백필은 False로 두고 마지막에 flush_derived() 한 번
+
+    Returns:
+        (결과 건수 dict, 전체 페이지 저장 완료 여부)
+    """
+    checkpoint = CheckpointTracker(start_day, end_day)
+    start_pages = checkpoint.resume_pages(targets)
+
+    pages = iter_pages(service_key, start_day, end_day, fetcher=fetcher, start_pages=start_pages)
+    try:
+        result = collect_stream(pages, upsert, checkpoint)
+    finally:
+        if flush:
+            flush_derived()
+    logger.info(f"✅ {label} 수집 완료 ({start_day} ~ {end_day}): {result}")
+    return result, checkpoint.is_complete(targets)
+
+
+def window_end_datetime(end_day):
+    """조회 종료 문자열(YYYYMMDD 또는 YYYYMMDDHHMM) → datetime"""
+    if len(end_day) >= 12:
+        return datetime.strptime(end_day[:12], "%Y%m%d%H%M")
+    return datetime.strptime(end_day[:8], "%Y%m%d").replace(hour=23, minute=59)
+
+
+def collect_dataset(dataset, service_key, now, days=None):
+    """
+    수집 대상 하나 처리
+
+    - days 지정: 최근 days일 고정 기간 수집
+    - days 미지정: 끊긴 증분 기간을 먼저 마저 수집한 뒤, 워터마크 - 겹침 ~ 현재 수집
+    기간 전체가 빠짐없이 저장된 경우에만 워터마크를 전진시킨다.
+    """
+    source, label, targets, iter_pages, upsert, watermark_column = dataset
+    windows = []
+
+    if days:
+        start_date = now - timedelta(days=days)
+        windows.append((start_date.strftime("%Y%m%d"), now.strftime("%Y%m%d")))
+    else:
+        unfinished = CheckpointTracker.unfinished_window(targets)
+        if unfinished:
+            windows.append(unfinished)
+        windows.append(incremental_window(source, now))
+
+    for start_day, end_day in dict.fromkeys(windows):
+        logger.info(f"📥 {label} 수집 시작: {start_day} ~ {end_day}")
+        _, complete = collect(label, targets, iter_pages, upsert, service_key, start_day, end_day)
+
+        if complete:
+            advance_watermark(source, watermark_column, min(now, window_end_datetime(end_day)))
+        else:
+            logger.warning(f"⚠️ {label} {start_day} ~ {end_day} 일부 페이지 미수집 - 워터마크 유지")
+
+
+# (source, 라벨, 엔드포인트, 스트리밍 수집 함수, 저장 함수, 워터마크 기준 컬럼)
+DATASETS = [
+    ("biddings", "입찰공고", BIDDING_APIS, iter_biddings, upsert_biddings, Bidding.notice_date),
+    ("awards", "낙찰정보", AWARD_APIS, iter_awards, upsert_awards, Award.inpt_dt),
+    ("order_plans", "발주계획", ORDER_PLAN_APIS, iter_plans, upsert_plans, OrderPlan.ntice_dt),
+    # ("contracts", "계약정보", CONTRACT_APIS, iter_contracts, upsert_contracts, Contract.cntrct_cncls_date),  # 현재 미사용
+]
+
+
+def run_all(days=None):
     """
     전체 데이터 수집
-    스케줄러에서 10분마다 자동 실행됨 (기본 2일치, 실시간)
+
+    days를 지정하면 최근 days일을, 생략하면 수집 대상별 워터마크 이후만 증분 수집한다.
+    스케줄러는 증분 모드로 실행된다.
     """
     service_key = settings.SERVICE_KEY
+    now = datetime.now()
 
-    # days일 전부터 오늘까지
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    start_day = start_date.strftime("%Y%m%d")
-    end_day = end_date.strftime("%Y%m%d")
+    mode = f"최근 {days}일" if days else "증분"
+    logger.info(f"📅 G2B 데이터 수집 시작 ({mode})")
 
-    logger.info(f"📅 G2B 데이터 수집 시작: {start_day} ~ {end_day} ({days}일)")
-    
     try:
-        # 1) 입찰공고
-        logger.info("📋 입찰공고 수집 시작")
-        biddings = fetch_biddings(service_key, start_day, end_day)
-        if biddings:
-            upsert_biddings(biddings)
-            logger.info(f"✅ 입찰공고 수집 완료: {len(biddings)}건")
-        
-        # 2) 낙찰정보
-        logger.info("🏆 낙찰정보 수집 시작")
-        awards = fetch_awards(service_key, start_day, end_day)
-        if awards:
-            upsert_awards(awards)
-            logger.info(f"✅ 낙찰정보 수집 완료: {len(awards)}건")
-        
-        # 3) 발주계획
-        logger.info("📋 발주계획 수집 시작")
-        plans = fetch_plans(service_key, start_day, end_day)
-        if plans:
-            upsert_plans(plans)
-            logger.info(f"✅ 발주계획 수집 완료: {len(plans)}건")
-        
-        # logger.info("📄 계약정보 수집 시작")
-        # contracts = fetch_contracts(service_key, start_day, end_day)
-        # if contracts:
-        #     upsert_contracts(contracts)
-        #     logger.info(f"✅ 계약정보 수집 완료: {len(contracts)}건")
-        
+        for dataset in DATASETS:
+            collect_dataset(dataset, service_key, now, days)
+
         logger.info("🎉 G2B 데이터 수집 완료")
-        
+
     except Exception as e:
         logger.error(f"❌ G2B 데이터 수집 실패: {e}")
         raise
-    finally:
-        gc.collect()
@@ -1,50 +1,37 @@
-from utils import fetch_data
-from database import SessionLocal
+from .fetcher import PageFetcher
+from .bulk_upsert import bulk_upsert
 from models import OrderPlan
+from rollups import track_plans
 from datetime import datetime
-import logging
 
 
-def fetch_plans(service_key, start_date, end_date):
+ORDER_PLAN_APIS = [
+    ("https://apis.data.go.kr/1230000/ao/OrderPlanSttusService/getOrderPlanSttusListThng", None),
+]
+
+
+def _params(service_key, start_date, end_date):
+    """조회 기간 공통 요청 파라미터 (발주계획은 월 단위 조회)"""
+    return {
+        "numOfRows": 100,
+        "inqryDiv": 1,
+        "orderBgnYm": start_date[:6],
+        "orderEndYm": end_date[:6],
+        "serviceKey": service_key,
+        "type": "json"
+    }
+
+
+def fetch_plans(service_key, start_date, end_date, fetcher=None):
     """발주계획 수집 - 전체 페이징 처리"""
-    url = "https://apis.data.go.kr/1230000/ao/OrderPlanSttusService/getOrderPlanSttusListThng"
-    
-    all_items = []
-    page = 1
-    
-    while True:
-        params = {
-            "pageNo": page,
-            "numOfRows": 100,
-            "inqryDiv": 1,
-            "orderBgnYm": start_date[:6],
-            "orderEndYm": end_date[:6],
-            "serviceKey": service_key,
-            "type": "json"
-        }
-        
-        data = fetch_data(url, params)
-        
-        if not data or "response" not in data:
-            break
-        
-        body = data["response"].get("body", {})
-        items = body.get("items", [])
-        total_count = body.get("totalCount", 0)
-        
-        if not items:
-            break
-        
-        all_items.extend(items)
-        
-        logging.info(f"📄 발주계획 페이지 {page} 수집: {len(items)}건 (총 {total_count}건 중 {len(all_items)}건)")
-        
-        if len(all_items) >= total_count:
-            break
-        
-        page += 1
-    
-    return all_items
+    fetcher = fetcher or PageFetcher()
+    return fetcher.fetch_all(ORDER_PLAN_APIS, _params(service_key, start_date, end_date), label="발주계획")
+
+
+def iter_plans(service_key, start_date, end_date, fetcher=None, start_pages=None):
+    """발주계획 페이지 단위 스트리밍 수집"""
+    fetcher = fetcher or PageFetcher()
+    yield from fetcher.iter_items(ORDER_PLAN_APIS, _params(service_key, start_date, end_date), label="발주계획", start_pages=start_pages)
 
 
 def parse_datetime(date_str):
@@ -70,60 +57,44 @@ def parse_int(value):
         return None
 
 
-def upsert_plans(items):
-    """발주계획 DB 저장"""
-    db = SessionLocal()
-    saved_count = 0
+def normalize_plan(item):
+    """API 응답 item → order_plans 컬럼 dict 변환 (통합번호 없으면 None)"""
+    unty_no = item.get("orderPlanUntyNo")
+    if not unty_no:
+        return None
     
-    try:
-        for item in items:
-            unty_no = item.get("orderPlanUntyNo")
-            
-            if not unty_no:
-                continue
-            
-            try:
-                obj = db.query(OrderPlan).filter(OrderPlan.order_plan_unty_no == unty_no).first()
-                
-                if obj is None:
-                    obj = OrderPlan(order_plan_unty_no=unty_no)
-                    db.add(obj)
-                
-                obj.biz_nm = item.get("bizNm")
-                obj.order_instt_nm = item.get("orderInsttNm")
-                obj.dept_nm = item.get("deptNm")
-                obj.ofcl_nm = item.get("ofclNm")
-                obj.tel_no = item.get("telNo")
-                obj.prcrmnt_methd = item.get("prcrmntMethd")
-                obj.cntrct_mthd_nm = item.get("cntrctMthdNm")
-                obj.sum_order_amt = parse_int(item.get("sumOrderAmt"))
-                obj.sum_order_dol_amt = item.get("sumOrderDolAmt")
-                obj.qty_cntnts = item.get("qtyCntnts")
-                obj.unit = item.get("unit")
-                obj.prdct_clsfc_no = item.get("prdctClsfcNo")
-                obj.dtil_prdct_clsfc_no = item.get("dtilPrdctClsfcNo")
-                obj.prdct_clsfc_no_nm = item.get("prdctClsfcNoNm")
-                obj.dtil_prdct_clsfc_no_nm = item.get("dtilPrdctClsfcNoNm")
-                obj.usg_cntnts = item.get("usgCntnts")
-                obj.spec_cntnts = item.get("specCntnts")
-                obj.rmrk_cntnts = item.get("rmrkCntnts")
-                obj.order_year = item.get("orderYear")
-                obj.order_mnth = item.get("orderMnth")
-                obj.ntice_dt = parse_datetime(item.get("nticeDt"))
-                obj.chg_dt = parse_datetime(item.get("chgDt"))
-                
-                db.commit()
-                saved_count += 1
-                
-            except Exception as e:
-                logging.error(f"❌ 발주계획 저장 실패 ({unty_no}): {e}")
-                db.rollback()
-                continue
-        
-        logging.info(f"💾 발주계획 저장 완료: {saved_count}건")
-        
-    except Exception as e:
-        logging.error(f"❌ 발주계획 upsert 전체 실패: {e}")
-        db.rollback()
-    finally:
-        db.close()
+    return {
+        "order_plan_unty_no": unty_no,
+        "biz_nm": item.get("bizNm"),
+        "order_instt_nm": item.get("orderInsttNm"),
+        "dept_nm": item.get("deptNm"),
+        "ofcl_nm": item.get("ofclNm"),
+        "tel_no": item.get("telNo"),
+        "prcrmnt_methd": item.get("prcrmntMethd"),
+        "cntrct_mthd_nm": item.get("cntrctMthdNm"),
+        "sum_order_amt": parse_int(item.get("sumOrderAmt")),
+        "sum_order_dol_amt": item.get("sumOrderDolAmt"),
+        "qty_cntnts": item.get("qtyCntnts"),
+        "unit": item.get("unit"),
+        "prdct_clsfc_no": item.get("prdctClsfcNo"),
+        "dtil_prdct_clsfc_no": item.get("dtilPrdctClsfcNo"),
+        "prdct_clsfc_no_nm": item.get("prdctClsfcNoNm"),
+        "dtil_prdct_clsfc_no_nm": item.get("dtilPrdctClsfcNoNm"),
+        "usg_cntnts": item.get("usgCntnts"),
+        "spec_cntnts": item.get("specCntnts"),
+        "rmrk_cntnts": item.get("rmrkCntnts"),
+        "order_year": item.get("orderYear"),
+        "order_mnth": item.get("orderMnth"),
+        "ntice_dt": parse_datetime(item.get("nticeDt")),
+        "chg_dt": parse_datetime(item.get("chgDt")),
+    }
+
+
+def upsert_plans(items, chunk_size=500):
+    """
+    발주계획 DB 저장 (order_plan_unty_no 기준 일괄 UPSERT)
+
+    Returns:
+        dict: inserted / updated / unchanged / failed 건수
+    """
+    return bulk_upsert(OrderPlan, items, normalize_plan, "발주계획", chunk_size, on_change=track_plans)
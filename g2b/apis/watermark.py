@@ -0,0 +1,75 @@
+"""
+증분 수집 워터마크
+- 수집 대상별로 이미 저장된 최대 기준일시(입찰공고 bidNtceDt, 낙찰 inptDt 등)를 기록
+- 다음 수집은 워터마크 - 안전 겹침(COLLECT_OVERLAP_MINUTES)부터 현재까지만 조회
+"""
+
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from config import settings
+from database import SessionLocal
+from models import CollectWatermark
+
+
+def get_watermark(source):
+    """저장된 워터마크 (없으면 None)"""
+    db = SessionLocal()
+    try:
+        row = db.query(CollectWatermark).filter(CollectWatermark.source == source).first()
+        return row.watermark if row else None
+    finally:
+        db.close()
+
+
+def incremental_window(source, now=None):
+    """
+    증분 조회 기간 (start, end) - YYYYMMDDHHMM 문자열
+
+    워터마크가 없으면 COLLECT_DEFAULT_DAYS일 전부터 조회
+    """
+    now = now or datetime.now()
+    watermark = get_watermark(source)
+
+    if watermark is None:
+        start = now - timedelta(days=settings.COLLECT_DEFAULT_DAYS)
+    else:
+        start = min(watermark, now) - timedelta(minutes=settings.COLLECT_OVERLAP_MINUTES)
+
+    return start.strftime("%Y%m%d%H%M"), now.strftime("%Y%m%d%H%M")
+
+
+def advance_watermark(source, column, window_end):
+    """
+    조회 기간을 빠짐없이 수집한 뒤 워터마크 전진
+
+    DB에 저장된 기준일시 최댓값을 사용하되 조회 종료 시각을 넘지 않게 하고,
+    기존 워터마크보다 작아지지 않게 한다 (GREATEST).
+    """
+    db = SessionLocal()
+    try:
+        latest = db.query(func.max(column)).filter(column <= window_end).scalar()
+        if latest is None:
+            return None
+
+        stmt = insert(CollectWatermark).values(source=source, watermark=latest)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CollectWatermark.source],
+            set_={
+                "watermark": func.greatest(CollectWatermark.watermark, stmt.excluded.watermark),
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+        logging.info(f"🔖 {source} 워터마크 갱신: {latest}")
+        return latest
+
+    except Exception as e:
+        logging.error(f"❌ {source} 워터마크 갱신 실패: {e}")
+        db.rollback()
+        return None
+    finally:
+        db.close()
@@ -6,7 +6,9 @@ G2B API 기반 입찰공고/낙찰정보/발주계획 데이터 제공
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from typing import Optional
 import logging
+import threading
 
 from config import settings
 from database import init_db
@@ -30,6 +32,15 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 FastAPI 서버 시작")
     init_db()
     logger.info("✅ 데이터베이스 초기화 완료")
+
+    # 입찰공고 검색 색인 적재 (백그라운드 - 적재 전에는 DB 검색으로 처리)
+    if settings.SEARCH_INDEX_ENABLED:
+        from search_index import build_bidding_index
+        threading.Thread(target=build_bidding_index, name="search-index", daemon=True).start()
+
+    # 유사 공고 색인 매핑 (python similarity_index.py로 구축된 경우)
+    from similarity_index import similarity_index
+    threading.Thread(target=similarity_index.refresh, kwargs={"force": True}, name="similarity-index", daemon=True).start()
     
     # 스케줄러 시작 - 10분마다 2일치 데이터 수집 (실시간)
     scheduler.add_job(
@@ -57,6 +68,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# ==================== 응답 캐시 ====================
+# CORS보다 먼저 등록해 안쪽에서 실행 (요청별 CORS 헤더는 캐시하지 않음)
+from response_cache import cache_middleware
+
+app.middleware("http")(cache_middleware)
+
 # ==================== CORS ====================
 app.add_middleware(
     CORSMiddleware,
@@ -92,16 +109,29 @@ def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/metrics/fetch")
+def fetch_metrics_endpoint():
+    """G2B API 요청 지표 (지연시간, 재시도, 수신 바이트)"""
+    from utils import fetch_metrics
+    return fetch_metrics.snapshot()
+
+@app.get("/metrics/cache")
+def cache_metrics_endpoint():
+    """응답 캐시 지표 (적중률, 항목 수, 제거 횟수)"""
+    from response_cache import response_cache, data_version
+    return {**response_cache.snapshot(), "data_version": data_version.current()}
+
 # ==================== 수동 수집 ====================
 @app.post("/collect")
-def manual_collect(days: int = 1):
-    """수동 데이터 수집 트리거"""
+def manual_collect(days: Optional[int] = None):
+    """수동 데이터 수집 트리거 (days 생략 시 워터마크 이후 증분 수집)"""
     from apis.main import run_all
 
-    logger.info(f"🔄 수동 데이터 수집 시작 ({days}일)")
+    mode = f"{days}일" if days else "증분"
+    logger.info(f"🔄 수동 데이터 수집 시작 ({mode})")
     try:
         run_all(days=days)
-        return {"status": "success", "message": f"데이터 수집 완료 ({days}일)"}
+        return {"status": "success", "message": f"데이터 수집 완료 ({mode})"}
     except Exception as e:
         logger.error(f"❌ 수동 데이터 수집 실패: {e}")
         return {"status": "error", "message": str(e)}
@@ -1,14 +1,27 @@
 """
 배치 ML 분석 스크립트
 기존 입찰 공고 데이터에 대해 ML 분석을 실행하고 결과를 DB에 저장
+- 공고를 id 키셋 청크로 읽어 전체를 메모리에 올리지 않음
+- workers > 1이면 청크 분류를 프로세스 풀로 나눠 실행 (DB 읽기/쓰기는 메인 프로세스)
+- 청크마다 UPDATE ... FROM (VALUES ...) 한 번 + 태그 동기화 후 커밋
+
+실행: cd g2b && python batch_ml_analysis.py [limit] [--workers 8] [--chunk-size 500] [--all]
 """
 
-import sys
+import os
+import time
 import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from database import SessionLocal
-from models import Bidding, Award
+from models import Bidding, BiddingTag
 from ml_analyzer import analyzer
+from ml_pipeline import ANALYSIS_CHUNK_SIZE, agency_participant_averages, bidding_record, write_analyses
+from rollups import refresh_rollups, rebuild_rollups
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,78 +29,152 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 분석에 필요한 공고 컬럼 (ORM 객체 대신 행으로 읽음)
+RECORD_COLUMNS = (
+    Bidding.id, Bidding.cluster_id, Bidding.title, Bidding.budget_amount, Bidding.notice_type,
+    Bidding.notice_date, Bidding.bid_close_date, Bidding.ordering_agency,
+)
 
-def batch_analyze_biddings(limit: int = None):
-    """전체 입찰 공고 배치 분석"""
 
-    db: Session = SessionLocal()
+def _analyze_chunk(records, participant_avgs):
+    """프로세스 풀 작업 - 청크 하나 분류 (DB 접근 없음)"""
+    return analyzer.analyze_batch(records, participant_avgs=participant_avgs)
 
-    try:
-        # 미분석 공고 조회
-        query = db.query(Bidding).filter(Bidding.ai_category.is_(None))
 
-        if limit:
-            query = query.limit(limit)
+def iter_chunks(db, chunk_size, limit=None, reanalyze=False):
+    """분석 대상 공고를 id 순 키셋 청크로 조회 (reanalyze면 분석된 공고 포함)"""
+    last_id, remaining = 0, limit
+    while remaining is None or remaining > 0:
+        query = select(*RECORD_COLUMNS).where(Bidding.id > last_id)
+        if not reanalyze:
+            query = query.where(Bidding.ai_category.is_(None))
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        rows = db.execute(query.order_by(Bidding.id).limit(size)).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+        if remaining is not None:
+            remaining -= len(rows)
 
-        biddings = query.all()
-        total = len(biddings)
 
-        logger.info(f"🚀 배치 분석 시작: {total}개 공고")
+def batch_analyze_biddings(limit: int = None, workers: int = 1, chunk_size: int = ANALYSIS_CHUNK_SIZE,
+                           reanalyze: bool = False):
+    """
+    입찰 공고 배치 분석
 
-        if total == 0:
-            logger.info("✅ 분석할 공고가 없습니다.")
-            return
+    Args:
+        limit: 최대 분석 공고 수 (없으면 전체)
+        workers: 분류 프로세스 수 (1이면 메인 프로세스에서 실행)
+        chunk_size: 한 번에 분류/저장/커밋하는 공고 수
+        reanalyze: 분석된 공고도 다시 분석 (분류기 변경 후 전체 재분석)
+    """
 
-        success_count = 0
-        error_count = 0
+    db: Session = SessionLocal()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    started = time.perf_counter()
 
-        for i, bidding in enumerate(biddings, 1):
-            try:
-                # 관련 낙찰 데이터 조회 (성능 최적화를 위해 제한)
-                awards = db.query(Award).filter(
-                    Award.ntce_instt_nm == bidding.ordering_agency
-                ).limit(50).all()
-
-                awards_data = [
-                    {
-                        'prtcpt_cnum': a.prtcpt_cnum,
-                        'award_rate': a.award_rate
-                    }
-                    for a in awards if a.prtcpt_cnum
-                ]
-
-                # ML 분석 실행
-                bidding_dict = {
-                    'title': bidding.title,
-                    'budget_amount': bidding.budget_amount,
-                    'notice_type': bidding.notice_type,
-                    'notice_date': bidding.notice_date,
-                    'bid_close_date': bidding.bid_close_date
-                }
-
-                result = analyzer.analyze_bidding(bidding_dict, awards_data)
-
-                # DB 업데이트
-                bidding.ai_category = result['ai_category']
-                bidding.ai_tags = result['ai_tags']
-                bidding.competition_level = result['competition_level']
-
-                success_count += 1
-
-                # 100개마다 커밋
-                if i % 100 == 0:
-                    db.commit()
-                    logger.info(f"⏳ 진행: {i}/{total} ({i/total*100:.1f}%) - 성공: {success_count}, 실패: {error_count}")
+    success_count = 0
+    error_count = 0
+    notice_dates = set()
+
+    # 발주기관별 평균 참가업체수 (경쟁 강도 예측용) - 처음 나온 기관만 조회해 누적
+    averages, seen_agencies = {}, set()
+
+    # 분류 중인 청크 (rows, records, participant_avgs, 제출한 풀, future)
+    # - workers * 2개까지만 (읽기가 분류보다 앞서 나가 메모리가 커지지 않도록)
+    pending = deque()
 
+    def restart_pool(broken):
+        """비정상 종료된 풀을 새로 만듦 (이미 다시 만든 풀이면 그대로)"""
+        nonlocal pool
+        if pool is broken:
+            logger.warning("⚠️ 분류 프로세스 풀 재시작")
+            pool.shutdown(cancel_futures=True)
+            pool = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(rows, records, participant_avgs):
+        try:
+            future = pool.submit(_analyze_chunk, records, participant_avgs)
+        except BrokenProcessPool:
+            restart_pool(pool)
+            future = pool.submit(_analyze_chunk, records, participant_avgs)
+        pending.append((rows, records, participant_avgs, pool, future))
+
+    def pool_results(records, participant_avgs, submitted_pool, future):
+        """
+        풀 작업 결과 - 풀이 깨져 받지 못하면 이 청크만 단독 프로세스에서 다시 분류
+
+        작업 프로세스 하나가 죽으면 풀의 대기 중인 청크가 모두 BrokenProcessPool로 끝나므로,
+        다시 실행해도 실패한 청크(원인 청크)만 실패로 센다.
+        """
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            restart_pool(submitted_pool)
+        logger.warning(f"⚠️ 분류 프로세스 비정상 종료 - 청크 {len(records)}건 단독 재실행")
+        with ProcessPoolExecutor(max_workers=1) as solo:
+            return solo.submit(_analyze_chunk, records, participant_avgs).result()
+
+    def drain():
+        rows, records, participant_avgs, submitted_pool, future = pending.popleft()
+        finish(rows, lambda: pool_results(records, participant_avgs, submitted_pool, future))
+
+    def finish(rows, get_results):
+        """청크 분류 결과 저장 - 분류(재실행 후에도 작업 프로세스 종료 포함)/저장 실패는 이 청크만 실패로 세고 계속"""
+        nonlocal success_count, error_count
+        try:
+            results = get_results()
+        except Exception as e:
+            error_count += len(rows)
+            logger.error(f"❌ 공고 ID {rows[0].id}~{rows[-1].id} 분류 실패: {e!r}")
+        else:
+            try:
+                write_analyses(db, [row.id for row in rows], results)
+                db.commit()
+                success_count += len(rows)
+                notice_dates.update(row.notice_date for row in rows)
             except Exception as e:
-                error_count += 1
-                logger.error(f"❌ 공고 ID {bidding.id} 분석 실패: {e}")
+                error_count += len(rows)
+                logger.error(f"❌ 공고 ID {rows[0].id}~{rows[-1].id} 분석 실패: {e}")
+                db.rollback()
+        done = success_count + error_count
+        logger.info(f"⏳ 진행: {done}건 ({done / (time.perf_counter() - started):.0f}건/초) - 성공: {success_count}, 실패: {error_count}")
+
+    try:
+        logger.info(f"🚀 배치 분석 시작 (workers={workers}, chunk_size={chunk_size}, 재분석={'예' if reanalyze else '아니오'})")
+
+        for rows in iter_chunks(db, chunk_size, limit, reanalyze):
+            agencies = {row.ordering_agency for row in rows} - seen_agencies
+            averages.update(agency_participant_averages(db, agencies))
+            seen_agencies |= agencies
+
+            records = [bidding_record(row) for row in rows]
+            participant_avgs = [averages.get(row.ordering_agency) for row in rows]
+            if pool is None:
+                finish(rows, lambda: _analyze_chunk(records, participant_avgs))
                 continue
 
-        # 최종 커밋
-        db.commit()
+            # 작업 프로세스가 비정상 종료되면 풀을 다시 만들고, 대기 중이던 청크는 drain에서 다시 분류
+            submit(rows, records, participant_avgs)
+            while len(pending) >= workers * 2:
+                drain()
+
+        while pending:
+            drain()
+
+        total = success_count + error_count
+        if total == 0:
+            logger.info("✅ 분석할 공고가 없습니다.")
+            return
+
+        # 카테고리가 바뀐 날짜의 통계 롤업 재집계 (전체 재분석이면 전체 재집계)
+        if reanalyze and limit is None:
+            rebuild_rollups()
+        else:
+            refresh_rollups(bidding_dates=notice_dates)
 
-        logger.info(f"✅ 배치 분석 완료!")
+        logger.info(f"✅ 배치 분석 완료! ({time.perf_counter() - started:.1f}초)")
         logger.info(f"   - 전체: {total}개")
         logger.info(f"   - 성공: {success_count}개")
         logger.info(f"   - 실패: {error_count}개")
@@ -97,13 +184,14 @@ def batch_analyze_biddings(limit: int = None):
         db.rollback()
 
     finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
         db.close()
 
 
 def print_statistics(db: Session):
     """분석 결과 통계 출력"""
     from sqlalchemy import func
-    import json
 
     logger.info("\n" + "="*50)
     logger.info("📊 ML 분석 통계")
@@ -138,40 +226,37 @@ def print_statistics(db: Session):
         logger.info(f"   - {level}: {count}개")
 
     # 인기 태그
-    biddings = db.query(Bidding).filter(
-        Bidding.ai_tags.isnot(None)
-    ).limit(1000).all()
-
-    tag_counts = {}
-    for b in biddings:
-        if b.ai_tags:
-            try:
-                tags = json.loads(b.ai_tags)
-                for tag in tags:
-                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
-            except:
-                continue
+    tag_stats = db.query(
+        BiddingTag.tag,
+        func.count().label('count')
+    ).group_by(
+        BiddingTag.tag
+    ).order_by(
+        func.count().desc()
+    ).limit(10).all()
 
     logger.info("\n🔖 인기 태그 TOP 10:")
-    sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
-    for i, (tag, count) in enumerate(sorted_tags[:10], 1):
+    for i, (tag, count) in enumerate(tag_stats, 1):
         logger.info(f"   {i}. {tag}: {count}개")
 
     logger.info("="*50 + "\n")
 
 
 if __name__ == "__main__":
-    # 커맨드 라인 인자로 limit 지정 가능
-    limit = None
-    if len(sys.argv) > 1:
-        try:
-            limit = int(sys.argv[1])
-            logger.info(f"제한: {limit}개만 분석")
-        except ValueError:
-            logger.warning("잘못된 limit 값. 전체 분석을 진행합니다.")
+    parser = argparse.ArgumentParser(description="입찰 공고 배치 ML 분석")
+    parser.add_argument("limit", nargs="?", type=int, default=None, help="최대 분석 공고 수 (생략 시 전체)")
+    parser.add_argument("--workers", type=int, default=1, help=f"분류 프로세스 수 (CPU {os.cpu_count()}개)")
+    parser.add_argument("--chunk-size", type=int, default=ANALYSIS_CHUNK_SIZE, help="청크당 공고 수 (분류/저장/커밋 단위)")
+    parser.add_argument("--all", action="store_true", help="분석된 공고까지 전체 재분석 (분류기 변경 후)")
+    args = parser.parse_args()
+
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error("--workers와 --chunk-size는 1 이상이어야 합니다.")
+    if args.limit:
+        logger.info(f"제한: {args.limit}개만 분석")
 
     # 배치 분석 실행
-    batch_analyze_biddings(limit)
+    batch_analyze_biddings(args.limit, workers=args.workers, chunk_size=args.chunk_size, reanalyze=args.all)
 
     # 통계 출력
     db = SessionLocal()
@@ -0,0 +1,80 @@
+"""
+배치 분류 벤치마크
+- 합성 공고 코퍼스에 대해 건별 analyze_bidding 반복과 analyzer.analyze_batch 비교
+- 두 결과가 완전히 같은지도 확인 (다르면 종료 코드 1)
+
+실행: cd g2b && python -m benchmarks.bench_classify --size 200000
+"""
+
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+from ml_analyzer import analyzer
+from benchmarks.bench_search import make_corpus
+
+EXTRA_WORDS = ["긴급", "재공고", "신규", "운영", "유지보수", "개보수", "홈페이지 구축", "DB 이전", "방역 소독"]
+
+
+def make_records(size, seed=42):
+    rng = random.Random(seed)
+    records = []
+    for title in make_corpus(size, seed):
+        if rng.random() < 0.3:
+            title = f"[{rng.choice(EXTRA_WORDS)}] {title}"
+        notice_date = datetime(2024, 1, 1) + timedelta(days=rng.randint(0, 365))
+        records.append({
+            'title': title,
+            'budget_amount': rng.choice([None, 30_000_000, 300_000_000, 3_000_000_000]),
+            'notice_type': rng.choice(['공사', '용역', '물품']),
+            'notice_date': notice_date,
+            'bid_close_date': notice_date + timedelta(days=rng.randint(1, 21)),
+        })
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 분류 벤치마크")
+    parser.add_argument("--size", type=int, default=200000, help="코퍼스 공고 수")
+    args = parser.parse_args()
+
+    records = make_records(args.size)
+    analyzer.analyze_batch(records[:10])  # 정규식 컴파일은 측정에서 제외
+
+    started = time.perf_counter()
+    per_row = [analyzer.analyze_bidding(record) for record in records]
+    per_row_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch = analyzer.analyze_batch(records)
+    batch_sec = time.perf_counter() - started
+
+    titles = [record['title'] for record in records]
+    started = time.perf_counter()
+    for title in titles:
+        analyzer.classify_category(title)
+        analyzer.generate_tags({'title': title})
+    keyword_per_row_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    analyzer.match_keywords_batch(titles)
+    keyword_batch_sec = time.perf_counter() - started
+
+    print(f"📦 공고 {len(records):,}건")
+    print(f"  건별 analyze_bidding : {per_row_sec:.2f}s ({len(records) / per_row_sec:,.0f}건/s)")
+    print(f"  analyze_batch        : {batch_sec:.2f}s ({len(records) / batch_sec:,.0f}건/s, {per_row_sec / batch_sec:.1f}배)")
+    print(f"  키워드 매칭만 - 건별 : {keyword_per_row_sec:.2f}s / 배치: {keyword_batch_sec:.2f}s "
+          f"({keyword_per_row_sec / keyword_batch_sec:.1f}배)")
+
+    mismatches = sum(1 for a, b in zip(per_row, batch) if a != b)
+    if mismatches:
+        print(f"❌ 결과 불일치 {mismatches}건")
+        return 1
+    print("✅ 건별 결과와 동일")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
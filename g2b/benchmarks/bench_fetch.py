@@ -0,0 +1,55 @@
+"""
+수집 엔진 처리량 벤치마크
+- 로컬 스텁 서버에 대해 순차 수집(concurrency=1)과 동시 수집을 비교
+
+실행: cd g2b && python -m benchmarks.bench_fetch --total 3000 --latency 0.2
+"""
+
+import time
+import logging
+import argparse
+
+from apis.fetcher import PageFetcher
+from benchmarks.stub_server import StubG2BServer
+
+
+def run(fetcher, server, num_of_rows):
+    targets = [
+        (f"{server.base_url}/getBidPblancListInfoCnstwk", "공사"),
+        (f"{server.base_url}/getBidPblancListInfoServc", "용역"),
+        (f"{server.base_url}/getBidPblancListInfoThng", "물품"),
+    ]
+    params = {"numOfRows": num_of_rows, "type": "json"}
+
+    server.request_count = 0
+    started = time.perf_counter()
+    items = fetcher.fetch_all(targets, params, tag_key="_notice_type", label="bench")
+    elapsed = time.perf_counter() - started
+    return len(items), server.request_count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 엔진 벤치마크")
+    parser.add_argument("--total", type=int, default=3000, help="엔드포인트별 totalCount")
+    parser.add_argument("--rows", type=int, default=100, help="numOfRows")
+    parser.add_argument("--latency", type=float, default=0.2, help="요청당 지연(초)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--rate-limit", type=float, default=0, help="엔드포인트별 초당 요청 수 (0=무제한)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with StubG2BServer(args.total, args.latency) as server:
+        baseline = None
+        for concurrency in args.concurrency:
+            fetcher = PageFetcher(concurrency=concurrency, rate_limit=args.rate_limit)
+            count, requests_made, elapsed = run(fetcher, server, args.rows)
+            baseline = baseline or elapsed
+            print(
+                f"concurrency={concurrency:>3}  items={count:>7}  requests={requests_made:>5}  "
+                f"{elapsed:7.2f}s  {requests_made / elapsed:7.1f} pages/s  x{baseline / elapsed:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
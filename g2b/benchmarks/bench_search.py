@@ -0,0 +1,99 @@
+"""
+검색 엔진 벤치마크
+- 합성 공고명 코퍼스에 대해 bigram 역색인과 부분 일치 스캔(contains)을 비교
+- --db: 같은 코퍼스를 임시 테이블에 넣고 PostgreSQL LIKE '%검색어%'도 측정
+
+실행: cd g2b && python -m benchmarks.bench_search --size 1000000 --db
+"""
+
+import io
+import time
+import random
+import argparse
+
+from search_index import BigramIndex
+
+AGENCIES = ["서울특별시", "부산광역시", "경기도", "한국도로공사", "한국전력공사", "국토교통부", "조달청", "교육청"]
+SUBJECTS = [
+    "도로", "교량", "하천", "상수도", "하수관로", "청사", "학교", "체육관", "공원", "주차장",
+    "전산장비", "소프트웨어", "정보시스템", "CCTV", "조명", "냉난방기", "차량", "의약품", "급식", "청소",
+]
+WORKS = ["보수공사", "신축공사", "정비사업", "유지관리 용역", "설계용역", "구매", "임차", "고도화 사업", "감리용역", "설치"]
+QUERIES = ["도로", "보수공사", "정보시스템 고도화", "하수관로 정비", "CCTV", "체육관 신축", "급식", "2024년"]
+
+
+def make_corpus(size, seed=42):
+    rng = random.Random(seed)
+    titles = []
+    for i in range(size):
+        titles.append(
+            f"{rng.choice(['2023년', '2024년', '2025년'])} {rng.choice(AGENCIES)} "
+            f"{rng.choice(SUBJECTS)} {rng.choice(WORKS)}({rng.randint(1, 9)}차)"
+        )
+    return titles
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat * 1000
+
+
+def bench_db(titles, repeat):
+    """임시 테이블에 코퍼스 적재 후 LIKE 검색 시간 (ms)"""
+    from database import engine
+
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("CREATE TEMP TABLE bench_titles (id integer PRIMARY KEY, title text)")
+        buf = io.StringIO("".join(f"{i}\t{title}\n" for i, title in enumerate(titles)))
+        cur.copy_expert("COPY bench_titles (id, title) FROM STDIN", buf)
+        cur.execute("ANALYZE bench_titles")
+
+        timings = {}
+        for term in QUERIES:
+            def run():
+                cur.execute("SELECT id FROM bench_titles WHERE title LIKE %s", (f"%{term}%",))
+                return cur.fetchall()
+            rows, ms = timed(run, repeat)
+            timings[term] = (len(rows), ms)
+        return timings
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="검색 엔진 벤치마크")
+    parser.add_argument("--size", type=int, default=1000000, help="코퍼스 공고 수")
+    parser.add_argument("--repeat", type=int, default=3, help="검색어당 반복 횟수")
+    parser.add_argument("--db", action="store_true", help="PostgreSQL LIKE 검색도 측정")
+    args = parser.parse_args()
+
+    titles = make_corpus(args.size)
+
+    index = BigramIndex()
+    started = time.perf_counter()
+    for doc_id, title in enumerate(titles):
+        index.add(doc_id, title)
+    print(f"index build: {args.size}건 {time.perf_counter() - started:.1f}s")
+
+    db_timings = bench_db(titles, args.repeat) if args.db else {}
+
+    for term in QUERIES:
+        hits, index_ms = timed(lambda: index.search(term), args.repeat)
+        scan, scan_ms = timed(lambda: [i for i, title in enumerate(titles) if term in title], args.repeat)
+        assert hits == set(scan), term
+
+        line = f"{term:<14} hits={len(hits):>7}  index={index_ms:8.1f}ms  scan={scan_ms:8.1f}ms  x{scan_ms / index_ms:.1f}"
+        if term in db_timings:
+            count, db_ms = db_timings[term]
+            assert count == len(hits), term
+            line += f"  db_like={db_ms:8.1f}ms"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+유사 공고 검색 벤치마크 (exact vs ann)
+- 합성 공고명 코퍼스로 임시 디렉터리에 유사도 색인을 구축하고
+  LSH 구성(tables × bits)·probes별 recall@k와 질의 지연을 exact 검색과 비교
+- recall@k: ann 결과 중 exact k번째 점수 이상인 비율 (동점 공고가 많아 id 교집합 대신 점수 기준)
+
+실행: cd g2b && python -m benchmarks.bench_similarity --size 200000 --configs 16x8,24x10,32x12 --rerank 1000
+"""
+
+import time
+import random
+import argparse
+import tempfile
+
+import numpy as np
+
+from similarity_index import SimilarityIndex, write_generation
+from benchmarks.bench_search import make_corpus
+
+SYLLABLES = "가나다라마바사아자차카타파하강남동서북산천교육청시군구읍면리"
+
+
+def make_titles(size, seed=42):
+    """bench_search 코퍼스에 임의 고유명사를 붙여 어휘를 다양하게"""
+    rng = random.Random(seed)
+    return [
+        f"{title} {''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))}"
+        for title in make_corpus(size, seed)
+    ]
+
+
+def timed_search(index, queries, top_k, **kwargs):
+    results, started = [], time.perf_counter()
+    for doc_id, title in queries:
+        results.append(index.search(title, top_k, exclude_id=doc_id, **kwargs))
+    return results, (time.perf_counter() - started) / len(queries) * 1000
+
+
+def recall(exact, approximate, top_k):
+    hits = total = 0
+    for truth, found in zip(exact, approximate):
+        if not truth:
+            continue
+        threshold = truth[-1][1] - 1e-6
+        total += min(top_k, len(truth))
+        hits += sum(1 for _, score in found if score >= threshold)
+    return hits / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유사 공고 검색 벤치마크")
+    parser.add_argument("--size", type=int, default=200000, help="코퍼스 공고 수")
+    parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--configs", default="16x8,24x10,32x12", help="LSH 구성 목록 (tables x bits)")
+    parser.add_argument("--rerank", type=int, default=None, help="정확히 재계산할 후보 수 (기본 SIMILARITY_ANN_RERANK)")
+    args = parser.parse_args()
+
+    titles = make_titles(args.size)
+    ids = np.arange(len(titles))
+    rng = random.Random(7)
+    queries = [(i, titles[i]) for i in rng.sample(range(len(titles)), args.queries)]
+    print(f"📦 공고 {len(titles):,}건, 질의 {len(queries)}개, top-{args.top_k}")
+
+    exact = None
+    for config in args.configs.split(","):
+        tables, bits = (int(value) for value in config.lower().split("x"))
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            write_generation(directory, ids, titles, tables=tables, bits=bits)
+            build_sec = time.perf_counter() - started
+
+            index = SimilarityIndex(directory, check_interval=3600)
+            index.refresh(force=True)
+
+            if exact is None:
+                exact, exact_ms = timed_search(index, queries, args.top_k, mode="exact")
+                print(f"  exact             : {exact_ms:7.2f}ms/질의")
+
+            print(f"  ann {tables}x{bits} (구축 {build_sec:.1f}s)")
+            for probes in (0, 1, 2):
+                found, ann_ms = timed_search(index, queries, args.top_k, mode="ann", probes=probes, rerank=args.rerank)
+                print(
+                    f"    probes={probes}        : {ann_ms:7.2f}ms/질의, "
+                    f"recall@{args.top_k} {recall(exact, found, args.top_k):.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+나라장터 API 로컬 스텁 서버 (벤치마크용)
+- 모든 경로에 대해 pageNo/numOfRows 기준의 가짜 페이지를 응답
+- latency로 실제 API 왕복 지연을 흉내냄
+"""
+
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+class StubG2BServer:
+    """totalCount건의 데이터를 페이지 단위로 내려주는 스텁 서버"""
+
+    def __init__(self, total_count=2000, latency=0.2, host="127.0.0.1", port=0):
+        self.total_count = total_count
+        self.latency = latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                page = int(query.get("pageNo", ["1"])[0])
+                rows = int(query.get("numOfRows", ["10"])[0])
+                endpoint = urlparse(self.path).path.rsplit("/", 1)[-1]
+
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency)
+
+                start = (page - 1) * rows
+                end = min(start + rows, stub.total_count)
+                items = [
+                    {
+                        "bidNtceNo": f"{endpoint}-{i:08d}",
+                        "bidNtceNm": f"스텁 공고 {i}",
+                        "bidNtceDt": "2024-01-01 09:00:00",
+                    }
+                    for i in range(start, end)
+                ]
+
+                payload = json.dumps({
+                    "response": {
+                        "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE."},
+                        "body": {"items": items, "totalCount": stub.total_count,
+                                 "pageNo": page, "numOfRows": rows},
+                    }
+                }, ensure_ascii=False).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="나라장터 API 스텁 서버")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--total", type=int, default=2000, help="엔드포인트별 totalCount")
+    parser.add_argument("--latency", type=float, default=0.2, help="요청당 지연(초)")
+    args = parser.parse_args()
+
+    server = StubG2BServer(args.total, args.latency, port=args.port)
+    print(f"🧪 스텁 서버 실행: {server.base_url}")
+    server.httpd.serve_forever()
@@ -30,6 +30,47 @@ class Settings(BaseSettings):
     # ===== G2B 공공데이터포털 API 설정 =====
     G2B_API_KEY: str  # ✅ 이 한 줄이 새로 추가됨
 
+    # ===== 수집 엔진 설정 =====
+    FETCH_CONCURRENCY: int = 6      # 전체 동시 요청 수
+    FETCH_RATE_LIMIT: float = 5.0   # 엔드포인트별 초당 최대 요청 수 (0이면 제한 없음)
+    COLLECT_DEFAULT_DAYS: int = 1        # 워터마크가 없을 때 증분 수집 기간(일)
+    COLLECT_OVERLAP_MINUTES: int = 120   # 워터마크 이전으로 겹쳐 조회할 시간(분)
+
+    # ===== HTTP 클라이언트 설정 =====
+    HTTP_TIMEOUT: float = 15.0          # 요청 타임아웃(초)
+    HTTP_MAX_RETRIES: int = 3           # 일시적 오류 재시도 횟수
+    HTTP_BACKOFF_BASE: float = 0.5      # 백오프 기본 간격(초)
+    HTTP_BACKOFF_MAX: float = 10.0      # 백오프 최대 간격(초)
+    HTTP_POOL_CONNECTIONS: int = 4      # 커넥션 풀을 유지할 호스트 수
+    HTTP_POOL_MAXSIZE: int = 10         # 호스트별 최대 연결 수
+
+    # ===== 목록 API 설정 =====
+    LIST_COUNT_MODE: Literal["exact", "cached", "estimated"] = "exact"  # 전체 개수 계산 방식 기본값
+    COUNT_CACHE_TTL: int = 60              # cached 모드 개수 재사용 시간(초)
+    COUNT_ESTIMATE_THRESHOLD: int = 1000   # estimated 모드에서 이보다 작으면 정확한 개수 사용
+    SEARCH_INDEX_ENABLED: bool = False     # 서버 시작 시 입찰공고 인메모리 검색 색인 적재
+    SEARCH_INDEX_MAX_CANDIDATES: int = 5000   # 색인 후보가 이보다 많으면 DB 검색 (id 목록 조건이 더 느림)
+
+    # ===== 유사 공고 색인 설정 =====
+    SIMILARITY_INDEX_DIR: str = "data/similarity_index"   # TF-IDF 유사도 색인 저장 위치 (python similarity_index.py로 구축)
+    SIMILARITY_INDEX_CHECK_INTERVAL: float = 10.0         # 색인 재구축/추가분 확인 간격(초)
+    SIMILARITY_SEARCH_MODE: Literal["exact", "ann"] = "exact"   # 유사 공고 검색 기본 방식
+    SIMILARITY_ANN_TABLES: int = 32    # LSH 해시 테이블 수 (늘리면 재현율↑, 느려짐) - 재구축 시 적용
+    SIMILARITY_ANN_BITS: int = 12      # 테이블당 키 비트 수 (늘리면 빨라지고 재현율↓) - 재구축 시 적용
+    SIMILARITY_ANN_PROBES: int = 1     # 질의 시 뒤집어 보는 키 비트 수 0~2 (늘리면 재현율↑)
+    SIMILARITY_ANN_RERANK: int = 1000  # 세그먼트별로 정확한 코사인을 다시 계산할 후보 수 (늘리면 재현율↑, 느려짐)
+    SIMILARITY_NEIGHBORS_TOP_K: int = 20   # 수집 직후 공고별로 미리 저장하는 유사 공고 수
+
+    # ===== 중복/재공고 클러스터 설정 =====
+    DEDUP_MAX_DISTANCE: int = 3           # 같은 클러스터로 묶는 SimHash 최대 해밍 거리 (0~3, 밴드 4개라 3까지 조회 보장)
+    DEDUP_BUDGET_TOLERANCE: float = 0.1   # 같은 사업으로 보는 예산 차이 비율
+
+    # ===== 응답 캐시 설정 =====
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: int = 300              # 응답 재사용 시간(초)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512      # 최대 캐시 항목 수 (초과 시 LRU 제거)
+    DATA_VERSION_CHECK_INTERVAL: float = 5.0   # 데이터 버전 재조회 간격(초)
+
     # ===== 로그 설정 =====
     LOG_LEVEL: str = "INFO"  # 로그 레벨: DEBUG, INFO, WARNING, ERROR
 
@@ -0,0 +1,106 @@
+"""
+목록 API 전체 개수(total) 계산 전략
+- exact: 매 요청마다 COUNT(*) (기존 방식)
+- cached: 같은 필터 조합의 COUNT(*) 결과를 TTL 동안 재사용
+- estimated: 플래너 통계(EXPLAIN)의 예상 행 수 - 작은 결과는 정확한 개수로 대체
+"""
+
+import json
+import time
+import logging
+import threading
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CountCache:
+    """필터 조합(정규화된 SQL) → (개수, 만료 시각) TTL 캐시"""
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            total, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            return total
+
+    def set(self, key, total):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # 만료 항목 정리 후에도 가득 차 있으면 가장 오래된 항목 제거
+                for k in [k for k, (_, exp) in self._entries.items() if exp < now]:
+                    del self._entries[k]
+                if len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (total, now + self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(settings.COUNT_CACHE_TTL)
+
+
+def _compile(query):
+    """Query → 파라미터가 인라인된 SQL 문자열 (캐시 키 / EXPLAIN 용)"""
+    return str(query.statement.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    ))
+
+
+def _estimate(query):
+    """EXPLAIN (FORMAT JSON)의 최상위 Plan Rows"""
+    plan = query.session.execute(text("EXPLAIN (FORMAT JSON) " + _compile(query))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_total(query, mode=None):
+    """
+    정렬/페이징 전 필터 쿼리의 전체 개수
+
+    Args:
+        query: 필터만 적용된 SQLAlchemy Query
+        mode: exact / cached / estimated (None이면 settings.LIST_COUNT_MODE)
+
+    Returns:
+        (total, total_type) - total_type은 실제로 사용된 방식
+    """
+    mode = mode or settings.LIST_COUNT_MODE
+
+    if mode == "cached":
+        key = _compile(query)
+        total = count_cache.get(key)
+        if total is None:
+            total = query.count()
+            count_cache.set(key, total)
+        return total, "cached"
+
+    if mode == "estimated":
+        try:
+            estimate = _estimate(query)
+        except Exception as e:
+            logger.warning(f"⚠️ 예상 개수 계산 실패 - 정확한 개수로 대체: {e}")
+        else:
+            # 예상치가 작으면 정확한 COUNT도 싸고, 플래너 오차가 상대적으로 크다
+            if estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+                return estimate, "estimated"
+
+    return query.count(), "exact"
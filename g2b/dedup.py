@@ -0,0 +1,313 @@
+"""
+입찰공고 중복/재공고 클러스터
+- 나라장터는 같은 사업을 새 공고번호로 다시 올리는 경우가 많아 공고명 '재공고' 문구만으로는 찾을 수 없음
+- 공고명(재공고/긴급 등 표시 제거) 글자 3-gram + 발주기관 + 예산 구간으로 64비트 SimHash 계산
+- SimHash를 16비트씩 4개 밴드로 나눠 bidding_simhash_bands에 저장 → 해밍 거리 3 이하인 공고는
+  적어도 한 밴드가 같으므로 (band_key) 인덱스 조회만으로 후보를 찾음
+- 같은 발주기관끼리만 묶으므로 밴드 키에 발주기관을 함께 해시 → 버킷 크기가 전체 건수가 아니라
+  기관별 공고 수에 비례 (흔한 공고명 형태도 다른 기관 공고와 섞이지 않아 공고당 비용이 거의 일정)
+- 후보 중 해밍 거리 DEDUP_MAX_DISTANCE 이하 + 같은 발주기관 + 예산 차이 DEDUP_BUDGET_TOLERANCE 이내면 같은 클러스터
+- cluster_id는 클러스터 최초 공고 id, 대표 공고(is_cluster_head)는 가장 최근 공고
+  → 목록 API collapse=true가 대표 공고만 보여줌
+- 재공고 태그는 cluster_id로 정해지므로 클러스터가 바뀌면 이미 분석된 구성 공고의 분석 결과/태그를 다시 계산
+
+실행: cd g2b && python dedup.py   # 클러스터가 지정되지 않은 공고 전체 처리 (최초 적재)
+"""
+
+import re
+import math
+import time
+import logging
+from datetime import datetime
+from hashlib import blake2b
+from sqlalchemy import select, insert, delete, update, bindparam, func, text
+
+import numpy as np
+
+from config import settings
+from database import SessionLocal
+from models import Bidding, BiddingSimhashBand
+from ml_pipeline import analyze_biddings, write_analyses
+
+logger = logging.getLogger(__name__)
+
+# 동시에 여러 수집 스레드가 같은 공고를 서로 다른 클러스터로 묶지 않도록 트랜잭션 단위 advisory lock
+DEDUP_LOCK_KEY = 2015_0002
+
+# 한 트랜잭션에서 클러스터를 지정하는 공고 수
+DEDUP_CHUNK_SIZE = 1000
+
+BANDS = 4
+BAND_BITS = 16
+
+# 3-gram이 이보다 적은 짧은 공고명은 SimHash가 불안정하므로 정규화한 공고명이 같아야 같은 클러스터
+MIN_SHINGLES = 8
+
+# 재공고/긴급/정정 등 공고 회차 표시 (괄호 포함)
+NOTICE_MARKER_PATTERN = re.compile(
+    r"[\[(【<]?\s*(?:\d+\s*차\s*)?(?:재공고|재입찰|긴급|정정|변경)\s*(?:\d+\s*차)?\s*[\])】>]?"
+)
+NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_title(title):
+    """공고명 → 회차 표시/공백/기호를 뺀 소문자 문자열"""
+    title = NOTICE_MARKER_PATTERN.sub("", (title or "").lower())
+    return NON_WORD_PATTERN.sub("", title)
+
+
+def shingles(normalized):
+    """정규화한 공고명의 글자 3-gram (3글자 미만이면 전체)"""
+    if len(normalized) < 3:
+        return [normalized] if normalized else []
+    return [normalized[i:i + 3] for i in range(len(normalized) - 2)]
+
+
+def budget_bucket(budget):
+    """예산 로그 구간 (약 26% 폭) - 예산이 없으면 None"""
+    if not budget or budget <= 0:
+        return None
+    return round(math.log10(budget) * 10)
+
+
+def simhash(title, agency, budget):
+    """공고명 3-gram + 발주기관 + 예산 구간 특성의 64비트 SimHash (부호 없는 정수)"""
+    features = [f"t:{gram}" for gram in shingles(normalize_title(title))]
+    if agency:
+        features.append(f"a:{agency.strip()}")
+    bucket = budget_bucket(budget)
+    if bucket is not None:
+        features.append(f"b:{bucket}")
+    if not features:
+        return 0
+
+    digests = b"".join(blake2b(feature.encode("utf-8"), digest_size=8).digest() for feature in features)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(len(features), 64)
+    votes = bits.sum(axis=0, dtype=np.int32) * 2 - len(features)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+def to_signed(value):
+    """부호 없는 64비트 → BIGINT 저장값"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value):
+    return value & ((1 << 64) - 1)
+
+
+def band_keys(fingerprint, agency):
+    """SimHash + 발주기관 → 밴드 키 목록 (hash(발주기관, 밴드 번호, 16비트 구간 값)의 32비트 정수)"""
+    mask = (1 << BAND_BITS) - 1
+    agency = (agency or "").strip()
+    keys = []
+    for band in range(BANDS):
+        value = (fingerprint >> (band * BAND_BITS)) & mask
+        digest = blake2b(f"{agency}\x00{band}\x00{value}".encode("utf-8"), digest_size=4).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return list(dict.fromkeys(keys))
+
+
+def _budget_close(a, b):
+    if not a or not b:
+        return not a and not b
+    return abs(a - b) <= settings.DEDUP_BUDGET_TOLERANCE * max(a, b)
+
+
+def is_duplicate(row, candidate):
+    """두 공고 {title, agency, budget, fingerprint}가 같은 사업인지"""
+    if (row["agency"] or None) != (candidate["agency"] or None):
+        return False
+    if not _budget_close(row["budget"], candidate["budget"]):
+        return False
+    if (row["fingerprint"] ^ candidate["fingerprint"]).bit_count() > settings.DEDUP_MAX_DISTANCE:
+        return False
+    if min(len(row["normalized"]), len(candidate["normalized"])) - 2 < MIN_SHINGLES:
+        return row["normalized"] == candidate["normalized"]
+    return True
+
+
+def _entry(bidding_id, title, agency, budget, fingerprint, cluster_id):
+    return {
+        "id": bidding_id, "title": title, "normalized": normalize_title(title),
+        "agency": agency, "budget": budget, "fingerprint": fingerprint, "cluster_id": cluster_id,
+    }
+
+
+def assign_clusters(db, bidding_ids):
+    """
+    공고들의 SimHash/밴드/클러스터 지정 + 영향받은 클러스터의 대표 공고/재공고 태그 재계산 (커밋은 호출자)
+
+    Returns:
+        다른 공고와 묶인 공고 수
+    """
+    rows = db.execute(
+        select(
+            Bidding.id, Bidding.title, Bidding.ordering_agency, Bidding.budget_amount,
+            Bidding.notice_date, Bidding.cluster_id,
+        ).where(Bidding.id.in_(list(bidding_ids)))
+    ).all()
+    if not rows:
+        return 0
+
+    # 오래된 공고부터 처리해 먼저 올라온 공고가 클러스터 id가 되도록
+    rows.sort(key=lambda row: (row.notice_date or datetime.min, row.id))
+    batch = [
+        _entry(row.id, row.title, row.ordering_agency, row.budget_amount,
+               simhash(row.title, row.ordering_agency, row.budget_amount), None)
+        for row in rows
+    ]
+    batch_ids = [entry["id"] for entry in batch]
+    batch_keys = sorted({key for entry in batch for key in band_keys(entry["fingerprint"], entry["agency"])})
+
+    # 밴드가 하나라도 같은 기존 공고 (이번 배치 공고는 메모리 상태 사용)
+    buckets = {}
+    candidates = db.execute(
+        select(
+            Bidding.id, Bidding.title, Bidding.ordering_agency, Bidding.budget_amount,
+            Bidding.simhash, Bidding.cluster_id,
+        ).where(
+            Bidding.id.in_(select(BiddingSimhashBand.bidding_id).where(BiddingSimhashBand.band_key.in_(batch_keys))),
+            Bidding.id.notin_(batch_ids),
+        )
+    ).all()
+    for row in candidates:
+        entry = _entry(row.id, row.title, row.ordering_agency, row.budget_amount,
+                       to_unsigned(row.simhash), row.cluster_id or row.id)
+        for key in band_keys(entry["fingerprint"], entry["agency"]):
+            buckets.setdefault(key, []).append(entry)
+
+    clustered = 0
+    for entry in batch:
+        keys = band_keys(entry["fingerprint"], entry["agency"])
+        matches = {
+            candidate["id"]: candidate
+            for key in keys for candidate in buckets.get(key, ())
+            if is_duplicate(entry, candidate)
+        }
+        if matches:
+            best = min(matches.values(), key=lambda c: ((entry["fingerprint"] ^ c["fingerprint"]).bit_count(), -c["id"]))
+            entry["cluster_id"] = best["cluster_id"]
+            clustered += 1
+        else:
+            entry["cluster_id"] = entry["id"]
+        for key in keys:
+            buckets.setdefault(key, []).append(entry)
+
+    # 공고 컬럼 갱신 (수집 데이터가 바뀐 것은 아니므로 updated_at 유지)
+    table = Bidding.__table__
+    db.execute(
+        update(table).where(table.c.id == bindparam("b_id")).values(
+            simhash=bindparam("b_simhash"), cluster_id=bindparam("b_cluster_id"), updated_at=table.c.updated_at,
+        ),
+        [
+            {"b_id": entry["id"], "b_simhash": to_signed(entry["fingerprint"]), "b_cluster_id": entry["cluster_id"]}
+            for entry in batch
+        ],
+    )
+
+    # 밴드 교체
+    db.execute(delete(BiddingSimhashBand).where(BiddingSimhashBand.bidding_id.in_(batch_ids)))
+    db.execute(insert(BiddingSimhashBand), [
+        {"bidding_id": entry["id"], "band_key": key}
+        for entry in batch for key in band_keys(entry["fingerprint"], entry["agency"])
+    ])
+
+    # 새 클러스터 + 공고가 빠져나간 이전 클러스터의 대표 공고 재계산
+    affected = {entry["cluster_id"] for entry in batch} | {row.cluster_id for row in rows if row.cluster_id}
+    refresh_cluster_heads(db, affected)
+    refresh_cluster_tags(db, affected)
+    return clustered
+
+
+def refresh_cluster_heads(db, cluster_ids):
+    """클러스터별로 가장 최근 공고만 is_cluster_head (cluster_id 인덱스 조회)"""
+    if not cluster_ids:
+        return
+    db.execute(
+        text("""
+            UPDATE biddings b
+            SET is_cluster_head = (b.id = h.head_id)
+            FROM (
+                SELECT DISTINCT ON (cluster_id) cluster_id, id AS head_id
+                FROM biddings
+                WHERE cluster_id = ANY(:cluster_ids)
+                ORDER BY cluster_id, notice_date DESC NULLS LAST, id DESC
+            ) h
+            WHERE b.cluster_id = h.cluster_id
+              AND b.is_cluster_head IS DISTINCT FROM (b.id = h.head_id)
+        """),
+        {"cluster_ids": sorted(cluster_ids)},
+    )
+
+
+def refresh_cluster_tags(db, cluster_ids):
+    """
+    이미 분석된 클러스터 구성 공고의 분석 결과/bidding_tags 재계산 - 재계산한 공고 수
+
+    재공고 태그는 분석 시점의 cluster_id로 정해지므로 클러스터가 새로 생기거나 공고가 옮겨가면 다시 계산한다.
+    아직 분석되지 않은 공고는 이후 분석 때 현재 cluster_id로 태그가 붙으므로 제외.
+    """
+    if not cluster_ids:
+        return 0
+    rows = db.execute(
+        select(
+            Bidding.id, Bidding.title, Bidding.budget_amount, Bidding.notice_type, Bidding.notice_date,
+            Bidding.bid_close_date, Bidding.ordering_agency, Bidding.cluster_id,
+        ).where(Bidding.cluster_id.in_(sorted(cluster_ids)), Bidding.ai_category.isnot(None))
+    ).all()
+    if rows:
+        write_analyses(db, [row.id for row in rows], analyze_biddings(db, rows))
+    return len(rows)
+
+
+# ==================== 수집 경로 ====================
+def cluster_biddings(notice_numbers):
+    """저장된 공고들의 클러스터 지정 (수집기가 페이지 저장 후 호출)"""
+    if not notice_numbers:
+        return
+
+    db = SessionLocal()
+    try:
+        db.execute(select(func.pg_advisory_xact_lock(DEDUP_LOCK_KEY)))
+        ids = db.scalars(select(Bidding.id).where(Bidding.notice_number.in_(list(notice_numbers)))).all()
+        clustered = assign_clusters(db, ids)
+        db.commit()
+        if clustered:
+            logger.info(f"🧬 중복/재공고 클러스터: {clustered}건 묶음")
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"⚠️ 중복/재공고 클러스터 지정 실패: {e}")
+    finally:
+        db.close()
+
+
+def backfill_clusters():
+    """클러스터가 지정되지 않은 공고 전체 처리 (공고일 순 - 먼저 올라온 공고가 클러스터 id)"""
+    started = time.perf_counter()
+    total = clustered = 0
+    db = SessionLocal()
+    try:
+        while True:
+            db.execute(select(func.pg_advisory_xact_lock(DEDUP_LOCK_KEY)))
+            ids = db.scalars(
+                select(Bidding.id).where(Bidding.simhash.is_(None))
+                .order_by(Bidding.notice_date.asc().nulls_first(), Bidding.id)
+                .limit(DEDUP_CHUNK_SIZE)
+            ).all()
+            if not ids:
+                break
+            clustered += assign_clusters(db, ids)
+            db.commit()
+            total += len(ids)
+            logger.info(f"⏳ 중복/재공고 클러스터: {total}건 처리 ({clustered}건 묶음)")
+    finally:
+        db.close()
+
+    logger.info(f"✅ 중복/재공고 클러스터 완료: {total}건 처리, {clustered}건 묶음 ({time.perf_counter() - started:.1f}초)")
+    return clustered
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    backfill_clusters()
@@ -0,0 +1,128 @@
+"""
+엔드포인트 쿼리 실행 계획 점검
+- 목록 API를 실제로 호출해 실행된 SELECT를 수집하고 EXPLAIN으로 계획 확인
+- enable_seqscan=off 상태에서도 Seq Scan이 남으면 쓸 수 있는 인덱스가 없다는 뜻 → 실패
+- LIMIT 쿼리에 Sort가 남으면 정렬 인덱스를 못 쓰는 것 → 경고
+
+실행: cd g2b && python explain_queries.py   (인덱스 누락 시 종료 코드 1)
+"""
+
+import sys
+import json
+import logging
+from datetime import datetime
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import app
+from config import settings
+from database import engine
+from pagination import encode_cursor
+
+logging.basicConfig(level=logging.WARNING)
+
+# 캐시 적중 시 쿼리가 실행되지 않으므로 응답 캐시를 끄고 점검
+settings.RESPONSE_CACHE_ENABLED = False
+
+TABLES = {"biddings", "awards", "order_plans", "bidding_tags"}
+
+# (엔드포인트, 쿼리 파라미터) - 라우터가 만드는 쿼리 형태별 하나씩
+FAR_CURSOR = encode_cursor(datetime(2100, 1, 1), 2 ** 31 - 1)
+CASES = [
+    ("/api/biddings", {}),
+    ("/api/biddings", {"cursor": FAR_CURSOR}),
+    ("/api/biddings", {"notice_type": "공사"}),
+    ("/api/biddings", {"notice_type": "공사", "cursor": FAR_CURSOR}),
+    ("/api/biddings", {"ai_category": "IT/소프트웨어"}),
+    ("/api/biddings", {"min_budget": 100000000, "max_budget": 500000000}),
+    ("/api/biddings", {"start_date": "2024-01-01", "end_date": "2024-12-31"}),
+    ("/api/biddings", {"search": "정보시스템"}),
+    ("/api/biddings", {"tags": ["긴급", "고액"]}),
+    ("/api/biddings", {"tags": ["긴급", "고액"], "tag_match": "all"}),
+    ("/api/biddings", {"competition_level": "고"}),
+    ("/api/biddings", {"collapse": "true"}),
+    ("/api/biddings", {"collapse": "true", "cursor": FAR_CURSOR}),
+    ("/api/awards", {}),
+    ("/api/awards", {"cursor": FAR_CURSOR}),
+    ("/api/awards", {"notice_type": "공사"}),
+    ("/api/awards", {"search": "주식회사"}),
+    ("/api/orderplans", {}),
+    ("/api/orderplans", {"cursor": FAR_CURSOR}),
+]
+
+
+def capture_queries(client, path, params):
+    """엔드포인트 호출 중 실행된 (SQL, 파라미터) 목록"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(path, params=params)
+        response.raise_for_status()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def plan_nodes(plan):
+    """실행 계획 트리를 평탄화"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(cursor, statement, parameters):
+    cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def main():
+    client = TestClient(app)
+    failures = 0
+
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SET enable_seqscan = off")
+
+        for path, params in CASES:
+            label = f"{path} {params}" if params else path
+            for statement, parameters in capture_queries(client, path, params):
+                plan = explain(cursor, statement, parameters)
+                nodes = list(plan_nodes(plan))
+
+                seq_scans = sorted({
+                    node["Relation Name"] for node in nodes
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in TABLES
+                })
+                indexes = sorted({node["Index Name"] for node in nodes if node.get("Index Name")})
+                sorted_limit = "LIMIT" in statement.upper() and any(node["Node Type"] == "Sort" for node in nodes)
+                kind = "count" if "count(*)" in statement.lower() else "page"
+
+                if seq_scans:
+                    failures += 1
+                    print(f"❌ {label} [{kind}] Seq Scan: {', '.join(seq_scans)}")
+                elif sorted_limit:
+                    print(f"⚠️ {label} [{kind}] 정렬 인덱스 미사용 (Sort) - 인덱스: {', '.join(indexes) or '-'}")
+                else:
+                    print(f"✅ {label} [{kind}] {', '.join(indexes) or plan['Node Type']}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+    if failures:
+        print(f"\n❌ 인덱스를 쓰지 못하는 쿼리 {failures}개")
+        return 1
+    print("\n✅ 모든 쿼리가 인덱스를 사용")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+DB 마이그레이션 실행기
+- 저장소 루트 migrations/ 의 NNN_이름.sql 파일을 버전 순서대로 적용
+- 적용 이력은 schema_migrations 테이블에 기록 (이미 적용된 버전은 건너뜀)
+- 파일 하나를 트랜잭션 하나로 실행 - 실패하면 해당 버전은 롤백되고 중단
+
+실행: cd g2b && python migrate.py            # 미적용 버전 모두 적용
+      cd g2b && python migrate.py --status   # 적용 현황만 출력
+"""
+
+import re
+import sys
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+
+from database import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+CREATE_HISTORY_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        checksum VARCHAR(64) NOT NULL,
+        applied_at TIMESTAMP NOT NULL DEFAULT now()
+    )
+"""
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """마이그레이션 파일 목록 [(version, name, path)] - 버전 순"""
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = MIGRATION_FILE.match(path.name)
+        if not match:
+            logger.warning(f"⚠️ 버전 형식이 아닌 파일 무시: {path.name}")
+            continue
+        migrations.append((int(match.group(1)), match.group(2), path))
+
+    versions = [version for version, _, _ in migrations]
+    duplicated = {v for v in versions if versions.count(v) > 1}
+    if duplicated:
+        raise ValueError(f"중복된 마이그레이션 버전: {sorted(duplicated)}")
+
+    return sorted(migrations)
+
+
+def checksum(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def applied_versions(cursor):
+    """적용된 버전 {version: checksum}"""
+    cursor.execute(CREATE_HISTORY_TABLE)
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def migrate(status_only=False):
+    """
+    미적용 마이그레이션 적용
+
+    Returns:
+        bool: 모든 버전이 적용된 상태면 True
+    """
+    migrations = discover()
+
+    # 여러 문장이 든 SQL 파일을 그대로 실행하려고 드라이버 연결을 직접 사용
+    # (SQLAlchemy를 거치면 LIKE '%..' 같은 % 문자가 파라미터로 해석됨)
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        applied = applied_versions(cursor)
+        conn.commit()
+
+        pending = []
+        for version, name, path in migrations:
+            if version not in applied:
+                pending.append((version, name, path))
+            elif applied[version] != checksum(path):
+                logger.warning(f"⚠️ {version:03d}_{name}: 적용 후 파일이 변경됨 (다시 실행되지 않음)")
+
+        if status_only:
+            for version, name, _ in migrations:
+                mark = "✅" if version in applied else "⏳"
+                logger.info(f"  {mark} {version:03d}_{name}")
+            return not pending
+
+        if not pending:
+            logger.info("✅ 적용할 마이그레이션 없음")
+            return True
+
+        for version, name, path in pending:
+            logger.info(f"🔄 {version:03d}_{name} 적용 중...")
+            try:
+                cursor.execute(path.read_text(encoding="utf-8"))
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (version, name, checksum(path)),
+                )
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"❌ {version:03d}_{name} 실패 - 롤백 후 중단: {e}")
+                return False
+            logger.info(f"  ✅ {version:03d}_{name} 완료")
+
+        logger.info("✅ 마이그레이션 완료!")
+        return True
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    args = parser.parse_args()
+
+    sys.exit(0 if migrate(status_only=args.status) else 1)
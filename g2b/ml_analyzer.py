@@ -8,6 +8,7 @@ ML 기반 입찰 공고 분석 모듈
 
 import re
 import json
+from bisect import bisect_right
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import numpy as np
@@ -33,7 +34,17 @@ class BiddingAnalyzer:
             '운송': ['운송', '배송', '택배', '이사', '물류', '운반'],
         }
 
+        # 제목 키워드 기반 태그: (태그, 키워드 목록) - 순서대로 부여
+        self.keyword_tags = [
+            ('긴급', ['긴급', '신속', '즉시']),
+            ('유지보수', ['유지보수', '운영', '관리']),
+            ('신규사업', ['신규', '구축', '개발']),
+            ('재공고', ['재공고', '재입찰']),
+        ]
+
         self.vectorizer = None
+        self._matcher = None
+        self._matcher_keywords = None
 
     def classify_category(self, title: str) -> str:
         """공고명 기반 카테고리 자동 분류"""
@@ -41,11 +52,14 @@ class BiddingAnalyzer:
             return "기타"
 
         title_lower = title.lower()
+        return self._category_from_matches(lambda keyword: keyword in title_lower)
 
+    def _category_from_matches(self, contains) -> str:
+        """contains(소문자 키워드) → 포함 여부 함수로 카테고리 결정"""
         # 키워드 매칭 스코어 계산
         scores = {}
         for category, keywords in self.categories.items():
-            score = sum(1 for keyword in keywords if keyword.lower() in title_lower)
+            score = sum(1 for keyword in keywords if contains(keyword.lower()))
             if score > 0:
                 scores[category] = score
 
@@ -57,9 +71,14 @@ class BiddingAnalyzer:
 
     def generate_tags(self, bidding_data: Dict) -> List[str]:
         """입찰 공고 데이터 기반 태그 생성"""
+        title = bidding_data.get('title', '')
+        title_lower = title.lower() if title else ''
+        return self._tags_from_matches(bidding_data, lambda word: word in title_lower)
+
+    def _tags_from_matches(self, bidding_data: Dict, contains) -> List[str]:
+        """예산/마감 기반 태그 + contains(소문자 키워드) 함수로 키워드 태그 생성"""
         tags = []
 
-        title = bidding_data.get('title', '')
         budget = bidding_data.get('budget_amount')
         notice_date = bidding_data.get('notice_date')
         bid_close_date = bidding_data.get('bid_close_date')
@@ -87,25 +106,23 @@ class BiddingAnalyzer:
                 tags.append("빠른마감")
 
         # 3. 키워드 기반 태그
-        title_lower = title.lower() if title else ''
+        for tag, words in self.keyword_tags:
+            if any(contains(word) for word in words) and tag not in tags:
+                tags.append(tag)
 
-        if any(word in title_lower for word in ['긴급', '신속', '즉시']):
-            if "긴급" not in tags:
-                tags.append("긴급")
-
-        if any(word in title_lower for word in ['유지보수', '운영', '관리']):
-            tags.append("유지보수")
-
-        if any(word in title_lower for word in ['신규', '구축', '개발']):
-            tags.append("신규사업")
-
-        if '재공고' in title_lower or '재입찰' in title_lower:
-            tags.append("재공고")
+        # 4. 중복/재공고 클러스터 기반 재공고 태그 (dedup.py)
+        if bidding_data.get('renotice') and '재공고' not in tags:
+            tags.append('재공고')
 
         return tags
 
-    def calculate_competition_level(self, bidding_data: Dict, awards_data: Optional[List] = None) -> str:
-        """경쟁 강도 예측 (저/중/고)"""
+    def calculate_competition_level(self, bidding_data: Dict, awards_data: Optional[List] = None,
+                                    participant_avg: Optional[float] = None) -> str:
+        """
+        경쟁 강도 예측 (저/중/고)
+
+        participant_avg: 미리 집계한 발주기관 평균 참가업체수 (주면 awards_data 대신 사용)
+        """
 
         # 기본 점수
         score = 0
@@ -127,11 +144,12 @@ class BiddingAnalyzer:
             score += 1  # 용역/물품이 공사보다 진입장벽 낮음
 
         # 3. 과거 낙찰 데이터가 있다면 활용
-        if awards_data:
-            avg_participants = np.mean([a.get('prtcpt_cnum', 0) for a in awards_data if a.get('prtcpt_cnum')])
-            if avg_participants >= 10:
+        if participant_avg is None and awards_data:
+            participant_avg = np.mean([a.get('prtcpt_cnum', 0) for a in awards_data if a.get('prtcpt_cnum')])
+        if participant_avg is not None:
+            if participant_avg >= 10:
                 score += 2
-            elif avg_participants >= 5:
+            elif participant_avg >= 5:
                 score += 1
 
         # 점수 → 등급 변환
@@ -172,12 +190,13 @@ class BiddingAnalyzer:
             print(f"유사 공고 찾기 실패: {e}")
             return []
 
-    def analyze_bidding(self, bidding_data: Dict, awards_data: Optional[List] = None) -> Dict:
+    def analyze_bidding(self, bidding_data: Dict, awards_data: Optional[List] = None,
+                        participant_avg: Optional[float] = None) -> Dict:
         """입찰 공고 종합 분석"""
 
         category = self.classify_category(bidding_data.get('title', ''))
         tags = self.generate_tags(bidding_data)
-        competition = self.calculate_competition_level(bidding_data, awards_data)
+        competition = self.calculate_competition_level(bidding_data, awards_data, participant_avg)
 
         return {
             'ai_category': category,
@@ -185,6 +204,101 @@ class BiddingAnalyzer:
             'competition_level': competition
         }
 
+    # ==================== 배치 분석 ====================
+    def _keyword_matcher(self):
+        """
+        전체 키워드(카테고리 + 태그)를 한 번에 찾는 정규식 목록 + 키워드별 카테고리 목록
+
+        전방탐색 (?=(a|b|...)) 은 위치마다 하나만 매칭되므로, 서로 접두사 관계인 키워드
+        ('보수'/'보수공사' 등)는 다른 그룹으로 나눈다. 그룹 안에서는 한 위치에 최대 한 키워드만
+        맞을 수 있어, 겹치는 키워드까지 모두 찾는다 (건별 `in` 검사와 같은 결과).
+        """
+        keyword_categories = {}
+        for category, words in self.categories.items():
+            for keyword in words:
+                # 카테고리 목록에 같은 키워드가 두 번 있으면 건별 분류처럼 2점
+                keyword_categories.setdefault(keyword.lower(), []).append(category)
+        for _, words in self.keyword_tags:
+            for keyword in words:
+                keyword_categories.setdefault(keyword.lower(), [])
+
+        # categories / keyword_tags를 바꾸면 다시 컴파일
+        if self._matcher is not None and self._matcher_keywords == keyword_categories:
+            return self._matcher
+        keywords = sorted(keyword_categories)
+
+        groups = []
+        for keyword in sorted(keywords, key=len):
+            for group in groups:
+                if not any(keyword.startswith(other) or other.startswith(keyword) for other in group):
+                    group.append(keyword)
+                    break
+            else:
+                groups.append([keyword])
+
+        patterns = [
+            re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in group) + "))")
+            for group in groups
+        ]
+        self._matcher = (patterns, keyword_categories)
+        self._matcher_keywords = keyword_categories
+        return self._matcher
+
+    def match_keywords_batch(self, titles: List[Optional[str]]) -> List[set]:
+        """
+        공고명 목록 → 공고별로 포함된 키워드(소문자) 집합
+
+        제목들을 줄바꿈으로 이어 붙여 정규식 그룹마다 한 번씩만 훑고,
+        매칭 위치로 어느 제목인지 찾는다.
+        """
+        lowered = [(title or '').lower() for title in titles]
+        starts = []
+        offset = 0
+        for text in lowered:
+            starts.append(offset)
+            offset += len(text) + 1
+        corpus = "\n".join(lowered)
+
+        found = [set() for _ in lowered]
+        patterns, _ = self._keyword_matcher()
+        for pattern in patterns:
+            for match in pattern.finditer(corpus):
+                found[bisect_right(starts, match.start()) - 1].add(match.group(1))
+        return found
+
+    def analyze_batch(self, records: List[Dict], awards_list: Optional[List[Optional[List]]] = None,
+                      participant_avgs: Optional[List[Optional[float]]] = None) -> List[Dict]:
+        """
+        여러 공고를 한 번에 분석 (analyze_bidding과 같은 결과)
+
+        Args:
+            records: analyze_bidding의 bidding_data 목록
+            awards_list: 공고별 awards_data 목록 (없으면 전부 None)
+            participant_avgs: 공고별 발주기관 평균 참가업체수 (없으면 전부 None)
+        """
+        awards_list = awards_list or [None] * len(records)
+        participant_avgs = participant_avgs or [None] * len(records)
+        matches = self.match_keywords_batch([record.get('title', '') for record in records])
+        _, keyword_categories = self._keyword_matcher()
+        order = {category: rank for rank, category in enumerate(self.categories)}
+
+        results = []
+        for record, awards_data, participant_avg, found in zip(records, awards_list, participant_avgs, matches):
+            # 찾은 키워드만으로 점수 계산 - 동점이면 categories 순서가 앞선 쪽 (classify_category와 동일)
+            scores = {}
+            for keyword in found:
+                for category in keyword_categories[keyword]:
+                    scores[category] = scores.get(category, 0) + 1
+            category = min(scores, key=lambda c: (-scores[c], order[c])) if scores else "기타"
+            tags = self._tags_from_matches(record, found.__contains__)
+            competition = self.calculate_competition_level(record, awards_data, participant_avg)
+            results.append({
+                'ai_category': category,
+                'ai_tags': json.dumps(tags, ensure_ascii=False),
+                'competition_level': competition
+            })
+        return results
+
 
 # 싱글톤 인스턴스
 analyzer = BiddingAnalyzer()
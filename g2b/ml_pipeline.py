@@ -0,0 +1,145 @@
+"""
+ML 분석 실행 / 결과 저장 경로
+- 발주기관별 평균 참가업체수를 GROUP BY 한 번으로 미리 집계해 경쟁 강도 예측에 사용
+  (공고마다 낙찰 데이터를 따로 조회하지 않음)
+- 분석 결과를 biddings 컬럼에 반영하고 bidding_tags 테이블을 함께 동기화
+- 스케줄러 / 분석 API / 배치 스크립트가 모두 이 함수들로 분석/저장
+"""
+
+import json
+import logging
+from sqlalchemy import insert, update, func, values, column, Integer, String, Text
+
+from models import Award, Bidding, BiddingTag
+from ml_analyzer import analyzer
+
+logger = logging.getLogger(__name__)
+
+# 배치 분석 시 한 번에 분류/저장/커밋하는 공고 수
+ANALYSIS_CHUNK_SIZE = 500
+
+# 발주기관 IN 목록 최대 길이 (쿼리 하나에 넣는 기관 수)
+AGENCY_QUERY_CHUNK = 1000
+
+
+def parse_tags(ai_tags):
+    """ai_tags JSON 문자열 → 중복 없는 태그 목록 (형식이 잘못되면 빈 목록)"""
+    if not ai_tags:
+        return []
+    try:
+        tags = json.loads(ai_tags)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(tags, list):
+        return []
+    return list(dict.fromkeys(str(tag).strip() for tag in tags if str(tag).strip()))
+
+
+def sync_tags(db, bidding_id, tags):
+    """공고의 bidding_tags 행을 tags로 교체 (커밋은 호출자)"""
+    db.query(BiddingTag).filter(BiddingTag.bidding_id == bidding_id).delete(synchronize_session=False)
+    if tags:
+        db.execute(insert(BiddingTag), [{"bidding_id": bidding_id, "tag": tag} for tag in tags])
+
+
+def apply_analysis(db, bidding, result):
+    """분석 결과를 공고에 반영 + 태그 동기화 (커밋은 호출자)"""
+    apply_analyses(db, [bidding], [result])
+
+
+def apply_analyses(db, biddings, results):
+    """여러 공고에 분석 결과 반영 - 태그는 DELETE 한 번 + INSERT 한 번으로 동기화 (커밋은 호출자)"""
+    tag_rows = []
+    for bidding, result in zip(biddings, results):
+        bidding.ai_category = result['ai_category']
+        bidding.ai_tags = result['ai_tags']
+        bidding.competition_level = result['competition_level']
+        tag_rows.extend({"bidding_id": bidding.id, "tag": tag} for tag in parse_tags(result['ai_tags']))
+
+    _replace_tags(db, [bidding.id for bidding in biddings], tag_rows)
+
+
+def write_analyses(db, bidding_ids, results):
+    """
+    ORM 객체 없이 분석 결과 반영 - UPDATE ... FROM (VALUES ...) 한 번 + 태그 DELETE/INSERT 한 번 (커밋은 호출자)
+
+    배치 분석처럼 공고를 id/컬럼 값으로만 읽은 경우에 사용
+    """
+    if not bidding_ids:
+        return
+    analyzed = values(
+        column("id", Integer), column("ai_category", String), column("ai_tags", Text), column("competition_level", String),
+        name="analyzed",
+    ).data([
+        (bidding_id, result['ai_category'], result['ai_tags'], result['competition_level'])
+        for bidding_id, result in zip(bidding_ids, results)
+    ])
+    db.execute(
+        update(Bidding).where(Bidding.id == analyzed.c.id).values(
+            ai_category=analyzed.c.ai_category,
+            ai_tags=analyzed.c.ai_tags,
+            competition_level=analyzed.c.competition_level,
+        ).execution_options(synchronize_session=False)
+    )
+    _replace_tags(db, bidding_ids, [
+        {"bidding_id": bidding_id, "tag": tag}
+        for bidding_id, result in zip(bidding_ids, results)
+        for tag in parse_tags(result['ai_tags'])
+    ])
+
+
+def _replace_tags(db, bidding_ids, tag_rows):
+    """공고들의 bidding_tags 행을 tag_rows로 교체"""
+    db.query(BiddingTag).filter(BiddingTag.bidding_id.in_(bidding_ids)).delete(synchronize_session=False)
+    if tag_rows:
+        db.execute(insert(BiddingTag), tag_rows)
+
+
+# ==================== 분석 실행 ====================
+def agency_participant_averages(db, agencies):
+    """
+    발주기관별 낙찰 평균 참가업체수 {기관명: 평균}
+
+    참가업체수가 있는(0이 아닌) 낙찰 건만 평균 - calculate_competition_level의 awards_data 기준과 동일.
+    (ntce_instt_nm, prtcpt_cnum) 인덱스로 index-only scan (migrations/008_add_award_agency_index.sql)
+    """
+    agencies = sorted({agency for agency in agencies if agency})
+    averages = {}
+    for start in range(0, len(agencies), AGENCY_QUERY_CHUNK):
+        rows = db.query(
+            Award.ntce_instt_nm, func.avg(Award.prtcpt_cnum)
+        ).filter(
+            Award.ntce_instt_nm.in_(agencies[start:start + AGENCY_QUERY_CHUNK]),
+            Award.prtcpt_cnum.isnot(None),
+            Award.prtcpt_cnum != 0,
+        ).group_by(Award.ntce_instt_nm).all()
+        averages.update((agency, float(avg)) for agency, avg in rows)
+    return averages
+
+
+def bidding_record(bidding):
+    """Bidding → analyzer 입력 dict"""
+    return {
+        'title': bidding.title,
+        'budget_amount': bidding.budget_amount,
+        'notice_type': bidding.notice_type,
+        'notice_date': bidding.notice_date,
+        'bid_close_date': bidding.bid_close_date,
+        # 같은 사업의 이전 공고가 있는 클러스터 구성 공고 (공고명에 '재공고'가 없어도 재공고 태그)
+        'renotice': bidding.cluster_id is not None and bidding.cluster_id != bidding.id,
+    }
+
+
+def analyze_biddings(db, biddings, averages=None):
+    """
+    공고 목록 ML 분석 (반영은 apply_analyses)
+
+    Args:
+        averages: agency_participant_averages 결과 (없으면 이 공고들의 기관만 조회)
+    """
+    if averages is None:
+        averages = agency_participant_averages(db, {bidding.ordering_agency for bidding in biddings})
+    return analyzer.analyze_batch(
+        [bidding_record(bidding) for bidding in biddings],
+        participant_avgs=[averages.get(bidding.ordering_agency) for bidding in biddings],
+    )
@@ -3,7 +3,7 @@
 나라장터 입찰공고 / 발주계획 / 계약 / 낙찰 정보를 저장할 테이블 구조
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, BigInteger, Date, Float, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Text, BigInteger, Date, Float, Boolean, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from database import Base
 
@@ -43,6 +43,16 @@ class Bidding(Base):
     ai_tags = Column(Text, nullable=True, comment="AI 생성 태그 (JSON)")
     competition_level = Column(String(20), nullable=True, comment="경쟁 강도 (저/중/고)")
 
+    # 중복/재공고 클러스터 (수집 시 dedup.py에서 지정)
+    simhash = Column(BigInteger, nullable=True, comment="공고명+발주기관+예산 SimHash (64비트)")
+    cluster_id = Column(Integer, nullable=True, comment="중복/재공고 클러스터 ID (클러스터 최초 공고 id)")
+    is_cluster_head = Column(Boolean, default=True, nullable=False, comment="클러스터 대표 공고 여부 (가장 최근 공고)")
+
+    # 유사 공고 이웃 목록 계산 시간 (neighbors.py - 이웃이 없는 공고도 기록해 재계산 대상에서 제외)
+    neighbors_computed_at = Column(DateTime, nullable=True, comment="유사 공고 이웃 목록 계산 시간 (NULL이면 미계산)")
+
+    content_hash = Column(String(64), nullable=True, comment="원본 레코드 해시 (변경 감지용)")
+
     created_at = Column(DateTime, default=func.now(), nullable=False, comment="데이터 생성 시간")
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, comment="데이터 수정 시간")
 
@@ -87,6 +97,8 @@ class OrderPlan(Base):
     ntice_dt = Column(DateTime, nullable=True, comment="공고일시(변환)")
     chg_dt = Column(DateTime, nullable=True, comment="변경일시(변환)")
 
+    content_hash = Column(String(64), nullable=True, comment="원본 레코드 해시 (변경 감지용)")
+
     created_at = Column(DateTime, default=func.now(), nullable=False, comment="데이터 생성 시간")
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False, comment="데이터 수정 시간")
 
@@ -143,6 +155,8 @@ class Contract(Base):
     # URL
     cntrct_info_url = Column(String(500), nullable=True, comment="계약정보URL")
     cntrct_dtl_info_url = Column(Text, nullable=True, comment="계약상세정보URL")
+
+    content_hash = Column(String(64), nullable=True, comment="원본 레코드 해시 (변경 감지용)")
     
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
@@ -195,6 +209,7 @@ class Award(Base):
     inpt_dt = Column(DateTime)                                    # 입력일시
     rsrvtn_prce_file_existnce_yn = Column(String(1))             # 예정가격파일존재여부
     openg_rslt_ntc_cntnts = Column(Text)                         # 개찰결과공고내용
+    content_hash = Column(String(64))                             # 원본 레코드 해시 (변경 감지용)
     
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -202,4 +217,199 @@ class Award(Base):
     # 복합 유니크 제약
     __table_args__ = (
         UniqueConstraint('bid_ntce_no', 'bid_ntce_ord', 'notice_type', name='uix_award_notice'),
-    )
\ No newline at end of file
+    )
+
+
+# ============================================================
+# 5️⃣ 수집 체크포인트 테이블
+# ============================================================
+class CollectCheckpoint(Base):
+    __tablename__ = "collect_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    endpoint = Column(String(300), nullable=False, comment="요청 URL")
+    notice_type = Column(String(50), nullable=False, default="", comment="공고구분 (없으면 빈 문자열)")
+    window_bgn = Column(String(12), nullable=False, comment="조회 시작일시 (YYYYMMDD[HHMM])")
+    window_end = Column(String(12), nullable=False, comment="조회 종료일시 (YYYYMMDD[HHMM])")
+
+    last_page = Column(Integer, nullable=False, default=0, comment="연속으로 저장 완료된 마지막 페이지")
+    total_pages = Column(Integer, nullable=True, comment="마지막 응답 기준 전체 페이지 수")
+    completed = Column(Boolean, nullable=False, default=False, comment="전체 페이지 저장 완료 여부")
+
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('endpoint', 'notice_type', 'window_bgn', 'window_end', name='uix_checkpoint_window'),
+    )
+
+    def __repr__(self):
+        return f"<CollectCheckpoint(endpoint={self.endpoint}, window={self.window_bgn}~{self.window_end}, last_page={self.last_page})>"
+
+
+# ============================================================
+# 6️⃣ 수집 워터마크 테이블
+# ============================================================
+class CollectWatermark(Base):
+    __tablename__ = "collect_watermarks"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    source = Column(String(50), unique=True, nullable=False, comment="수집 대상 (biddings/awards/order_plans)")
+    watermark = Column(DateTime, nullable=False, comment="수집 완료된 최대 기준일시 (bidNtceDt, inptDt 등)")
+
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<CollectWatermark(source={self.source}, watermark={self.watermark})>"
+
+
+# ============================================================
+# 7️⃣ 통계 롤업 테이블 (rollups.py가 수집/분석 후 갱신)
+# ============================================================
+class StatsBiddingDaily(Base):
+    __tablename__ = "stats_bidding_daily"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    stat_date = Column(Date, nullable=True, index=True, comment="공고일 (공고일시 없으면 NULL)")
+    notice_type = Column(String(50), nullable=True, comment="공고구분")
+    ai_category = Column(String(100), nullable=True, comment="AI 카테고리")
+
+    bidding_count = Column(Integer, nullable=False, default=0, comment="공고 수")
+    budget_sum = Column(BigInteger, nullable=False, default=0, comment="예산금액 합계")
+    budget_count = Column(Integer, nullable=False, default=0, comment="예산금액이 있는 공고 수 (평균 계산용)")
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<StatsBiddingDaily(stat_date={self.stat_date}, notice_type={self.notice_type}, ai_category={self.ai_category}, count={self.bidding_count})>"
+
+
+class StatsBiddingAgency(Base):
+    __tablename__ = "stats_bidding_agency"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    agency = Column(String(200), nullable=True, index=True, comment="발주기관")
+    bidding_count = Column(Integer, nullable=False, default=0, comment="공고 수")
+    budget_sum = Column(BigInteger, nullable=False, default=0, comment="예산금액 합계")
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<StatsBiddingAgency(agency={self.agency}, count={self.bidding_count})>"
+
+
+class StatsAwardCompany(Base):
+    __tablename__ = "stats_award_company"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    company_name = Column(String(200), nullable=True, index=True, comment="낙찰업체명")
+    award_count = Column(Integer, nullable=False, default=0, comment="낙찰 건수")
+    award_amount_sum = Column(BigInteger, nullable=False, default=0, comment="낙찰금액 합계")
+    award_rate_sum = Column(Float, nullable=False, default=0, comment="낙찰률 합계 (평균 계산용)")
+    award_rate_count = Column(Integer, nullable=False, default=0, comment="낙찰률이 있는 건수")
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<StatsAwardCompany(company_name={self.company_name}, count={self.award_count})>"
+
+
+class StatsOrderPlanDaily(Base):
+    __tablename__ = "stats_order_plan_daily"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    stat_date = Column(Date, nullable=True, index=True, comment="공고일 (공고일시 없으면 NULL)")
+    plan_count = Column(Integer, nullable=False, default=0, comment="발주계획 수")
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<StatsOrderPlanDaily(stat_date={self.stat_date}, count={self.plan_count})>"
+
+
+# ============================================================
+# 8️⃣ 데이터 버전 (응답 캐시 무효화용)
+# ============================================================
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    name = Column(String(50), unique=True, nullable=False, comment="버전 이름 (기본: default)")
+    version = Column(BigInteger, nullable=False, default=0, comment="수집/분석으로 데이터가 바뀔 때마다 1 증가")
+
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<DataVersion(name={self.name}, version={self.version})>"
+
+
+# ============================================================
+# 9️⃣ 공고 태그 테이블 (biddings.ai_tags JSON을 정규화 - 태그 집계/필터용)
+# ============================================================
+class BiddingTag(Base):
+    __tablename__ = "bidding_tags"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    bidding_id = Column(Integer, ForeignKey("biddings.id", ondelete="CASCADE"), nullable=False, comment="입찰공고 ID")
+    tag = Column(String(100), nullable=False, comment="AI 생성 태그")
+
+    __table_args__ = (
+        UniqueConstraint('bidding_id', 'tag', name='uix_bidding_tag'),
+        Index('idx_bidding_tags_tag_bidding', 'tag', 'bidding_id'),  # 태그 → 공고 id (집계/필터 index-only scan)
+    )
+
+    def __repr__(self):
+        return f"<BiddingTag(bidding_id={self.bidding_id}, tag={self.tag})>"
+
+
+# ============================================================
+# 🔟 유사 공고 이웃 테이블 (수집 직후 사전 계산 - /api/ml/similar 조회용)
+# ============================================================
+class BiddingNeighbor(Base):
+    __tablename__ = "bidding_neighbors"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    bidding_id = Column(Integer, ForeignKey("biddings.id", ondelete="CASCADE"), nullable=False, comment="입찰공고 ID")
+    rank = Column(Integer, nullable=False, comment="유사도 순위 (1부터)")
+    neighbor_id = Column(Integer, ForeignKey("biddings.id", ondelete="CASCADE"), nullable=False, comment="유사 공고 ID")
+    score = Column(Float, nullable=False, comment="코사인 유사도")
+
+    computed_at = Column(DateTime, default=func.now(), nullable=False, comment="계산 시간")
+
+    __table_args__ = (
+        UniqueConstraint('bidding_id', 'rank', name='uix_bidding_neighbor_rank'),  # 공고 → 순위순 이웃 (조회 인덱스)
+        Index('idx_bidding_neighbors_neighbor', 'neighbor_id'),  # 이웃 공고 삭제 시 CASCADE 조회
+    )
+
+    def __repr__(self):
+        return f"<BiddingNeighbor(bidding_id={self.bidding_id}, rank={self.rank}, neighbor_id={self.neighbor_id})>"
+
+
+# ============================================================
+# 1️⃣1️⃣ 공고 SimHash 밴드 테이블 (중복/재공고 후보 조회용)
+# ============================================================
+class BiddingSimhashBand(Base):
+    __tablename__ = "bidding_simhash_bands"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    bidding_id = Column(Integer, ForeignKey("biddings.id", ondelete="CASCADE"), nullable=False, comment="입찰공고 ID")
+    band_key = Column(Integer, nullable=False, comment="hash(발주기관, 밴드 번호, SimHash 16비트 구간 값)")
+
+    __table_args__ = (
+        UniqueConstraint('bidding_id', 'band_key', name='uix_bidding_simhash_band'),  # 공고별 밴드 교체
+        Index('idx_bidding_simhash_bands_key', 'band_key', 'bidding_id'),  # 밴드 값 → 후보 공고 id (index-only scan)
+    )
+
+    def __repr__(self):
+        return f"<BiddingSimhashBand(bidding_id={self.bidding_id}, band_key={self.band_key})>"
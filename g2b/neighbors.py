@@ -0,0 +1,153 @@
+"""
+유사 공고 이웃 목록 사전 계산
+- 수집 직후 새로 색인된 공고마다 유사도 색인으로 상위 k개를 구해 bidding_neighbors에 저장
+- 새 공고의 이웃이 된 기존 공고도 다시 계산해 기존 공고 목록에 새 공고가 들어가도록 함
+- /api/ml/similar/{id}는 저장된 목록을 (bidding_id, rank) 인덱스로 한 번에 조회, 없으면 즉석 검색
+- 계산한 공고는 biddings.neighbors_computed_at에 기록 (이웃이 없는 공고도 다시 계산하지 않음)
+- 유사도 색인 재구축 후에는 어휘/가중치가 바뀌므로 전체 목록을 다시 계산 (스케줄러)
+
+실행: cd g2b && python neighbors.py         # 이웃 목록을 계산하지 않은 공고 전체 계산 (최초 적재)
+      cd g2b && python neighbors.py --all   # 전체 공고 재계산
+"""
+
+import time
+import logging
+import argparse
+from sqlalchemy import select, insert, delete, update, func
+
+from config import settings
+from database import SessionLocal
+from models import Bidding, BiddingNeighbor
+from similarity_index import similarity_index
+
+logger = logging.getLogger(__name__)
+
+# 한 트랜잭션에서 이웃을 계산·저장하는 공고 수
+NEIGHBOR_CHUNK_SIZE = 500
+
+
+def _store_neighbors(db, rows):
+    """
+    (id, title) 행들의 이웃 목록을 다시 계산해 교체
+
+    Returns:
+        dict: 공고 id → 저장한 이웃 id 목록 (색인이 없으면 빈 dict)
+    """
+    results = {}
+    for row in rows:
+        hits = similarity_index.search(
+            row.title, top_k=settings.SIMILARITY_NEIGHBORS_TOP_K, exclude_id=row.id,
+            mode=settings.SIMILARITY_SEARCH_MODE,
+        )
+        if hits is None:
+            return {}
+        results[row.id] = hits
+
+    # 색인에는 남아 있지만 삭제된 공고는 제외 (외래키 위반 방지)
+    neighbor_ids = {neighbor_id for hits in results.values() for neighbor_id, _ in hits}
+    existing = set(db.scalars(select(Bidding.id).where(Bidding.id.in_(neighbor_ids)))) if neighbor_ids else set()
+
+    values, stored = [], {}
+    for bidding_id, hits in results.items():
+        kept = [(neighbor_id, score) for neighbor_id, score in hits if neighbor_id in existing]
+        stored[bidding_id] = [neighbor_id for neighbor_id, _ in kept]
+        values.extend(
+            {"bidding_id": bidding_id, "rank": rank, "neighbor_id": neighbor_id, "score": score}
+            for rank, (neighbor_id, score) in enumerate(kept, 1)
+        )
+
+    db.execute(delete(BiddingNeighbor).where(BiddingNeighbor.bidding_id.in_(list(results))))
+    if values:
+        db.execute(insert(BiddingNeighbor), values)
+
+    # 이웃이 없는 공고도 계산 완료로 기록 (수집 데이터가 바뀐 것은 아니므로 updated_at 유지)
+    db.execute(
+        update(Bidding)
+        .where(Bidding.id.in_(list(results)))
+        .values(neighbors_computed_at=func.now(), updated_at=Bidding.updated_at)
+    )
+    return stored
+
+
+def _store_chunks(db, bidding_ids):
+    """id 목록을 청크 단위로 계산·커밋 - 공고 id → 저장한 이웃 id 목록"""
+    stored = {}
+    for start in range(0, len(bidding_ids), NEIGHBOR_CHUNK_SIZE):
+        chunk = bidding_ids[start:start + NEIGHBOR_CHUNK_SIZE]
+        rows = db.execute(select(Bidding.id, Bidding.title).where(Bidding.id.in_(chunk))).all()
+        stored.update(_store_neighbors(db, rows))
+        db.commit()
+    return stored
+
+
+def refresh_neighbors(bidding_ids):
+    """
+    공고들의 이웃 목록 재계산 (유사도 색인이 구축된 경우에만) - 저장한 공고 수
+
+    새 공고의 이웃으로 나온 기존 공고도 다시 계산한다
+    (유사도는 대칭이므로 새 공고가 그 공고의 상위 k개에 들어갔을 수 있음).
+    """
+    bidding_ids = sorted(set(bidding_ids or ()))
+    # 방금 추가된 세그먼트가 검색에 포함되도록 색인을 다시 읽음
+    if not bidding_ids or not similarity_index.refresh(force=True):
+        return 0
+
+    started = time.perf_counter()
+    stored = {}
+    db = SessionLocal()
+    try:
+        stored = _store_chunks(db, bidding_ids)
+        touched = {neighbor_id for neighbor_ids in stored.values() for neighbor_id in neighbor_ids}
+        stored.update(_store_chunks(db, sorted(touched - set(bidding_ids))))
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"⚠️ 유사 공고 이웃 계산 실패: {e}")
+    finally:
+        db.close()
+
+    if stored:
+        logger.info(f"🧭 유사 공고 이웃 계산: {len(stored)}건 (새 공고 {len(bidding_ids)}건, {time.perf_counter() - started:.1f}초)")
+    return len(stored)
+
+
+def backfill_neighbors(recompute=False):
+    """
+    이웃 목록 일괄 계산 (id 순 키셋 페이지) - 저장한 공고 수
+
+    Args:
+        recompute: True면 전체 공고 재계산 (유사도 색인 재구축 후),
+                   False면 아직 계산하지 않은 공고만
+    """
+    if not similarity_index.refresh(force=True):
+        logger.info("ℹ️ 유사도 색인 없음 - python similarity_index.py로 먼저 구축")
+        return 0
+
+    started = time.perf_counter()
+    stored, last_id = 0, 0
+    db = SessionLocal()
+    try:
+        while True:
+            query = select(Bidding.id, Bidding.title).where(Bidding.id > last_id)
+            if not recompute:
+                query = query.where(Bidding.neighbors_computed_at.is_(None))
+            rows = db.execute(query.order_by(Bidding.id).limit(NEIGHBOR_CHUNK_SIZE)).all()
+            if not rows:
+                break
+            stored += len(_store_neighbors(db, rows))
+            db.commit()
+            last_id = rows[-1].id
+            logger.info(f"⏳ 유사 공고 이웃 계산: {stored}건 (마지막 ID {last_id})")
+    finally:
+        db.close()
+
+    logger.info(f"✅ 유사 공고 이웃 계산 완료: {stored}건 ({time.perf_counter() - started:.1f}초)")
+    return stored
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="유사 공고 이웃 목록 계산")
+    parser.add_argument("--all", action="store_true", help="이미 계산한 공고도 전체 재계산")
+    args = parser.parse_args()
+
+    backfill_neighbors(recompute=args.all)
@@ -0,0 +1,66 @@
+"""
+목록 API 키셋(커서) 페이지네이션
+- 정렬 키 + id 조합을 불투명 커서(base64)로 인코딩
+- 다음 페이지는 OFFSET 대신 (정렬 키, id) < (커서 값) 조건으로 조회 → 깊은 페이지도 1페이지와 같은 비용
+- 정렬 키가 NULL인 행은 '-infinity'로 취급해 항상 마지막에 위치
+"""
+
+import json
+import base64
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import func, literal_column, tuple_
+
+# NULL 정렬 키 대체값 (인덱스 식과 동일해야 함: COALESCE(col, '-infinity'::timestamp))
+NULL_SORT_VALUE = literal_column("'-infinity'::timestamp")
+
+
+def sort_key(column):
+    """NULL을 가장 작은 값으로 바꾼 정렬 식"""
+    return func.coalesce(column, NULL_SORT_VALUE)
+
+
+def encode_cursor(sort_value, row_id):
+    """(정렬 키, id) → 커서 문자열"""
+    value = sort_value.isoformat() if isinstance(sort_value, datetime) else sort_value
+    raw = json.dumps([value, row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """커서 문자열 → (정렬 키, id) - 형식이 잘못되면 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, row_id = json.loads(raw)
+        return (datetime.fromisoformat(value) if value is not None else None), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def paginate(query, sort_column, id_column, skip=0, limit=20, cursor=None):
+    """
+    (정렬 키 DESC, id DESC) 순 페이지 조회
+
+    cursor가 있으면 키셋 조건으로, 없으면 기존 OFFSET(skip) 방식으로 조회한다.
+
+    Returns:
+        (items, next_cursor) - 마지막 페이지면 next_cursor는 None
+    """
+    key = sort_key(sort_column)
+    query = query.order_by(key.desc(), id_column.desc())
+
+    if cursor:
+        value, row_id = decode_cursor(cursor)
+        bound = NULL_SORT_VALUE if value is None else value
+        query = query.filter(tuple_(key, id_column) < tuple_(bound, row_id))
+    elif skip:
+        query = query.offset(skip)
+
+    items = query.limit(limit).all()
+
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return items, next_cursor
@@ -0,0 +1,221 @@
+"""
+읽기 API 응답 캐시
+- 경로 + 정렬된 쿼리 파라미터를 키로 JSON 응답 본문을 TTL + LRU 캐시
+- 데이터 버전(data_versions 테이블)이 바뀌면 이전 버전 응답은 모두 무효
+  → 수집/ML 분석이 롤업을 갱신할 때 버전을 올림 (rollups.py)
+- ETag / If-None-Match 지원 (내용이 같으면 304)
+"""
+
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from config import settings
+from database import SessionLocal
+from models import DataVersion
+
+logger = logging.getLogger(__name__)
+
+# 캐시 대상 GET 경로 (접두사)
+CACHED_PATHS = (
+    "/api/statistics",
+    "/api/ml/categories",
+    "/api/ml/tags",
+    "/api/biddings",
+    "/api/awards",
+    "/api/orderplans",
+)
+
+DATA_VERSION_NAME = "default"
+
+
+# ==================== 데이터 버전 ====================
+class DataVersionClock:
+    """DB 데이터 버전을 check_interval초 동안 재사용 (요청마다 조회하지 않음)"""
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return self._version
+
+        db = SessionLocal()
+        try:
+            version = db.query(DataVersion.version).filter(DataVersion.name == DATA_VERSION_NAME).scalar() or 0
+        except Exception as e:
+            logger.warning(f"⚠️ 데이터 버전 조회 실패: {e}")
+            return self._version
+        finally:
+            db.close()
+
+        with self._lock:
+            self._version, self._checked_at = version, now
+        return version
+
+    def bump(self):
+        """데이터 변경 기록 - 다른 프로세스(수집 CLI 등)의 캐시도 check_interval 안에 무효화됨"""
+        stmt = insert(DataVersion).values(name=DATA_VERSION_NAME, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DataVersion.name],
+            set_={"version": DataVersion.version + 1, "updated_at": func.now()},
+        ).returning(DataVersion.version)
+
+        db = SessionLocal()
+        try:
+            version = db.execute(stmt).scalar()
+            db.commit()
+        except Exception as e:
+            logger.error(f"❌ 데이터 버전 갱신 실패: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+        with self._lock:
+            self._version, self._checked_at = version, time.monotonic()
+        return version
+
+
+data_version = DataVersionClock(settings.DATA_VERSION_CHECK_INTERVAL)
+
+
+def bump_data_version():
+    """수집/분석으로 데이터가 바뀐 뒤 호출"""
+    return data_version.bump()
+
+
+# ==================== 응답 캐시 ====================
+class ResponseCache:
+    """키 → (데이터 버전, 만료 시각, 본문, ETag, Content-Type) TTL + LRU 캐시"""
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != version or entry[1] < time.monotonic():
+                del self._entries[key]
+                self.stale += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, version, body, etag, media_type):
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, body, etag, media_type)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "not_modified": self.not_modified,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_TTL, settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def cache_key(request):
+    """경로 + 정렬된 쿼리 파라미터 (빈 값 제외)"""
+    params = sorted(parse_qsl(request.url.query))
+    return request.url.path, tuple(params)
+
+
+def make_etag(body):
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+
+def _respond(request, body, etag, media_type, cache_status):
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": cache_status}
+    if _etag_matches(request, etag):
+        response_cache.record_not_modified()
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+async def cache_middleware(request: Request, call_next):
+    """캐시 대상 GET 요청의 응답 캐시 + ETag 처리"""
+    if (
+        not settings.RESPONSE_CACHE_ENABLED
+        or request.method != "GET"
+        or not request.url.path.startswith(CACHED_PATHS)
+    ):
+        return await call_next(request)
+
+    version = await run_in_threadpool(data_version.current)
+    if version is None:
+        return await call_next(request)
+
+    key = cache_key(request)
+    entry = response_cache.get(key, version)
+    if entry:
+        _, _, body, etag, media_type = entry
+        return _respond(request, body, etag, media_type, "HIT")
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = make_etag(body)
+    media_type = response.headers.get("content-type")
+    response_cache.set(key, version, body, etag, media_type)
+    return _respond(request, body, etag, media_type, "MISS")
@@ -0,0 +1,227 @@
+"""
+통계 롤업 테이블 갱신
+- 일별×공고구분×카테고리 / 발주기관별 / 낙찰업체별 / 발주계획 일별 집계를 미리 저장
+- 수집: 저장된 행의 키(날짜, 기관, 업체)를 모아 두었다가 조회 기간 수집이 끝나면 해당 키만 재집계
+- ML 분석: 카테고리가 바뀐 공고의 날짜만 재집계
+- 매일 스케줄 작업에서 전체 재집계 (수정으로 키가 바뀐 행의 이전 키 정리)
+- 재집계 후 데이터 버전을 올려 응답 캐시 무효화
+
+실행: cd g2b && python rollups.py   # 전체 재집계 (최초 적재)
+"""
+
+import logging
+import threading
+from datetime import datetime, time, timedelta
+from sqlalchemy import select, insert, delete, func, cast, and_, or_, Date
+
+from database import SessionLocal
+from response_cache import bump_data_version
+from models import (
+    Bidding, Award, OrderPlan,
+    StatsBiddingDaily, StatsBiddingAgency, StatsAwardCompany, StatsOrderPlanDaily,
+)
+
+logger = logging.getLogger(__name__)
+
+# 동시에 여러 수집 스레드가 같은 키를 재집계하지 않도록 트랜잭션 단위 advisory lock
+ROLLUP_LOCK_KEY = 2015_0001
+
+_pending = {"bidding_dates": set(), "agencies": set(), "companies": set(), "plan_dates": set()}
+_pending_lock = threading.Lock()
+
+
+def _to_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _key_filter(column, keys):
+    """column IN keys (NULL 키 포함)"""
+    values = [key for key in keys if key is not None]
+    conditions = [column.in_(values)] if values else []
+    if None in keys:
+        conditions.append(column.is_(None))
+    return or_(*conditions)
+
+
+def _date_filter(column, dates):
+    """일시 컬럼이 dates 중 하나의 날짜인 행 - 범위 조건을 함께 걸어 일시 인덱스 사용"""
+    values = sorted(d for d in dates if d is not None)
+    conditions = []
+    if values:
+        conditions.append(and_(
+            column >= datetime.combine(values[0], time.min),
+            column < datetime.combine(values[-1] + timedelta(days=1), time.min),
+            cast(column, Date).in_(values),
+        ))
+    if None in dates:
+        conditions.append(column.is_(None))
+    return or_(*conditions)
+
+
+def _replace(db, model, columns, source, target_filter=None, source_filter=None):
+    """롤업 테이블의 해당 키 행을 지우고 원본 테이블 집계 결과로 다시 채움 (keys 없으면 전체)"""
+    delete_stmt = delete(model)
+    if target_filter is not None:
+        delete_stmt = delete_stmt.where(target_filter)
+        source = source.where(source_filter)
+    db.execute(delete_stmt)
+    db.execute(insert(model).from_select(columns, source))
+
+
+def _refresh_bidding_daily(db, dates=None):
+    day = cast(Bidding.notice_date, Date)
+    source = select(
+        day, Bidding.notice_type, Bidding.ai_category,
+        func.count(), func.coalesce(func.sum(Bidding.budget_amount), 0), func.count(Bidding.budget_amount),
+    ).group_by(day, Bidding.notice_type, Bidding.ai_category)
+    _replace(
+        db, StatsBiddingDaily,
+        ["stat_date", "notice_type", "ai_category", "bidding_count", "budget_sum", "budget_count"],
+        source,
+        _key_filter(StatsBiddingDaily.stat_date, dates) if dates is not None else None,
+        _date_filter(Bidding.notice_date, dates) if dates is not None else None,
+    )
+
+
+def _refresh_bidding_agency(db, agencies=None):
+    source = select(
+        Bidding.ordering_agency, func.count(), func.coalesce(func.sum(Bidding.budget_amount), 0),
+    ).group_by(Bidding.ordering_agency)
+    _replace(
+        db, StatsBiddingAgency,
+        ["agency", "bidding_count", "budget_sum"],
+        source,
+        _key_filter(StatsBiddingAgency.agency, agencies) if agencies is not None else None,
+        _key_filter(Bidding.ordering_agency, agencies) if agencies is not None else None,
+    )
+
+
+def _refresh_award_company(db, companies=None):
+    source = select(
+        Award.award_company_name, func.count(), func.coalesce(func.sum(Award.award_amount), 0),
+        func.coalesce(func.sum(Award.award_rate), 0), func.count(Award.award_rate),
+    ).group_by(Award.award_company_name)
+    _replace(
+        db, StatsAwardCompany,
+        ["company_name", "award_count", "award_amount_sum", "award_rate_sum", "award_rate_count"],
+        source,
+        _key_filter(StatsAwardCompany.company_name, companies) if companies is not None else None,
+        _key_filter(Award.award_company_name, companies) if companies is not None else None,
+    )
+
+
+def _refresh_plan_daily(db, dates=None):
+    day = cast(OrderPlan.ntice_dt, Date)
+    source = select(day, func.count()).group_by(day)
+    _replace(
+        db, StatsOrderPlanDaily,
+        ["stat_date", "plan_count"],
+        source,
+        _key_filter(StatsOrderPlanDaily.stat_date, dates) if dates is not None else None,
+        _date_filter(OrderPlan.ntice_dt, dates) if dates is not None else None,
+    )
+
+
+REFRESHERS = {
+    "bidding_dates": _refresh_bidding_daily,
+    "agencies": _refresh_bidding_agency,
+    "companies": _refresh_award_company,
+    "plan_dates": _refresh_plan_daily,
+}
+
+
+def refresh_rollups(**keys):
+    """
+    지정한 키만 재집계 (한 트랜잭션)
+
+    Args:
+        bidding_dates / agencies / companies / plan_dates: 재집계할 키 집합 (날짜 키는 datetime도 허용)
+
+    Returns:
+        bool: 성공 여부
+    """
+    keys = {
+        name: {_to_date(value) for value in values} if name.endswith("_dates") else set(values)
+        for name, values in keys.items() if values
+    }
+    if not keys:
+        return True
+
+    db = SessionLocal()
+    try:
+        db.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY)))
+        for name, values in keys.items():
+            REFRESHERS[name](db, values)
+        db.commit()
+        return True
+    except Exception as e:
+        logger.error(f"❌ 통계 롤업 갱신 실패: {e}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+        # 원본 데이터는 이미 바뀌었으므로 롤업 실패와 무관하게 응답 캐시 무효화
+        bump_data_version()
+
+
+def rebuild_rollups():
+    """전체 재집계"""
+    db = SessionLocal()
+    try:
+        db.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY)))
+        for refresh in REFRESHERS.values():
+            refresh(db)
+        db.commit()
+        logger.info("📊 통계 롤업 전체 재집계 완료")
+    except Exception as e:
+        logger.error(f"❌ 통계 롤업 전체 재집계 실패: {e}")
+        db.rollback()
+    finally:
+        db.close()
+        bump_data_version()
+
+
+# ==================== 수집 경로 ====================
+def _track(**keys):
+    with _pending_lock:
+        for name, values in keys.items():
+            _pending[name].update(values)
+
+
+def track_biddings(rows):
+    """저장된 입찰공고 행의 롤업 키 기록 (bulk_upsert on_change)"""
+    _track(
+        bidding_dates={_to_date(row.get("notice_date")) for row in rows},
+        agencies={row.get("ordering_agency") for row in rows},
+    )
+
+
+def track_awards(rows):
+    """저장된 낙찰정보 행의 롤업 키 기록 (bulk_upsert on_change)"""
+    _track(companies={row.get("award_company_name") for row in rows})
+
+
+def track_plans(rows):
+    """저장된 발주계획 행의 롤업 키 기록 (bulk_upsert on_change)"""
+    _track(plan_dates={_to_date(row.get("ntice_dt")) for row in rows})
+
+
+def flush_rollups():
+    """기록된 키 재집계 - 실패하면 키를 남겨 두고 다음 flush에서 다시 시도"""
+    with _pending_lock:
+        keys = {name: set(values) for name, values in _pending.items() if values}
+        for values in _pending.values():
+            values.clear()
+
+    if not keys:
+        return
+
+    if refresh_rollups(**keys):
+        logger.info("📊 통계 롤업 갱신: " + ", ".join(f"{name} {len(values)}개" for name, values in keys.items()))
+    else:
+        _track(**keys)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    rebuild_rollups()
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional
+from typing import Optional, Literal
 from database import get_db
-from models import Award
+from models import Award, StatsAwardCompany
 from schemas import AwardResponse, AwardListResponse
+from pagination import paginate
+from counting import count_total
+from search import AWARD_SEARCH_COLUMNS, search_filter, ranked_page
 import logging
 
 router = APIRouter(prefix="/api", tags=["낙찰정보"])
@@ -15,7 +17,10 @@ def get_awards(
     skip: int = Query(0, ge=0, description="건너뛸 개수"),
     limit: int = Query(20, ge=1, le=100, description="가져올 개수"),
     notice_type: Optional[str] = Query(None, description="공고 유형"),
-    search: Optional[str] = Query(None, description="업체명 검색"),
+    search: Optional[str] = Query(None, description="검색어 (업체명/공고명/공고기관/수요기관)"),
+    search_mode: Literal["contains", "ranked"] = Query("contains", description="검색 방식 (contains: 최신순, ranked: 관련도순)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 skip 무시)"),
+    count: Optional[Literal["exact", "cached", "estimated"]] = Query(None, description="전체 개수 계산 방식 (exact/cached/estimated)"),
     db: Session = Depends(get_db),
 ):
     """낙찰정보 목록 조회"""
@@ -29,18 +34,24 @@ def get_awards(
     
     # 검색
     if search:
-        query = query.filter(Award.award_company_name.contains(search))
+        query = query.filter(search_filter(AWARD_SEARCH_COLUMNS, search))
     
-    # 최신순
-    query = query.order_by(Award.created_at.desc())
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
+    total, total_type = count_total(query, count)
+    
+    if search and search_mode == "ranked":
+        # 관련도순 (OFFSET 페이징)
+        items, next_cursor = ranked_page(query, AWARD_SEARCH_COLUMNS, search, Award.id, skip, limit), None
+    else:
+        # 최신순 (cursor가 있으면 키셋, 없으면 OFFSET)
+        items, next_cursor = paginate(query, Award.created_at, Award.id, skip, limit, cursor)
     
     return {
         "total": total,
         "items": items,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_type": total_type
     }
 
 @router.get("/awards/{award_id}", response_model=AwardResponse)
@@ -62,16 +73,15 @@ def get_top_companies(
     logger.info(f"🏆 낙찰 업체 TOP {limit} 조회")
     
     top_companies = db.query(
-        Award.award_company_name,
-        func.count(Award.id).label('count'),
-        func.sum(Award.award_amount).label('total_amount'),
-        func.avg(Award.award_rate).label('avg_rate')
+        StatsAwardCompany.company_name,
+        StatsAwardCompany.award_count,
+        StatsAwardCompany.award_amount_sum,
+        StatsAwardCompany.award_rate_sum,
+        StatsAwardCompany.award_rate_count
     ).filter(
-        Award.award_company_name.isnot(None)
-    ).group_by(
-        Award.award_company_name
+        StatsAwardCompany.company_name.isnot(None)
     ).order_by(
-        func.count(Award.id).desc()
+        StatsAwardCompany.award_count.desc()
     ).limit(limit).all()
     
     return [
@@ -79,7 +89,7 @@ def get_top_companies(
             "company": company,
             "count": count,
             "total_amount": int(total_amount or 0),
-            "avg_rate": round(float(avg_rate or 0), 2)
+            "avg_rate": round(rate_sum / rate_count, 2) if rate_count else 0.0
         }
-        for company, count, total_amount, avg_rate in top_companies
+        for company, count, total_amount, rate_sum, rate_count in top_companies
     ]
@@ -1,30 +1,53 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import Optional
+from sqlalchemy import or_, func, select
+from typing import List, Optional, Literal
+from config import settings
 from database import get_db
-from models import Bidding
+from models import Bidding, BiddingTag
 from schemas import BiddingResponse, BiddingListResponse
+from pagination import paginate
+from counting import count_total
+from search import BIDDING_SEARCH_COLUMNS, search_filter, ranked_page
+from search_index import bidding_index
 import logging
 
 router = APIRouter(prefix="/api", tags=["입찰공고"])
 logger = logging.getLogger(__name__)
 
+def tag_filter(tags, match="any"):
+    """태그 조건을 만족하는 공고 id 서브쿼리 (any: 하나라도, all: 모두 포함)"""
+    tags = list(dict.fromkeys(tags))
+    subquery = select(BiddingTag.bidding_id).where(BiddingTag.tag.in_(tags))
+    if match == "all" and len(tags) > 1:
+        subquery = subquery.group_by(BiddingTag.bidding_id).having(
+            func.count(BiddingTag.tag) == len(tags)
+        )
+    return subquery
+
 @router.get("/biddings", response_model=BiddingListResponse)
 def get_biddings(
     skip: int = Query(0, ge=0, description="건너뛸 개수"),
     limit: int = Query(20, ge=1, le=100, description="가져올 개수"),
     notice_type: Optional[str] = Query(None, description="공고 유형 (공사/용역/물품)"),
-    search: Optional[str] = Query(None, description="공고명 검색어"),
+    search: Optional[str] = Query(None, description="검색어 (공고명/발주기관/수요기관)"),
+    search_mode: Literal["contains", "ranked"] = Query("contains", description="검색 방식 (contains: 최신순, ranked: 관련도순)"),
+    search_engine: Literal["db", "index"] = Query("db", description="검색 엔진 (db: LIKE, index: 인메모리 bigram 색인)"),
     min_budget: Optional[int] = Query(None, description="최소 예산 (원)", ge=0),
     max_budget: Optional[int] = Query(None, description="최대 예산 (원)", ge=0),
     ai_category: Optional[str] = Query(None, description="카테고리 필터"),
+    tags: Optional[List[str]] = Query(None, description="태그 필터 (예: tags=긴급&tags=고액)"),
+    tag_match: Literal["any", "all"] = Query("any", description="태그 일치 방식 (any: 하나라도, all: 모두)"),
+    competition_level: Optional[str] = Query(None, description="경쟁 강도 필터 (저/중/고)"),
+    collapse: bool = Query(False, description="중복/재공고 묶기 (클러스터별 가장 최근 공고만)"),
     start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (이전 응답의 next_cursor, 지정 시 skip 무시)"),
+    count: Optional[Literal["exact", "cached", "estimated"]] = Query(None, description="전체 개수 계산 방식 (exact/cached/estimated)"),
     db: Session = Depends(get_db),
 ):
     """입찰공고 목록 조회 (예산별 검색 포함)"""
-    logger.info(f"📋 입찰공고 목록 조회 (skip={skip}, limit={limit}, type={notice_type}, search={search}, budget={min_budget}~{max_budget})")
+    logger.info(f"📋 입찰공고 목록 조회 (skip={skip}, limit={limit}, type={notice_type}, search={search}, budget={min_budget}~{max_budget}, tags={tags})")
 
     query = db.query(Bidding)
 
@@ -32,9 +55,15 @@ def get_biddings(
     if notice_type:
         query = query.filter(Bidding.notice_type == notice_type)
 
-    # 검색
+    # 검색 (index: 색인 후보 id로 제한, 색인 미적재/한 글자 검색어/후보가 너무 많으면 DB 검색)
     if search:
-        query = query.filter(Bidding.title.contains(search))
+        ids = None
+        if search_engine == "index" and bidding_index.ready:
+            ids = bidding_index.search(search, max_candidates=settings.SEARCH_INDEX_MAX_CANDIDATES)
+        if ids is not None:
+            query = query.filter(Bidding.id.in_(ids))
+        else:
+            query = query.filter(search_filter(BIDDING_SEARCH_COLUMNS, search))
 
     # 예산 범위 필터 (budget_amount 또는 estimated_price)
     if min_budget is not None and max_budget is not None:
@@ -71,20 +100,36 @@ def get_biddings(
     if ai_category:
         query = query.filter(Bidding.ai_category == ai_category)
 
-    # 최신순 정렬
-    query = query.order_by(Bidding.notice_date.desc())
+    # 경쟁 강도 필터
+    if competition_level:
+        query = query.filter(Bidding.competition_level == competition_level)
+
+    # 중복/재공고 묶기 (대표 공고 부분 인덱스)
+    if collapse:
+        query = query.filter(Bidding.is_cluster_head)
+
+    # 태그 필터 (bidding_tags 인덱스 기반 세미 조인)
+    tags = [tag.strip() for tag in tags or [] if tag.strip()]
+    if tags:
+        query = query.filter(Bidding.id.in_(tag_filter(tags, tag_match)))
 
     # 전체 개수
-    total = query.count()
+    total, total_type = count_total(query, count)
 
-    # 페이징
-    items = query.offset(skip).limit(limit).all()
+    if search and search_mode == "ranked":
+        # 관련도순 (OFFSET 페이징)
+        items, next_cursor = ranked_page(query, BIDDING_SEARCH_COLUMNS, search, Bidding.id, skip, limit), None
+    else:
+        # 최신순 정렬 + 페이징 (cursor가 있으면 키셋, 없으면 OFFSET)
+        items, next_cursor = paginate(query, Bidding.notice_date, Bidding.id, skip, limit, cursor)
 
     return {
         "total": total,
         "items": items,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_type": total_type
     }
 
 @router.get("/biddings/{bidding_id}", response_model=BiddingResponse)
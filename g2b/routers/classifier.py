@@ -5,13 +5,17 @@ ML 분석 API 라우터
 - 배치 분석
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Optional
+from typing import List, Optional, Literal
+from config import settings
 from database import get_db
-from models import Bidding, Award
+from models import Bidding, BiddingTag, BiddingNeighbor, StatsBiddingDaily
 from ml_analyzer import analyzer
+from rollups import refresh_rollups
+from similarity_index import similarity_index
+from ml_pipeline import ANALYSIS_CHUNK_SIZE, agency_participant_averages, analyze_biddings, apply_analysis, apply_analyses
 import logging
 import json
 
@@ -29,37 +33,15 @@ def analyze_single_bidding(bidding_id: int, db: Session = Depends(get_db)):
     if not bidding:
         raise HTTPException(status_code=404, detail="공고를 찾을 수 없습니다.")
 
-    # 관련 낙찰 데이터 조회 (같은 발주기관)
-    awards = db.query(Award).filter(
-        Award.ntce_instt_nm == bidding.ordering_agency
-    ).limit(100).all()
-
-    awards_data = [
-        {
-            'prtcpt_cnum': a.prtcpt_cnum,
-            'award_rate': a.award_rate
-        }
-        for a in awards if a.prtcpt_cnum
-    ]
-
-    # 태그 부여 
-    bidding_dict = {
-        'title': bidding.title,
-        'budget_amount': bidding.budget_amount,
-        'notice_type': bidding.notice_type,
-        'notice_date': bidding.notice_date,
-        'bid_close_date': bidding.bid_close_date
-    }
-
-    result = analyzer.analyze_bidding(bidding_dict, awards_data)
+    # 같은 발주기관 평균 참가업체수 (집계 쿼리 하나) + 태그 부여
+    result = analyze_biddings(db, [bidding])[0]
 
-    # DB 업데이트
-    bidding.ai_category = result['ai_category']
-    bidding.ai_tags = result['ai_tags']
-    bidding.competition_level = result['competition_level']
+    # DB 업데이트 (태그 테이블 포함)
+    apply_analysis(db, bidding, result)
 
     db.commit()
     db.refresh(bidding)
+    refresh_rollups(bidding_dates={bidding.notice_date})
 
     logger.info(f"✅ 공고 {bidding_id} 분석 완료: {result}")
 
@@ -74,10 +56,40 @@ def analyze_single_bidding(bidding_id: int, db: Session = Depends(get_db)):
     }
 
 
+def search_similar(db: Session, target: Bidding, limit: int, mode: Optional[str] = None, probes: Optional[int] = None) -> List[Bidding]:
+    """유사 공고 즉석 검색 - 유사도 색인이 있으면 전체 공고, 없으면 같은 카테고리 100건 중에서"""
+    hits = similarity_index.search(
+        target.title, top_k=limit, exclude_id=target.id,
+        mode=mode or settings.SIMILARITY_SEARCH_MODE, probes=probes,
+    )
+    if hits is not None:
+        found = {b.id: b for b in db.query(Bidding).filter(Bidding.id.in_([i for i, _ in hits])).all()}
+        return [found[i] for i, _ in hits if i in found]
+
+    # 색인이 없으면 같은 카테고리 공고 중에서 즉석 TF-IDF 계산
+    similar_candidates = db.query(Bidding).filter(
+        Bidding.ai_category == target.ai_category,
+        Bidding.id != target.id
+    ).limit(100).all()
+
+    if not similar_candidates:
+        return []
+
+    all_titles = [b.title for b in similar_candidates]
+    similar_indices = analyzer.find_similar_biddings(
+        target.title,
+        all_titles,
+        top_k=min(limit, len(all_titles))
+    )
+    return [similar_candidates[i] for i in similar_indices]
+
+
 @router.get("/similar/{bidding_id}")
 def find_similar_biddings(
     bidding_id: int,
     limit: int = 5,
+    mode: Optional[Literal["exact", "ann"]] = Query(None, description="검색 방식 (exact: 전체 공고, ann: LSH 근사 검색 / 기본 SIMILARITY_SEARCH_MODE)"),
+    probes: Optional[int] = Query(None, ge=0, le=2, description="ann 조회 시 뒤집어 볼 키 비트 수 (기본 SIMILARITY_ANN_PROBES)"),
     db: Session = Depends(get_db)
 ):
     """유사 공고 찾기"""
@@ -88,26 +100,20 @@ def find_similar_biddings(
     if not target:
         raise HTTPException(status_code=404, detail="공고를 찾을 수 없습니다.")
 
-    # 같은 카테고리의 공고들 조회
-    similar_candidates = db.query(Bidding).filter(
-        Bidding.ai_category == target.ai_category,
-        Bidding.id != bidding_id
-    ).limit(100).all()
+    # 수집 직후 계산해 둔 이웃 목록 (검색 방식을 지정하지 않은 경우) - (bidding_id, rank) 인덱스 조회
+    similar_biddings = []
+    if mode is None and limit <= settings.SIMILARITY_NEIGHBORS_TOP_K:
+        similar_biddings = db.query(Bidding).join(
+            BiddingNeighbor, BiddingNeighbor.neighbor_id == Bidding.id
+        ).filter(
+            BiddingNeighbor.bidding_id == bidding_id
+        ).order_by(BiddingNeighbor.rank).limit(limit).all()
 
-    if not similar_candidates:
-        return {"bidding_id": bidding_id, "similar": []}
-
-    # TF-IDF 유사도 계산
-    all_titles = [b.title for b in similar_candidates]
-    similar_indices = analyzer.find_similar_biddings(
-        target.title,
-        all_titles,
-        top_k=min(limit, len(all_titles))
-    )
+    # 아직 계산되지 않은 공고는 즉석 검색
+    if not similar_biddings:
+        similar_biddings = search_similar(db, target, limit, mode, probes)
 
     # 결과 반환
-    similar_biddings = [similar_candidates[i] for i in similar_indices]
-
     return {
         "bidding_id": bidding_id,
         "title": target.title,
@@ -145,31 +151,24 @@ def analyze_all_biddings_endpoint(
 
         logger.info(f"📊 분석 대상: {total}개 공고")
 
-        for i, bidding in enumerate(biddings, 1):
-            try:
-                bidding_dict = {
-                    'title': bidding.title,
-                    'budget_amount': bidding.budget_amount,
-                    'notice_type': bidding.notice_type,
-                    'notice_date': bidding.notice_date,
-                    'bid_close_date': bidding.bid_close_date
-                }
-
-                result = analyzer.analyze_bidding(bidding_dict)
-
-                bidding.ai_category = result['ai_category']
-                bidding.ai_tags = result['ai_tags']
-                bidding.competition_level = result['competition_level']
+        averages = agency_participant_averages(db, {b.ordering_agency for b in biddings})
 
-                if i % 100 == 0:
-                    db.commit()
-                    logger.info(f"⏳ 진행: {i}/{total} ({i/total*100:.1f}%)")
+        for start in range(0, total, ANALYSIS_CHUNK_SIZE):
+            chunk = biddings[start:start + ANALYSIS_CHUNK_SIZE]
+            try:
+                results = analyze_biddings(db, chunk, averages)
+                apply_analyses(db, chunk, results)
+                db.commit()
+                done = start + len(chunk)
+                logger.info(f"⏳ 진행: {done}/{total} ({done/total*100:.1f}%)")
 
             except Exception as e:
-                logger.error(f"❌ 공고 {bidding.id} 분석 실패: {e}")
+                logger.error(f"❌ 공고 {chunk[0].id}~{chunk[-1].id} 분석 실패: {e}")
+                db.rollback()
                 continue
 
         db.commit()
+        refresh_rollups(bidding_dates={b.notice_date for b in biddings})
         logger.info(f"✅ 배치 분석 완료: {total}개 공고")
 
     background_tasks.add_task(batch_analyze)
@@ -184,17 +183,17 @@ def analyze_all_biddings_endpoint(
 def get_categories(db: Session = Depends(get_db)):
     """AI 카테고리 목록 및 통계"""
     stats = db.query(
-        Bidding.ai_category,
-        func.count(Bidding.id).label('count')
+        StatsBiddingDaily.ai_category,
+        func.sum(StatsBiddingDaily.bidding_count).label('count')
     ).filter(
-        Bidding.ai_category.isnot(None)
+        StatsBiddingDaily.ai_category.isnot(None)
     ).group_by(
-        Bidding.ai_category
+        StatsBiddingDaily.ai_category
     ).all()
 
     return {
         "categories": [
-            {"category": cat, "count": count}
+            {"category": cat, "count": int(count)}
             for cat, count in stats
         ]
     }
@@ -203,27 +202,18 @@ def get_categories(db: Session = Depends(get_db)):
 @router.get("/tags")
 def get_popular_tags(limit: int = 20, db: Session = Depends(get_db)):
     """인기 태그 목록"""
-    biddings = db.query(Bidding).filter(
-        Bidding.ai_tags.isnot(None)
-    ).all()
-
-    # 태그 집계
-    tag_counts = {}
-    for b in biddings:
-        if b.ai_tags:
-            try:
-                tags = json.loads(b.ai_tags)
-                for tag in tags:
-                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
-            except:
-                continue
-
-    # 정렬
-    sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
+    tag_stats = db.query(
+        BiddingTag.tag,
+        func.count().label('count')
+    ).group_by(
+        BiddingTag.tag
+    ).order_by(
+        func.count().desc()
+    ).limit(limit).all()
 
     return {
         "tags": [
             {"tag": tag, "count": count}
-            for tag, count in sorted_tags[:limit]
+            for tag, count in tag_stats
         ]
     }
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, Literal
 from database import get_db
 from models import OrderPlan  # 모델명은 유지
 from schemas import OrderPlanResponse, OrderPlanListResponse
+from pagination import paginate
+from counting import count_total
+from search import ORDER_PLAN_SEARCH_COLUMNS, search_filter, ranked_page
 import logging
 
 router = APIRouter(prefix="/api", tags=["발주계획"])
@@ -14,6 +17,9 @@ def get_orderplans(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = Query(None),
+    search_mode: Literal["contains", "ranked"] = Query("contains"),
+    cursor: Optional[str] = Query(None),
+    count: Optional[Literal["exact", "cached", "estimated"]] = Query(None),
     db: Session = Depends(get_db),
 ):
     """발주계획 목록 조회"""
@@ -22,18 +28,21 @@ def get_orderplans(
     query = db.query(OrderPlan)
     
     if search:
-        query = query.filter(OrderPlan.biz_nm.contains(search))
+        query = query.filter(search_filter(ORDER_PLAN_SEARCH_COLUMNS, search))
     
-    query = query.order_by(OrderPlan.ntice_dt.desc())
-    
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
+    total, total_type = count_total(query, count)
+    if search and search_mode == "ranked":
+        items, next_cursor = ranked_page(query, ORDER_PLAN_SEARCH_COLUMNS, search, OrderPlan.id, skip, limit), None
+    else:
+        items, next_cursor = paginate(query, OrderPlan.ntice_dt, OrderPlan.id, skip, limit, cursor)
     
     return {
         "total": total,
         "items": items,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "total_type": total_type
     }
 
 @router.get("/orderplans/{plan_id}", response_model=OrderPlanResponse)  # URL 변경
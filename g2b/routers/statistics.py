@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Date
+from sqlalchemy import func
 from database import get_db
-from models import Bidding, Award, OrderPlan
+from models import StatsBiddingDaily, StatsBiddingAgency, StatsAwardCompany, StatsOrderPlanDaily
 import logging
 
 router = APIRouter(prefix="/api", tags=["통계"])
@@ -10,42 +10,44 @@ logger = logging.getLogger(__name__)
 
 @router.get("/statistics/summary")
 def get_statistics_summary(db: Session = Depends(get_db)):
-    """전체 통계 요약"""
+    """전체 통계 요약 (롤업 테이블 기준)"""
     logger.info("📊 통계 요약 조회")
     
-    # 입찰공고
-    total_biddings = db.query(Bidding).count()
+    # 입찰공고 건수 / 총 예산
+    total_biddings, total_budget = db.query(
+        func.coalesce(func.sum(StatsBiddingDaily.bidding_count), 0),
+        func.coalesce(func.sum(StatsBiddingDaily.budget_sum), 0)
+    ).one()
     
     # 유형별 입찰공고
     bidding_by_type = db.query(
-        Bidding.notice_type,
-        func.count(Bidding.id).label('count')
+        StatsBiddingDaily.notice_type,
+        func.sum(StatsBiddingDaily.bidding_count).label('count')
     ).filter(
-        Bidding.notice_type.isnot(None)
+        StatsBiddingDaily.notice_type.isnot(None)
     ).group_by(
-        Bidding.notice_type
+        StatsBiddingDaily.notice_type
     ).all()
     
-    # 낙찰정보
-    total_awards = db.query(Award).count()
+    # 낙찰정보 건수 / 총 낙찰액
+    total_awards, total_award_amount = db.query(
+        func.coalesce(func.sum(StatsAwardCompany.award_count), 0),
+        func.coalesce(func.sum(StatsAwardCompany.award_amount_sum), 0)
+    ).one()
     
     # 발주계획
-    total_order_plans = db.query(OrderPlan).count()
-    
-    # 총 예산
-    total_budget = db.query(func.sum(Bidding.budget_amount)).scalar() or 0
-    
-    # 총 낙찰액
-    total_award_amount = db.query(func.sum(Award.award_amount)).scalar() or 0
+    total_order_plans = db.query(
+        func.coalesce(func.sum(StatsOrderPlanDaily.plan_count), 0)
+    ).scalar()
     
     return {
-        "total_biddings": total_biddings,
-        "total_awards": total_awards,
-        "total_order_plans": total_order_plans,
+        "total_biddings": int(total_biddings),
+        "total_awards": int(total_awards),
+        "total_order_plans": int(total_order_plans),
         "total_budget": int(total_budget),
         "total_award_amount": int(total_award_amount),
         "bidding_by_type": [
-            {"type": t, "count": c} for t, c in bidding_by_type
+            {"type": t, "count": int(c)} for t, c in bidding_by_type
         ]
     }
 
@@ -58,18 +60,18 @@ def get_daily_statistics(
     logger.info(f"📊 일별 통계 조회 ({days}일)")
     
     daily_stats = db.query(
-        cast(Bidding.notice_date, Date).label('date'),
-        func.count(Bidding.id).label('count')
+        StatsBiddingDaily.stat_date,
+        func.sum(StatsBiddingDaily.bidding_count).label('count')
     ).filter(
-        Bidding.notice_date.isnot(None)
+        StatsBiddingDaily.stat_date.isnot(None)
     ).group_by(
-        cast(Bidding.notice_date, Date)
+        StatsBiddingDaily.stat_date
     ).order_by(
-        cast(Bidding.notice_date, Date).desc()
+        StatsBiddingDaily.stat_date.desc()
     ).limit(days).all()
     
     return [
-        {"date": str(date), "count": count} 
+        {"date": str(date), "count": int(count)} 
         for date, count in reversed(daily_stats)
     ]
 
@@ -82,15 +84,13 @@ def get_top_agencies(
     logger.info(f"📊 발주기관 TOP {limit} 조회")
     
     top_agencies = db.query(
-        Bidding.ordering_agency,
-        func.count(Bidding.id).label('count'),
-        func.sum(Bidding.budget_amount).label('total_budget')
+        StatsBiddingAgency.agency,
+        StatsBiddingAgency.bidding_count,
+        StatsBiddingAgency.budget_sum
     ).filter(
-        Bidding.ordering_agency.isnot(None)
-    ).group_by(
-        Bidding.ordering_agency
+        StatsBiddingAgency.agency.isnot(None)
     ).order_by(
-        func.count(Bidding.id).desc()
+        StatsBiddingAgency.bidding_count.desc()
     ).limit(limit).all()
     
     return [
@@ -108,22 +108,22 @@ def get_statistics_by_type(db: Session = Depends(get_db)):
     logger.info("📊 유형별 통계 조회")
     
     stats = db.query(
-        Bidding.notice_type,
-        func.count(Bidding.id).label('count'),
-        func.sum(Bidding.budget_amount).label('total_budget'),
-        func.avg(Bidding.budget_amount).label('avg_budget')
+        StatsBiddingDaily.notice_type,
+        func.sum(StatsBiddingDaily.bidding_count).label('count'),
+        func.sum(StatsBiddingDaily.budget_sum).label('total_budget'),
+        func.sum(StatsBiddingDaily.budget_count).label('budget_count')
     ).filter(
-        Bidding.notice_type.isnot(None)
+        StatsBiddingDaily.notice_type.isnot(None)
     ).group_by(
-        Bidding.notice_type
+        StatsBiddingDaily.notice_type
     ).all()
     
     return [
         {
             "type": notice_type,
-            "count": count,
+            "count": int(count),
             "total_budget": int(total_budget or 0),
-            "avg_budget": int(avg_budget or 0)
+            "avg_budget": int(total_budget / budget_count) if budget_count else 0
         }
-        for notice_type, count, total_budget, avg_budget in stats
+        for notice_type, count, total_budget, budget_count in stats
     ]
@@ -2,8 +2,11 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime
 import logging
 from database import SessionLocal  
-from models import Bidding, Award  
-from ml_analyzer import analyzer  
+from models import Bidding  
+from ml_pipeline import ANALYSIS_CHUNK_SIZE, agency_participant_averages, analyze_biddings, apply_analyses
+from rollups import rebuild_rollups
+from similarity_index import current_generation, rebuild_similarity_index
+from neighbors import backfill_neighbors
 
 
 logger = logging.getLogger(__name__)
@@ -14,14 +17,14 @@ def create_scheduler():
     return scheduler
 
 def scheduled_job():
-    """스케줄된 작업 - 데이터 수집 + ML 분석 (2일치)"""
+    """스케줄된 작업 - 데이터 수집 (증분) + ML 분석 + 통계 롤업 + 유사도 색인"""
     from apis.main import run_all
     today = datetime.now().strftime("%Y%m%d")
     logger.info(f"⏰ 자동 데이터 수집 시작 ({today})")
 
     try:
-        # 1. 데이터 수집 (2일치)
-        run_all(days=1)
+        # 1. 데이터 수집 (워터마크 이후 증분)
+        run_all()
         logger.info(f"✅ 자동 데이터 수집 완료 ({today})")
 
         # 2. 새로 수집된 데이터 ML 분석
@@ -29,6 +32,14 @@ def scheduled_job():
         analyze_new_biddings()
         logger.info(f"✅ ML 분석 완료")
 
+        # 3. 통계 롤업 전체 재집계 (카테고리 변경, 수정으로 바뀐 키 반영)
+        rebuild_rollups()
+
+        # 4. 유사도 색인 재구축 (구축된 경우 - 하루치 추가 세그먼트 병합 + 어휘 갱신)
+        if current_generation() is not None:
+            rebuild_similarity_index()
+            backfill_neighbors(recompute=True)   # 어휘/가중치가 바뀌었으므로 전체 이웃 목록 재계산
+
     except Exception as e:
         logger.error(f"❌ 자동 작업 실패: {e}")
 
@@ -50,40 +61,21 @@ def analyze_new_biddings():
 
         logger.info(f"  📊 분석 대상: {count}개 공고")
 
-        for i, bidding in enumerate(unanalyzed, 1):
+        # 발주기관별 평균 참가업체수 한 번에 집계 (경쟁 강도 예측용)
+        averages = agency_participant_averages(db, {b.ordering_agency for b in unanalyzed})
+
+        for start in range(0, count, ANALYSIS_CHUNK_SIZE):
+            chunk = unanalyzed[start:start + ANALYSIS_CHUNK_SIZE]
             try:
-                # 관련 낙찰 데이터 조회 (경쟁 강도 예측용)
-                awards = db.query(Award).filter(
-                    Award.ntce_instt_nm == bidding.ordering_agency
-                ).limit(50).all()
-
-                awards_data = [
-                    {'prtcpt_cnum': a.prtcpt_cnum, 'award_rate': a.award_rate}
-                    for a in awards if a.prtcpt_cnum
-                ]
-
-                # ML 분석 실행
-                bidding_dict = {
-                    'title': bidding.title,
-                    'budget_amount': bidding.budget_amount,
-                    'notice_type': bidding.notice_type,
-                    'notice_date': bidding.notice_date,
-                    'bid_close_date': bidding.bid_close_date
-                }
-
-                result = analyzer.analyze_bidding(bidding_dict, awards_data)
-
-                # DB 업데이트
-                bidding.ai_category = result['ai_category']
-                bidding.ai_tags = result['ai_tags']
-
-                # 10개마다 커밋
-                if i % 10 == 0:
-                    db.commit()
-                    logger.info(f"  ⏳ 진행: {i}/{count}")
+                # ML 분석 실행 + DB 업데이트 (태그 테이블 포함)
+                results = analyze_biddings(db, chunk, averages)
+                apply_analyses(db, chunk, results)
+                db.commit()
+                logger.info(f"  ⏳ 진행: {start + len(chunk)}/{count}")
 
             except Exception as e:
-                logger.error(f"  ❌ 공고 ID {bidding.id} 분석 실패: {e}")
+                logger.error(f"  ❌ 공고 ID {chunk[0].id}~{chunk[-1].id} 분석 실패: {e}")
+                db.rollback()
                 continue
 
         # 최종 커밋
@@ -22,6 +22,9 @@ class BiddingResponse(BaseModel):
     ai_category: Optional[str] = None
     ai_tags: Optional[str] = None
     competition_level: Optional[str] = None
+    # 중복/재공고 클러스터
+    cluster_id: Optional[int] = None
+    is_cluster_head: Optional[bool] = None
     created_at: datetime
     updated_at: datetime
 
@@ -33,6 +36,8 @@ class BiddingListResponse(BaseModel):
     items: list[BiddingResponse]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+    total_type: str = "exact"
 
 # ==================== 낙찰정보 ====================
 class AwardResponse(BaseModel):
@@ -58,6 +63,8 @@ class AwardListResponse(BaseModel):
     items: list[AwardResponse]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+    total_type: str = "exact"
 
 # ==================== 발주계획 ====================
 class OrderPlanResponse(BaseModel):
@@ -95,4 +102,6 @@ class OrderPlanListResponse(BaseModel):
     total: int
     items: list[OrderPlanResponse]
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+    next_cursor: Optional[str] = None
+    total_type: str = "exact"
\ No newline at end of file
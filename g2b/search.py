@@ -0,0 +1,41 @@
+"""
+목록 API 키워드 검색
+- 공고명/사업명 + 기관명 + 업체명을 함께 검색
+- 부분 일치(LIKE '%검색어%')는 pg_trgm GIN 인덱스로 처리 (migrations/003_add_search_indexes.sql)
+- ranked 모드: 트라이그램 유사도(word_similarity) 높은 순 정렬
+
+한국어는 형태소 분석 없이 글자 단위 트라이그램으로 색인되므로
+조사/어미가 붙은 단어도 부분 일치로 찾을 수 있다.
+"""
+
+from sqlalchemy import func, or_
+
+from models import Bidding, Award, OrderPlan
+
+# 엔드포인트별 검색 대상 컬럼 (인덱스 마이그레이션과 맞춰야 함)
+BIDDING_SEARCH_COLUMNS = (Bidding.title, Bidding.ordering_agency, Bidding.demanding_agency)
+AWARD_SEARCH_COLUMNS = (Award.award_company_name, Award.bid_ntce_nm, Award.ntce_instt_nm, Award.dminstt_nm)
+ORDER_PLAN_SEARCH_COLUMNS = (OrderPlan.biz_nm, OrderPlan.order_instt_nm)
+
+
+def search_filter(columns, term):
+    """검색어가 컬럼 중 하나라도 포함되는 조건"""
+    return or_(*[column.contains(term) for column in columns])
+
+
+def search_rank(columns, term):
+    """컬럼별 word_similarity 중 최댓값 (0~1, 높을수록 검색어와 가까움)"""
+    return func.greatest(*[
+        func.word_similarity(term, func.coalesce(column, ""))
+        for column in columns
+    ])
+
+
+def ranked_page(query, columns, term, id_column, skip=0, limit=20):
+    """
+    검색 관련도 순 페이지 조회
+
+    정렬 키가 계산값이라 키셋 커서 대신 OFFSET으로 페이징한다.
+    """
+    rank = search_rank(columns, term)
+    return query.order_by(rank.desc(), id_column.desc()).offset(skip).limit(limit).all()
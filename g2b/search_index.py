@@ -0,0 +1,131 @@
+"""
+입찰공고 검색용 인메모리 역색인 (글자 bigram)
+- 한국어 공고명은 띄어쓰기가 일정하지 않아 단어 대신 연속 두 글자로 색인
+- 검색어의 bigram 중 posting이 가장 짧은 것으로 후보를 뽑고, 원문 부분 일치로 확인
+  → 결과는 DB의 LIKE '%검색어%'와 동일
+- 서버 프로세스 안에서 시작 시 한 번 적재하고, 수집기가 저장 후 증분 갱신
+"""
+
+import time
+import logging
+import threading
+from array import array
+
+from database import SessionLocal
+from models import Bidding
+from search import BIDDING_SEARCH_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# 컬럼 경계를 넘는 bigram이 검색어와 일치하지 않도록 쓰는 구분자
+FIELD_SEPARATOR = "\x00"
+
+
+def bigrams(text):
+    """문자열의 중복 없는 bigram 집합"""
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class BigramIndex:
+    """
+    문서 id → 텍스트, bigram → id posting(array) 역색인
+
+    posting은 추가만 하므로, 문서가 바뀌면 예전 bigram에 오래된 id가 남는다.
+    검색 시 원문 확인 단계에서 걸러지므로 결과에는 영향이 없다.
+    """
+
+    def __init__(self):
+        self._docs = {}
+        self._postings = {}
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, text):
+        """문서 추가/갱신 - 텍스트가 같으면 무시"""
+        text = text or ""
+        with self._lock:
+            previous = self._docs.get(doc_id)
+            if previous == text:
+                return
+            self._docs[doc_id] = text
+            grams = bigrams(text) - (bigrams(previous) if previous else set())
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("i")
+                posting.append(doc_id)
+
+    def search(self, term, max_candidates=None):
+        """
+        term을 포함하는 문서 id 집합 - 색인으로 처리하지 않는 경우 None (호출자가 DB 검색)
+        - 한 글자 검색어 (bigram 없음)
+        - 후보가 max_candidates건 초과 (흔한 bigram뿐이라 id 목록 조건이 DB 검색보다 느림)
+
+        가장 드문 bigram의 posting만 후보로 쓰고 나머지는 원문 확인으로 대신한다
+        (posting 교집합보다 짧은 목록 하나를 훑는 쪽이 빠름).
+        """
+        grams = bigrams(term)
+        if not grams:
+            return None
+
+        # 수집 스레드의 add()와 겹치지 않도록 후보 posting은 잠금 안에서 복사
+        with self._lock:
+            postings = [self._postings.get(gram) for gram in grams]
+            if any(posting is None for posting in postings):
+                return set()
+            candidates = min(postings, key=len)
+            if max_candidates is not None and len(candidates) > max_candidates:
+                return None
+            candidates = set(candidates)
+
+        docs = self._docs
+        return {doc_id for doc_id in candidates if term in docs.get(doc_id, "")}
+
+
+def bidding_document(*fields):
+    """검색 대상 컬럼 값들 → 색인 문서 (DB 검색 컬럼과 동일)"""
+    return FIELD_SEPARATOR.join(field for field in fields if field)
+
+
+bidding_index = BigramIndex()
+
+
+def build_bidding_index(batch_size=10000):
+    """biddings 전체를 읽어 색인 적재 (서버 시작 시 백그라운드 실행)"""
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rows = db.query(Bidding.id, *BIDDING_SEARCH_COLUMNS).yield_per(batch_size)
+        for doc_id, *fields in rows:
+            bidding_index.add(doc_id, bidding_document(*fields))
+    except Exception as e:
+        logger.error(f"❌ 입찰공고 검색 색인 적재 실패: {e}")
+        return
+    finally:
+        db.close()
+
+    bidding_index.ready = True
+    logger.info(f"🔎 입찰공고 검색 색인 적재 완료: {len(bidding_index)}건 ({time.perf_counter() - started:.1f}초)")
+
+
+def update_bidding_index(notice_numbers):
+    """저장된 공고들을 색인에 반영 (색인이 적재된 프로세스에서만)"""
+    if not bidding_index.ready or not notice_numbers:
+        return
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Bidding.id, *BIDDING_SEARCH_COLUMNS).filter(
+            Bidding.notice_number.in_(notice_numbers)
+        ).all()
+    except Exception as e:
+        logger.warning(f"⚠️ 입찰공고 검색 색인 갱신 실패: {e}")
+        return
+    finally:
+        db.close()
+
+    for doc_id, *fields in rows:
+        bidding_index.add(doc_id, bidding_document(*fields))
@@ -0,0 +1,140 @@
+"""
+유사 공고 근사 최근접 이웃(ANN) - 랜덤 프로젝션 LSH
+- TF-IDF 벡터를 무작위 ±1 벡터에 투영한 부호를 비트로 모아 서명을 만들고 (SimHash 방식),
+  bits개씩 묶어 tables개 해시 테이블의 키로 사용
+- 두 벡터의 코사인 유사도가 높을수록 비트가 같을 확률이 높음 → 같은 버킷 후보 중
+  전체 서명(tables*bits 비트)의 해밍 거리가 가까운 rerank개만 정확한 코사인으로 재정렬
+- 조율
+  tables ↑ : 재현율 ↑, 후보 수 ↑ (느려짐)
+  bits ↑   : 버킷이 작아져 빨라짐, 재현율 ↓
+  probes   : 질의 시 키의 비트를 최대 probes개(0~2)까지 뒤집은 이웃 버킷도 조회 → 테이블을 늘리지 않고 재현율 ↑
+  rerank   : 정확히 재계산할 후보 수 ↑ → 재현율 ↑, 느려짐
+- 전부 numpy로 로컬 CPU에서 계산 (외부 서비스/GPU 불필요)
+"""
+
+import json
+from itertools import combinations
+
+import numpy as np
+
+PROJECTION_FILE = "projection.npy"
+META_FILE = "ann.json"
+
+# 서명 계산 시 한 번에 곱하는 행/특성 수 (투영 행렬 전체를 float로 올리지 않도록)
+ROW_CHUNK = 100_000
+FEATURE_BLOCK = 65_536
+
+# 16비트 값별 1 비트 수 (해밍 거리 계산용 표, 64KB)
+POPCOUNT16 = np.unpackbits(np.arange(1 << 16, dtype=">u2").view(np.uint8)).reshape(-1, 16).sum(axis=1).astype(np.uint8)
+
+
+def hamming(signatures, query_keys):
+    """행별 서명과 질의 키의 해밍 거리 (행 × 테이블 키 → 행)"""
+    differing = np.ascontiguousarray(signatures ^ query_keys)
+    return POPCOUNT16[differing.view(np.uint16)].reshape(len(differing), -1).sum(axis=1, dtype=np.int32)
+
+
+class RandomProjectionLSH:
+    """투영 행렬 (n_features × tables*bits, int8 ±1) + 테이블 구성"""
+
+    def __init__(self, projection, tables, bits):
+        if not 1 <= bits <= 63:
+            raise ValueError("bits는 1~63 사이여야 합니다.")
+        self.projection = projection
+        self.tables = tables
+        self.bits = bits
+        self.key_dtype = np.uint16 if bits <= 16 else np.uint32 if bits <= 32 else np.uint64
+        self._weights = (np.ones(1, dtype=np.uint64) << np.arange(bits, dtype=np.uint64)).astype(self.key_dtype)
+
+    @classmethod
+    def create(cls, n_features, tables, bits, seed=0):
+        rng = np.random.default_rng(seed)
+        projection = rng.integers(0, 2, size=(n_features, tables * bits), dtype=np.int8) * 2 - 1
+        return cls(projection.astype(np.int8), tables, bits)
+
+    def save(self, directory):
+        np.save(directory / PROJECTION_FILE, self.projection)
+        (directory / META_FILE).write_text(json.dumps({"tables": self.tables, "bits": self.bits}), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory):
+        """세대 디렉터리의 LSH (ANN 없이 구축된 세대면 None)"""
+        if not (directory / META_FILE).exists():
+            return None
+        meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+        projection = np.load(directory / PROJECTION_FILE, mmap_mode="r")
+        return cls(projection, meta["tables"], meta["bits"])
+
+    def _keys(self, projected):
+        """투영값 (n × tables*bits) → 테이블별 키 (n × tables)"""
+        signs = (projected > 0).reshape(len(projected), self.tables, self.bits)
+        return (signs * self._weights).sum(axis=2, dtype=self.key_dtype)
+
+    def signatures(self, matrix):
+        """TF-IDF 행렬 (n × n_features) → 키 (n × tables)"""
+        matrix = matrix.tocsr()
+        n_features = self.projection.shape[0]
+        keys = np.empty((matrix.shape[0], self.tables), dtype=self.key_dtype)
+
+        for row in range(0, matrix.shape[0], ROW_CHUNK):
+            chunk = matrix[row:row + ROW_CHUNK]
+            projected = np.zeros((chunk.shape[0], self.tables * self.bits), dtype=np.float32)
+            for start in range(0, n_features, FEATURE_BLOCK):
+                block = self.projection[start:start + FEATURE_BLOCK].astype(np.float32)
+                projected += chunk[:, start:start + FEATURE_BLOCK] @ block
+            keys[row:row + ROW_CHUNK] = self._keys(projected)
+        return keys
+
+    def probe_keys(self, query, probes=1):
+        """
+        질의 벡터 (1 × n_features) → (테이블별 질의 키, 테이블별 조회 키 배열 목록)
+
+        probes=1이면 각 비트를 하나씩 뒤집은 키, 2면 두 개씩 뒤집은 키까지 포함
+        """
+        projected = query.data @ self.projection[query.indices].astype(np.float32)
+        base = self._keys(projected[np.newaxis, :])[0]
+
+        flips = [0]
+        for radius in range(1, min(probes, 2) + 1):
+            flips.extend(
+                int(sum(1 << bit for bit in bits))
+                for bits in combinations(range(self.bits), radius)
+            )
+        flips = np.array(flips, dtype=self.key_dtype)
+        return base, [np.unique(key ^ flips) for key in base]
+
+
+class LSHTables:
+    """세그먼트 하나의 테이블별 (정렬된 키, 행 번호) - 버킷 조회는 이진 탐색"""
+
+    def __init__(self, signatures):
+        self._signatures = np.asarray(signatures)   # memmap 하위 클래스의 인덱싱 오버헤드 제거 (매핑은 유지)
+        self._tables = []
+        for table in range(signatures.shape[1]):
+            column = np.asarray(signatures[:, table])
+            order = np.argsort(column, kind="stable").astype(np.int32)
+            self._tables.append((column[order], order))
+
+    def candidates(self, query_keys, probe_keys, limit=None):
+        """
+        조회 키가 속한 버킷들의 행 번호
+
+        limit개보다 많으면 전체 서명의 해밍 거리가 가까운(각도가 작은) 행부터 limit개
+        """
+        # 정렬(np.unique) 대신 행 수 크기의 표시 배열로 중복 제거
+        marked = np.zeros(len(self._signatures), dtype=bool)
+        for (keys, order), probes in zip(self._tables, probe_keys):
+            starts = np.searchsorted(keys, probes, side="left")
+            lengths = np.searchsorted(keys, probes, side="right") - starts
+            total = int(lengths.sum())
+            if total:
+                # 버킷 구간들 [start, end)를 파이썬 반복 없이 하나의 위치 배열로 펼침
+                offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+                marked[order[offsets + np.arange(total)]] = True
+        rows = np.flatnonzero(marked)
+        if not len(rows):
+            return rows
+        if limit is not None and len(rows) > limit:
+            distances = hamming(self._signatures[rows], query_keys)
+            rows = np.sort(rows[np.argpartition(distances, limit - 1)[:limit]])
+        return rows
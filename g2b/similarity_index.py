@@ -0,0 +1,441 @@
+"""
+입찰공고 유사도 색인 (TF-IDF, 디스크 저장)
+- 전체 공고명으로 글자 n-gram(char_wb 2~3) TF-IDF를 오프라인 학습해 디스크에 저장
+  → 서버는 행렬을 np.load(mmap_mode='r')로 매핑만 하므로 요청마다 학습하지 않음
+- 새로 수집된 공고는 저장된 vectorizer로 변환해 세그먼트로 추가
+  (학습 때 없던 n-gram은 무시되고 다음 재구축 때 어휘에 반영)
+- exact 검색: 질의의 n-gram 열(CSC)만 골라 전체 공고 점수를 계산하고 상위 k개
+  (행이 L2 정규화되어 있어 내적 = 코사인 유사도)
+- ann 검색: 랜덤 프로젝션 LSH 버킷 후보(similarity_ann.py) 일부만 행 단위(CSR)로 정확히 재정렬
+- 매일 스케줄 작업에서 재구축 (세그먼트 병합 + 어휘 갱신)
+
+디렉터리 구조 (SIMILARITY_INDEX_DIR)
+  CURRENT                                   현재 세대 이름
+  gen-<ns>/vectorizer.pkl                   학습된 TfidfVectorizer
+  gen-<ns>/projection.npy, ann.json         LSH 투영 행렬 / 테이블 구성
+  gen-<ns>/seg-<ns>/ids, data, indices, indptr.npy                열 단위(CSC) 행렬 - exact 검색
+  gen-<ns>/seg-<ns>/rows_data, rows_indices, rows_indptr.npy      행 단위(CSR) 행렬 - ann 재정렬
+  gen-<ns>/seg-<ns>/signatures.npy + meta.json                    LSH 키 (행 × 테이블)
+
+실행: cd g2b && python similarity_index.py            # 전체 재구축
+      cd g2b && python similarity_index.py --append   # 마지막 색인 이후 수정된 공고만 추가
+"""
+
+import os
+import json
+import time
+import pickle
+import shutil
+import logging
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from collections import namedtuple
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from config import settings
+from database import SessionLocal
+from models import Bidding
+from similarity_ann import RandomProjectionLSH, LSHTables
+
+logger = logging.getLogger(__name__)
+
+# rows / tables는 ANN 파일이 없는 세그먼트면 None
+Segment = namedtuple("Segment", ["name", "ids", "matrix", "rows", "tables"])
+
+# 검색이 한 번에 읽는 색인 상태 - refresh는 새 상태를 만든 뒤 참조 하나만 바꿈
+# (alive: 세그먼트별 유효 행 마스크, 뒤 세그먼트에 같은 공고가 있으면 False)
+IndexState = namedtuple("IndexState", ["generation", "vectorizer", "lsh", "segments", "alive"])
+EMPTY_STATE = IndexState(None, None, None, [], [])
+
+
+def make_vectorizer():
+    return TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 3), sublinear_tf=True, dtype=np.float32)
+
+
+# ==================== 저장 ====================
+def _write_atomic(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _write_segment(generation_dir, ids, matrix, max_updated_at, lsh=None):
+    """
+    세그먼트 저장 - 임시 디렉터리에 쓴 뒤 이름을 바꿔서 읽는 쪽이 반쯤 쓰인 세그먼트를 보지 않게 함
+    이름의 나노초 시각이 세그먼트 순서 (같은 공고가 여러 세그먼트에 있으면 뒤의 것이 유효)
+    세대 디렉터리는 만들지 않음 - 재구축이 지운 세대에 쓰려고 하면 FileNotFoundError
+    """
+    columns = csc_matrix(matrix, dtype=np.float32)
+    name = f"seg-{time.time_ns():020d}"
+    tmp = generation_dir / f".{name}-{os.getpid()}.tmp"
+    tmp.mkdir()
+
+    arrays = {
+        "ids": np.asarray(ids, dtype=np.int64),
+        "data": columns.data,
+        "indices": columns.indices,
+        "indptr": columns.indptr,
+    }
+    if lsh is not None:
+        rows = csr_matrix(matrix, dtype=np.float32)
+        arrays.update({
+            "rows_data": rows.data,
+            "rows_indices": rows.indices,
+            "rows_indptr": rows.indptr,
+            "signatures": lsh.signatures(rows),
+        })
+    for file_name, array in arrays.items():
+        np.save(tmp / f"{file_name}.npy", array)
+    (tmp / "meta.json").write_text(json.dumps({
+        "count": len(ids),
+        "max_updated_at": max_updated_at.isoformat() if max_updated_at else None,
+    }), encoding="utf-8")
+
+    os.replace(tmp, generation_dir / name)
+    return name
+
+
+def write_generation(directory, ids, titles, max_updated_at=None, tables=None, bits=None):
+    """
+    vectorizer 학습 + LSH 생성 + 단일 세그먼트로 새 세대를 쓰고 CURRENT 전환
+
+    Returns:
+        Path: 새 세대 디렉터리
+    """
+    directory = Path(directory)
+    vectorizer = make_vectorizer()
+    matrix = vectorizer.fit_transform([title or "" for title in titles])
+    lsh = RandomProjectionLSH.create(
+        len(vectorizer.vocabulary_),
+        tables or settings.SIMILARITY_ANN_TABLES,
+        bits or settings.SIMILARITY_ANN_BITS,
+    )
+
+    generation = directory / f"gen-{time.time_ns():020d}"
+    generation.mkdir(parents=True)
+    with open(generation / "vectorizer.pkl", "wb") as f:
+        pickle.dump(vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+    lsh.save(generation)
+    _write_segment(generation, ids, matrix, max_updated_at, lsh)
+
+    _write_atomic(directory / "CURRENT", generation.name)
+    return generation
+
+
+def current_generation(directory=None):
+    """현재 세대 디렉터리 (색인이 없으면 None)"""
+    directory = Path(directory or settings.SIMILARITY_INDEX_DIR)
+    try:
+        name = (directory / "CURRENT").read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return directory / name if name else None
+
+
+def _segment_dirs(generation_dir):
+    return sorted(path for path in generation_dir.glob("seg-*") if path.is_dir())
+
+
+# ==================== 검색 ====================
+class SimilarityIndex:
+    """
+    디스크 색인 읽기 전용 뷰
+
+    check_interval초마다 CURRENT / 세그먼트 목록을 확인해 재구축·추가분을 반영한다.
+    """
+
+    def __init__(self, directory, check_interval):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self._state = EMPTY_STATE
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return int(sum(alive.sum() for alive in self._state.alive))
+
+    @property
+    def ready(self):
+        return self._state.vectorizer is not None
+
+    def refresh(self, force=False):
+        """디스크 변경분 반영 - 색인이 있으면 True"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return self.ready
+
+        with self._lock:
+            self._checked_at = now
+            generation = current_generation(self.directory)
+            if generation is None:
+                return self.ready
+
+            state = self._state
+            try:
+                if generation != state.generation:
+                    with open(generation / "vectorizer.pkl", "rb") as f:
+                        vectorizer = pickle.load(f)
+                    lsh = RandomProjectionLSH.load(generation)
+                    segments = []
+                else:
+                    vectorizer, lsh, segments = state.vectorizer, state.lsh, list(state.segments)
+
+                loaded = {segment.name for segment in segments}
+                n_features = len(vectorizer.vocabulary_)
+                for path in _segment_dirs(generation):
+                    if path.name not in loaded:
+                        segments.append(self._load_segment(path, n_features))
+            except Exception as e:
+                logger.warning(f"⚠️ 유사도 색인 로드 실패: {e}")
+                return self.ready
+
+            if generation != state.generation:
+                logger.info(f"🧭 유사도 색인 로드: {generation.name} (세그먼트 {len(segments)}개)")
+            if generation != state.generation or len(segments) != len(state.segments):
+                self._state = IndexState(generation, vectorizer, lsh, segments, self._alive_masks(segments))
+            return True
+
+    @staticmethod
+    def _load_segment(path, n_features):
+        def load(name):
+            return np.load(path / f"{name}.npy", mmap_mode="r")
+
+        ids = load("ids")
+        shape = (len(ids), n_features)
+        matrix = csc_matrix((load("data"), load("indices"), load("indptr")), shape=shape, copy=False)
+
+        rows = tables = None
+        if (path / "signatures.npy").exists():
+            rows = csr_matrix((load("rows_data"), load("rows_indices"), load("rows_indptr")), shape=shape, copy=False)
+            tables = LSHTables(load("signatures"))
+        return Segment(path.name, ids, matrix, rows, tables)
+
+    @staticmethod
+    def _alive_masks(segments):
+        """공고별로 가장 뒤 세그먼트의 행만 유효"""
+        if not segments:
+            return []
+        all_ids = np.concatenate([segment.ids for segment in segments])
+        # 뒤집어서 첫 등장 위치 = 원래 순서의 마지막 등장 위치
+        _, last = np.unique(all_ids[::-1], return_index=True)
+        alive = np.zeros(len(all_ids), dtype=bool)
+        alive[len(all_ids) - 1 - last] = True
+
+        masks, offset = [], 0
+        for segment in segments:
+            masks.append(alive[offset:offset + len(segment.ids)])
+            offset += len(segment.ids)
+        return masks
+
+    @property
+    def ann_ready(self):
+        return self._ann_ready(self._state)
+
+    @staticmethod
+    def _ann_ready(state):
+        return state.lsh is not None and all(segment.tables is not None for segment in state.segments)
+
+    def search(self, title, top_k=5, exclude_id=None, mode="exact", probes=None, rerank=None):
+        """
+        공고명과 가장 비슷한 공고 [(id, 유사도)] - 색인이 없으면 None
+
+        Args:
+            mode: exact (전체 공고 점수) / ann (LSH 후보만 재정렬, ANN 파일이 없는 세대면 exact로 처리)
+            probes: ann 조회 시 뒤집어 볼 비트 수 (기본 SIMILARITY_ANN_PROBES)
+            rerank: ann 세그먼트별로 정확히 재계산할 후보 수 (기본 SIMILARITY_ANN_RERANK)
+        """
+        if not self.refresh():
+            return None
+
+        state = self._state
+        vectorizer, lsh, segments, masks = state.vectorizer, state.lsh, state.segments, state.alive
+        query = vectorizer.transform([title or ""])
+        if not query.nnz or not segments:
+            return []
+
+        if mode == "ann" and self._ann_ready(state):
+            ids, scores = self._ann_scores(
+                lsh, segments, masks, query,
+                settings.SIMILARITY_ANN_PROBES if probes is None else probes,
+                settings.SIMILARITY_ANN_RERANK if rerank is None else rerank,
+            )
+        else:
+            ids = np.concatenate([segment.ids for segment in segments])
+            scores = np.concatenate([
+                np.where(mask, segment.matrix[:, query.indices] @ query.data, 0.0)
+                for segment, mask in zip(segments, masks)
+            ])
+        if exclude_id is not None:
+            scores[ids == exclude_id] = 0.0
+
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), float(scores[i])) for i in top if scores[i] > 0]
+
+    @staticmethod
+    def _ann_scores(lsh, segments, masks, query, probes, rerank):
+        """버킷 후보 행의 (ids, 코사인 유사도)"""
+        query_keys, probe_keys = lsh.probe_keys(query, probes)
+        query_column = query.T.tocsc()
+
+        ids, scores = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.float32)]
+        for segment, mask in zip(segments, masks):
+            rows = segment.tables.candidates(query_keys, probe_keys, max(rerank, 1))
+            rows = rows[mask[rows]]
+            if len(rows):
+                ids.append(np.asarray(segment.ids[rows]))
+                scores.append((segment.rows[rows] @ query_column).toarray().ravel())
+        return np.concatenate(ids), np.concatenate(scores)
+
+
+similarity_index = SimilarityIndex(settings.SIMILARITY_INDEX_DIR, settings.SIMILARITY_INDEX_CHECK_INTERVAL)
+
+
+# ==================== 구축 / 추가 ====================
+# 재구축(세대 전환 + 이전 세대 삭제)과 세그먼트 추가를 직렬화
+# → 추가는 항상 잠금을 잡은 뒤의 CURRENT 세대에 쓰고, 재구축 중 추가된 공고는 새 세대에 들어감
+_write_lock = threading.Lock()
+
+
+def rebuild_similarity_index():
+    """전체 공고명으로 vectorizer 재학습 + 단일 세그먼트로 새 세대 저장 후 이전 세대 삭제"""
+    with _write_lock:
+        return _rebuild()
+
+
+def _rebuild():
+    started = time.perf_counter()
+    directory = Path(settings.SIMILARITY_INDEX_DIR)
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Bidding.id, Bidding.title, Bidding.updated_at).all()
+    except Exception as e:
+        logger.error(f"❌ 유사도 색인 재구축 실패 (공고 조회): {e}")
+        return False
+    finally:
+        db.close()
+
+    if not rows:
+        logger.info("ℹ️ 유사도 색인: 공고 없음")
+        return False
+
+    generation = write_generation(
+        directory,
+        [row.id for row in rows],
+        [row.title for row in rows],
+        max(row.updated_at for row in rows),
+    )
+
+    # 이전 세대 정리 (다른 프로세스가 매핑 중이면 OS에 따라 실패할 수 있어 무시)
+    for path in directory.glob("gen-*"):
+        if path != generation:
+            shutil.rmtree(path, ignore_errors=True)
+
+    logger.info(f"🧭 유사도 색인 재구축 완료: {len(rows)}건 ({time.perf_counter() - started:.1f}초)")
+    return True
+
+
+def _append_rows(rows):
+    """(id, title, updated_at) 행을 현재 세대의 새 세그먼트로 추가 - 추가한 공고 id 목록"""
+    if not rows:
+        return []
+
+    with _write_lock:
+        # 잠금을 기다리는 사이 재구축됐을 수 있으므로 CURRENT를 잠금 안에서 다시 읽음
+        generation = current_generation()
+        if generation is None or not generation.is_dir():
+            return []
+
+        with open(generation / "vectorizer.pkl", "rb") as f:
+            vectorizer = pickle.load(f)
+        matrix = vectorizer.transform([row.title or "" for row in rows])
+        _write_segment(
+            generation, [row.id for row in rows], matrix, max(row.updated_at for row in rows),
+            RandomProjectionLSH.load(generation),
+        )
+    return [row.id for row in rows]
+
+
+def append_similarity_index(notice_numbers):
+    """저장된 공고들을 세그먼트로 추가 (색인이 구축된 경우에만) - 추가한 공고 id 목록"""
+    if not notice_numbers or current_generation() is None:
+        return []
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Bidding.id, Bidding.title, Bidding.updated_at).filter(
+            Bidding.notice_number.in_(list(notice_numbers))
+        ).all()
+        return _append_rows(rows)
+    except Exception as e:
+        logger.warning(f"⚠️ 유사도 색인 추가 실패: {e}")
+        return []
+    finally:
+        db.close()
+
+
+def catch_up_similarity_index():
+    """마지막 세그먼트 이후 수정된 공고를 추가 - 추가한 공고 id 목록"""
+    generation = current_generation()
+    if generation is None:
+        logger.info("ℹ️ 유사도 색인 없음 - 전체 재구축 필요")
+        return []
+
+    watermarks = []
+    for path in _segment_dirs(generation):
+        value = json.loads((path / "meta.json").read_text(encoding="utf-8")).get("max_updated_at")
+        if value:
+            watermarks.append(datetime.fromisoformat(value))
+
+    db = SessionLocal()
+    try:
+        query = db.query(Bidding.id, Bidding.title, Bidding.updated_at)
+        if watermarks:
+            query = query.filter(Bidding.updated_at > max(watermarks))
+        return _append_rows(query.all())
+    finally:
+        db.close()
+
+
+# ==================== 수집 경로 ====================
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def track_similarity(notice_numbers):
+    """저장된 공고번호 기록 - flush_similarity_index에서 세그먼트 하나로 추가"""
+    with _pending_lock:
+        _pending.update(number for number in notice_numbers if number)
+
+
+def flush_similarity_index():
+    """기록된 공고를 색인에 추가 - 추가한 공고 id 목록"""
+    with _pending_lock:
+        notice_numbers = set(_pending)
+        _pending.clear()
+
+    added = append_similarity_index(notice_numbers)
+    if added:
+        logger.info(f"🧭 유사도 색인 추가: {len(added)}건")
+    return added
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="입찰공고 유사도 색인")
+    parser.add_argument("--append", action="store_true", help="마지막 색인 이후 수정된 공고만 추가")
+    args = parser.parse_args()
+
+    if args.append:
+        logger.info(f"🧭 유사도 색인 추가: {len(catch_up_similarity_index())}건")
+    else:
+        rebuild_similarity_index()
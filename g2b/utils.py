@@ -1,43 +1,150 @@
-import requests
+import time
+import random
 import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config import settings
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# 재시도 대상 HTTP 상태 코드 (일시적 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FetchMetrics:
+    """API 요청 지표 (지연시간, 재시도, 수신 바이트)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.successes = 0
+            self.failures = 0
+            self.retries = 0
+            self.bytes_received = 0
+            self.latency_total = 0.0
+            self.latency_max = 0.0
+
+    def record_attempt(self, latency, size=0):
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += size
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_result(self, ok):
+        with self._lock:
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "successes": self.successes,
+                "failures": self.failures,
+                "retries": self.retries,
+                "bytes_received": self.bytes_received,
+                "latency_avg": round(self.latency_total / self.requests, 4) if self.requests else 0.0,
+                "latency_max": round(self.latency_max, 4),
+            }
+
+
+fetch_metrics = FetchMetrics()
+
+
+def _create_session():
+    """keep-alive 커넥션 풀 세션 (호스트별 최대 연결 수 제한)"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# 전역 세션 - apis.data.go.kr TLS 연결을 페이지 요청 간에 재사용
+http_session = _create_session()
+
+
+def backoff(attempt):
+    """지수 백오프 + full jitter (0 ~ base * 2^attempt, 최대 HTTP_BACKOFF_MAX초)"""
+    ceiling = min(settings.HTTP_BACKOFF_MAX, settings.HTTP_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
 
 def fetch_data(url, params):
-    r = None
-    try:
-        r = requests.get(url, params=params, timeout=15)
-        
-        logging.info(f"🌐 URL: {url}")
-        logging.info(f"📊 Status Code: {r.status_code}")
-        logging.info(f"🔗 Full URL: {r.url}")
-        
-        if r.status_code != 200:
-            logging.error(f"❌ HTTP Error {r.status_code}")
-            logging.error(f"응답 내용: {r.text[:500]}")
-            return None
-        
-        r.raise_for_status()
-        data = r.json()
-        
-        # ✅ ResponseError 체크 추가!
-        if "nkoneps.com.response.ResponseError" in data:
-            error_info = data["nkoneps.com.response.ResponseError"]
-            error_msg = error_info.get("header", {}).get("resultMsg", "알 수 없는 에러")
-            logging.error(f"❌ API 에러: {error_msg}")
-            return None
-        
-        return data
-        
-    except requests.exceptions.Timeout:
-        logging.error(f"❌ 타임아웃: {url}")
-        return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"❌ 요청 실패: {e}")
-        if r is not None:
-            logging.error(f"resp.text: {r.text[:500]}")
-        return None
-    except Exception as e:
-        logging.error(f"❌ 예상치 못한 에러: {e}")
-        return None
\ No newline at end of file
+    """
+    API GET 요청 → JSON 반환 (실패 시 None)
+
+    타임아웃/연결 오류/일시적 HTTP 오류(429, 5xx)는
+    HTTP_MAX_RETRIES회까지 지수 백오프로 재시도한다.
+    """
+    for attempt in range(settings.HTTP_MAX_RETRIES + 1):
+        if attempt:
+            fetch_metrics.record_retry()
+            time.sleep(backoff(attempt - 1))
+
+        r = None
+        started = time.perf_counter()
+        try:
+            r = http_session.get(url, params=params, timeout=settings.HTTP_TIMEOUT)
+            fetch_metrics.record_attempt(time.perf_counter() - started, len(r.content))
+
+            logging.info(f"🌐 URL: {url}")
+            logging.info(f"📊 Status Code: {r.status_code}")
+            logging.info(f"🔗 Full URL: {r.url}")
+
+            if r.status_code in RETRY_STATUS_CODES:
+                logging.warning(f"⚠️ HTTP {r.status_code} - {attempt + 1}/{settings.HTTP_MAX_RETRIES + 1}회 시도")
+                continue
+
+            if r.status_code != 200:
+                logging.error(f"❌ HTTP Error {r.status_code}")
+                logging.error(f"응답 내용: {r.text[:500]}")
+                break
+
+            r.raise_for_status()
+            data = r.json()
+
+            # ✅ ResponseError 체크 추가!
+            if "nkoneps.com.response.ResponseError" in data:
+                error_info = data["nkoneps.com.response.ResponseError"]
+                error_msg = error_info.get("header", {}).get("resultMsg", "알 수 없는 에러")
+                logging.error(f"❌ API 에러: {error_msg}")
+                break
+
+            fetch_metrics.record_result(True)
+            return data
+
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            if r is None:
+                fetch_metrics.record_attempt(time.perf_counter() - started)
+            logging.warning(f"⚠️ 연결 실패/타임아웃 - {attempt + 1}/{settings.HTTP_MAX_RETRIES + 1}회 시도: {url} ({e})")
+            continue
+        except requests.exceptions.RequestException as e:
+            logging.error(f"❌ 요청 실패: {e}")
+            if r is not None:
+                logging.error(f"resp.text: {r.text[:500]}")
+            break
+        except Exception as e:
+            logging.error(f"❌ 예상치 못한 에러: {e}")
+            break
+    else:
+        logging.error(f"❌ 재시도 초과: {url}")
+
+    fetch_metrics.record_result(False)
+    return None
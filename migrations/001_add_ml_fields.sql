@@ -1,5 +1,5 @@
 -- ML 분석 필드 추가 마이그레이션
--- 실행 방법: psql -U username -d dbname -f add_ml_fields.sql
+-- 실행 방법: psql -U username -d dbname -f 001_add_ml_fields.sql
 
 -- biddings 테이블에 ML 분석 필드 추가
 ALTER TABLE biddings
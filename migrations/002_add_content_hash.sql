@@ -0,0 +1,22 @@
+-- 변경 감지용 content_hash 컬럼 추가 마이그레이션
+-- 실행 방법: psql -U username -d dbname -f 002_add_content_hash.sql
+
+-- 수집 시 정규화된 원본 레코드의 SHA-256 해시를 저장
+-- 해시가 같은 행은 다시 쓰지 않으므로 updated_at이 실제 변경 시점만 반영됨
+ALTER TABLE biddings
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+ALTER TABLE awards
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+ALTER TABLE order_plans
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+ALTER TABLE contracts
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+-- 컬럼에 코멘트 추가
+COMMENT ON COLUMN biddings.content_hash IS '원본 레코드 해시 (변경 감지용)';
+COMMENT ON COLUMN awards.content_hash IS '원본 레코드 해시 (변경 감지용)';
+COMMENT ON COLUMN order_plans.content_hash IS '원본 레코드 해시 (변경 감지용)';
+COMMENT ON COLUMN contracts.content_hash IS '원본 레코드 해시 (변경 감지용)';
@@ -0,0 +1,30 @@
+-- 키워드 검색용 트라이그램 인덱스 마이그레이션
+-- 실행 방법: psql -U username -d dbname -f 003_add_search_indexes.sql
+
+-- pg_trgm 확장 (CREATE 권한 필요, RDS는 기본 제공)
+-- 한글 트라이그램은 DB의 LC_CTYPE이 UTF-8 계열일 때만 생성됨 (C 로케일이면 한글이 무시됨)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- LIKE '%검색어%' / word_similarity 검색을 GIN 인덱스로 처리
+-- 3글자 미만 검색어는 트라이그램이 없어 인덱스 대신 순차 스캔됨
+CREATE INDEX IF NOT EXISTS idx_biddings_title_trgm ON biddings USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_biddings_ordering_agency_trgm ON biddings USING gin (ordering_agency gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_biddings_demanding_agency_trgm ON biddings USING gin (demanding_agency gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_awards_company_name_trgm ON awards USING gin (award_company_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_awards_bid_ntce_nm_trgm ON awards USING gin (bid_ntce_nm gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_awards_ntce_instt_nm_trgm ON awards USING gin (ntce_instt_nm gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_awards_dminstt_nm_trgm ON awards USING gin (dminstt_nm gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_order_plans_biz_nm_trgm ON order_plans USING gin (biz_nm gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_order_plans_order_instt_nm_trgm ON order_plans USING gin (order_instt_nm gin_trgm_ops);
+
+-- 통계 갱신 (estimated 개수 계산 정확도에도 영향)
+ANALYZE biddings;
+ANALYZE awards;
+ANALYZE order_plans;
+
+-- 확인
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE indexname LIKE '%\_trgm';
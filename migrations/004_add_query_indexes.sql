@@ -0,0 +1,55 @@
+-- 목록/통계/수집 쿼리 형태에 맞춘 복합·부분 인덱스 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+-- 검증: cd g2b && python explain_queries.py
+
+-- 목록 키셋 페이지네이션: ORDER BY COALESCE(정렬키, '-infinity') DESC, id DESC
+-- (pagination.py의 sort_key 식과 정확히 같아야 인덱스가 사용됨)
+CREATE INDEX IF NOT EXISTS idx_biddings_notice_date_keyset
+    ON biddings ((COALESCE(notice_date, '-infinity'::timestamp)) DESC, id DESC);
+
+-- 유형 필터 + 최신순
+CREATE INDEX IF NOT EXISTS idx_biddings_type_notice_date_keyset
+    ON biddings (notice_type, (COALESCE(notice_date, '-infinity'::timestamp)) DESC, id DESC);
+
+-- 카테고리 필터 + 최신순 (단일 ai_category 인덱스를 대체)
+CREATE INDEX IF NOT EXISTS idx_biddings_category_notice_date_keyset
+    ON biddings (ai_category, (COALESCE(notice_date, '-infinity'::timestamp)) DESC, id DESC);
+DROP INDEX IF EXISTS idx_biddings_ai_category;
+
+-- 기간 필터, 일별 통계, 워터마크 MAX(notice_date)
+CREATE INDEX IF NOT EXISTS idx_biddings_notice_date
+    ON biddings (notice_date) WHERE notice_date IS NOT NULL;
+
+-- 예산 범위 필터: budget_amount OR estimated_price → BitmapOr
+CREATE INDEX IF NOT EXISTS idx_biddings_budget_amount
+    ON biddings (budget_amount) WHERE budget_amount IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_biddings_estimated_price
+    ON biddings (estimated_price) WHERE estimated_price IS NOT NULL;
+
+-- ML 배치 분석 대상 (ai_category IS NULL)
+CREATE INDEX IF NOT EXISTS idx_biddings_unanalyzed
+    ON biddings (id) WHERE ai_category IS NULL;
+
+-- 낙찰정보 목록 (등록순) / 유형 필터
+CREATE INDEX IF NOT EXISTS idx_awards_created_at_keyset
+    ON awards ((COALESCE(created_at, '-infinity'::timestamp)) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_awards_type_created_at_keyset
+    ON awards (notice_type, (COALESCE(created_at, '-infinity'::timestamp)) DESC, id DESC);
+
+-- 기관별 낙찰 이력 (ML 분석의 같은 발주기관 조회)
+CREATE INDEX IF NOT EXISTS idx_awards_ntce_instt_nm
+    ON awards (ntce_instt_nm) WHERE ntce_instt_nm IS NOT NULL;
+
+-- 워터마크 MAX(inpt_dt)
+CREATE INDEX IF NOT EXISTS idx_awards_inpt_dt
+    ON awards (inpt_dt) WHERE inpt_dt IS NOT NULL;
+
+-- 발주계획 목록 (공고일순) / 워터마크 MAX(ntice_dt)
+CREATE INDEX IF NOT EXISTS idx_order_plans_ntice_dt_keyset
+    ON order_plans ((COALESCE(ntice_dt, '-infinity'::timestamp)) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_order_plans_ntice_dt
+    ON order_plans (ntice_dt) WHERE ntice_dt IS NOT NULL;
+
+ANALYZE biddings;
+ANALYZE awards;
+ANALYZE order_plans;
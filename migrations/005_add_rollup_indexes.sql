@@ -0,0 +1,13 @@
+-- 통계 롤업 키별 재집계용 인덱스 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+-- 롤업 테이블(stats_*)은 서버 시작 시 init_db()가 생성하고, 최초 적재는 cd g2b && python rollups.py
+
+-- 발주기관별 재집계 (WHERE ordering_agency IN (...))
+CREATE INDEX IF NOT EXISTS idx_biddings_ordering_agency
+    ON biddings (ordering_agency);
+
+-- 낙찰업체별 재집계 (WHERE award_company_name IN (...))
+CREATE INDEX IF NOT EXISTS idx_awards_award_company_name
+    ON awards (award_company_name);
+
+-- 발주계획 일별 재집계는 004의 idx_order_plans_ntice_dt, 입찰공고 일별은 idx_biddings_notice_date 사용
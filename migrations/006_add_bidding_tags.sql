@@ -0,0 +1,33 @@
+-- 공고 태그 정규화 테이블 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+
+-- biddings.ai_tags(JSON 문자열)를 태그 단위 행으로 저장 → 태그 집계/필터를 인덱스로 처리
+-- (서버 시작 시 init_db()도 같은 테이블을 생성함)
+CREATE TABLE IF NOT EXISTS bidding_tags (
+    id SERIAL PRIMARY KEY,
+    bidding_id INTEGER NOT NULL REFERENCES biddings(id) ON DELETE CASCADE,
+    tag VARCHAR(100) NOT NULL,
+    CONSTRAINT uix_bidding_tag UNIQUE (bidding_id, tag)
+);
+
+CREATE INDEX IF NOT EXISTS ix_bidding_tags_id ON bidding_tags (id);
+CREATE INDEX IF NOT EXISTS ix_bidding_tags_tag ON bidding_tags (tag);
+
+COMMENT ON COLUMN bidding_tags.bidding_id IS '입찰공고 ID';
+COMMENT ON COLUMN bidding_tags.tag IS 'AI 생성 태그';
+
+-- 기존 분석 결과 이관 (JSON 배열 형식인 행만)
+INSERT INTO bidding_tags (bidding_id, tag)
+SELECT DISTINCT b.id, btrim(t.tag)
+FROM biddings b
+CROSS JOIN LATERAL json_array_elements_text(b.ai_tags::json) AS t(tag)
+WHERE b.ai_tags ~ '^\s*\[.*\]\s*$'
+  AND btrim(t.tag) <> ''
+ON CONFLICT (bidding_id, tag) DO NOTHING;
+
+-- 확인
+SELECT tag, COUNT(*) AS count
+FROM bidding_tags
+GROUP BY tag
+ORDER BY count DESC
+LIMIT 10;
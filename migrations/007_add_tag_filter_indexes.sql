@@ -0,0 +1,15 @@
+-- 태그/경쟁 강도 필터용 인덱스 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+
+-- 태그 필터: WHERE tag IN (...) → bidding_id 를 인덱스만으로 조회 (단일 tag 인덱스를 대체)
+CREATE INDEX IF NOT EXISTS idx_bidding_tags_tag_bidding
+    ON bidding_tags (tag, bidding_id);
+DROP INDEX IF EXISTS ix_bidding_tags_tag;
+
+-- 경쟁 강도 필터 + 최신순 (001의 단일 competition_level 인덱스를 대체)
+CREATE INDEX IF NOT EXISTS idx_biddings_competition_notice_date_keyset
+    ON biddings (competition_level, (COALESCE(notice_date, '-infinity'::timestamp)) DESC, id DESC);
+DROP INDEX IF EXISTS idx_biddings_competition_level;
+
+ANALYZE bidding_tags;
+ANALYZE biddings;
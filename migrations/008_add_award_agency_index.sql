@@ -0,0 +1,7 @@
+-- ML 분석 발주기관별 평균 참가업체수 집계용 인덱스 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+
+-- SELECT ntce_instt_nm, avg(prtcpt_cnum) ... WHERE ntce_instt_nm IN (...) GROUP BY ntce_instt_nm
+-- → 참가업체수까지 인덱스에 담아 index-only scan (ml_pipeline.agency_participant_averages)
+CREATE INDEX IF NOT EXISTS idx_awards_agency_participants
+    ON awards (ntce_instt_nm, prtcpt_cnum);
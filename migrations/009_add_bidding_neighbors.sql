@@ -0,0 +1,24 @@
+-- 유사 공고 이웃 테이블 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+-- 최초 적재: cd g2b && python similarity_index.py && python neighbors.py
+
+-- 수집 직후 새 공고마다 유사 공고 상위 k개를 저장 → /api/ml/similar/{id}는 (bidding_id, rank) 인덱스 조회 한 번
+-- (서버 시작 시 init_db()도 같은 테이블을 생성함)
+CREATE TABLE IF NOT EXISTS bidding_neighbors (
+    id SERIAL PRIMARY KEY,
+    bidding_id INTEGER NOT NULL REFERENCES biddings(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    neighbor_id INTEGER NOT NULL REFERENCES biddings(id) ON DELETE CASCADE,
+    score DOUBLE PRECISION NOT NULL,
+    computed_at TIMESTAMP NOT NULL DEFAULT now(),
+    CONSTRAINT uix_bidding_neighbor_rank UNIQUE (bidding_id, rank)
+);
+
+CREATE INDEX IF NOT EXISTS ix_bidding_neighbors_id ON bidding_neighbors (id);
+CREATE INDEX IF NOT EXISTS idx_bidding_neighbors_neighbor ON bidding_neighbors (neighbor_id);
+
+COMMENT ON COLUMN bidding_neighbors.bidding_id IS '입찰공고 ID';
+COMMENT ON COLUMN bidding_neighbors.rank IS '유사도 순위 (1부터)';
+COMMENT ON COLUMN bidding_neighbors.neighbor_id IS '유사 공고 ID';
+COMMENT ON COLUMN bidding_neighbors.score IS '코사인 유사도';
+COMMENT ON COLUMN bidding_neighbors.computed_at IS '계산 시간';
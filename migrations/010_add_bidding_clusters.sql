@@ -0,0 +1,40 @@
+-- 중복/재공고 클러스터 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+-- 기존 공고 클러스터 지정: cd g2b && python dedup.py
+
+-- 공고명+발주기관+예산 SimHash와 클러스터 (같은 사업이 새 공고번호로 다시 올라온 공고를 묶음)
+ALTER TABLE biddings
+ADD COLUMN IF NOT EXISTS simhash BIGINT,
+ADD COLUMN IF NOT EXISTS cluster_id INTEGER,
+ADD COLUMN IF NOT EXISTS is_cluster_head BOOLEAN NOT NULL DEFAULT TRUE;
+
+COMMENT ON COLUMN biddings.simhash IS '공고명+발주기관+예산 SimHash (64비트)';
+COMMENT ON COLUMN biddings.cluster_id IS '중복/재공고 클러스터 ID (클러스터 최초 공고 id)';
+COMMENT ON COLUMN biddings.is_cluster_head IS '클러스터 대표 공고 여부 (가장 최근 공고)';
+
+-- 클러스터 대표 공고 재계산 (클러스터 id → 구성 공고)
+CREATE INDEX IF NOT EXISTS idx_biddings_cluster
+    ON biddings (cluster_id);
+
+-- 목록 collapse=true: 대표 공고만 최신순 (부분 인덱스)
+CREATE INDEX IF NOT EXISTS idx_biddings_cluster_head_notice_date_keyset
+    ON biddings ((COALESCE(notice_date, '-infinity'::timestamp)) DESC, id DESC)
+    WHERE is_cluster_head;
+
+-- SimHash 64비트를 16비트씩 4개 밴드로 나눠 발주기관과 함께 해시해 저장
+-- → 같은 기관에서 해밍 거리 3 이하인 공고는 적어도 한 밴드 키가 같음
+-- (서버 시작 시 init_db()도 같은 테이블을 생성함)
+CREATE TABLE IF NOT EXISTS bidding_simhash_bands (
+    id SERIAL PRIMARY KEY,
+    bidding_id INTEGER NOT NULL REFERENCES biddings(id) ON DELETE CASCADE,
+    band_key INTEGER NOT NULL,
+    CONSTRAINT uix_bidding_simhash_band UNIQUE (bidding_id, band_key)
+);
+
+CREATE INDEX IF NOT EXISTS ix_bidding_simhash_bands_id ON bidding_simhash_bands (id);
+CREATE INDEX IF NOT EXISTS idx_bidding_simhash_bands_key ON bidding_simhash_bands (band_key, bidding_id);
+
+COMMENT ON COLUMN bidding_simhash_bands.bidding_id IS '입찰공고 ID';
+COMMENT ON COLUMN bidding_simhash_bands.band_key IS 'hash(발주기관, 밴드 번호, SimHash 16비트 구간 값)';
+
+ANALYZE biddings;
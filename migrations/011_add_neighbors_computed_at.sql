@@ -0,0 +1,26 @@
+-- 유사 공고 이웃 계산 시점 마이그레이션
+-- 실행 방법: cd g2b && python migrate.py
+-- 기존 이웃 목록 재계산: cd g2b && python neighbors.py --all
+
+-- 이웃이 하나도 없는 공고도 계산 완료로 기록 (매일 밤 보충 대상에서 제외)
+ALTER TABLE biddings
+ADD COLUMN IF NOT EXISTS neighbors_computed_at TIMESTAMP;
+
+COMMENT ON COLUMN biddings.neighbors_computed_at IS '유사 공고 이웃 목록 계산 시간 (NULL이면 미계산)';
+
+-- 이미 이웃 목록이 있는 공고는 계산된 것으로 표시
+UPDATE biddings b
+SET neighbors_computed_at = n.computed_at
+FROM (
+    SELECT bidding_id, max(computed_at) AS computed_at
+    FROM bidding_neighbors
+    GROUP BY bidding_id
+) n
+WHERE n.bidding_id = b.id;
+
+-- 보충 대상(미계산 공고) id 순 조회 (부분 인덱스)
+CREATE INDEX IF NOT EXISTS idx_biddings_neighbors_pending
+    ON biddings (id)
+    WHERE neighbors_computed_at IS NULL;
+
+ANALYZE biddings;